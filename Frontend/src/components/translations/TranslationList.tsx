@@ -22,8 +22,11 @@ export const TranslationList: React.FC<TranslationListProps> = ({
   const [translations, setTranslations] = useState<TranslationJob[]>([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { user } = useAuth();
-  const pollingIntervalRef = useRef<NodeJS.Timeout | null>(null);
+  // updated_at watermark for GET /translations/changes
+  const watermarkRef = useRef<string | null>(null);
 
   const loadTranslations = async (showLoading = true) => {
     if (!user) return;
@@ -34,13 +37,13 @@ export const TranslationList: React.FC<TranslationListProps> = ({
       } else {
         setRefreshing(true);
       }
-      const data = await apiService.getTranslations();
-      console.log("Translation data received:", data);
-      if (data.length > 0) {
-        console.log("First translation job:", data[0]);
-        console.log("Available fields:", Object.keys(data[0]));
-      }
-      setTranslations(data);
+      // Take the watermark before listing so no change falls between the two
+      const changes = await apiService.getTranslationChanges();
+      watermarkRef.current = changes.watermark;
+      const page = await apiService.getTranslations();
+      console.log("Translation data received:", page);
+      setTranslations(page.items);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error("Failed to load translations:", error);
     } finally {
@@ -49,6 +52,46 @@ export const TranslationList: React.FC<TranslationListProps> = ({
     }
   };
 
+  const loadMoreTranslations = async () => {
+    if (!user || !nextCursor) return;
+
+    try {
+      setLoadingMore(true);
+      const page = await apiService.getTranslations({ cursor: nextCursor });
+      setTranslations((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Failed to load more translations:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const isNewer = (job: TranslationJob, than?: TranslationJob) =>
+    !than || (job.updated_at ?? "") >= (than.updated_at ?? "");
+
+  const mergeChanges = (changed: TranslationJob[]) => {
+    setTranslations((current) => {
+      // The same job can come back in several polls; keep its latest version
+      const byId = new Map<string, TranslationJob>();
+      for (const job of changed) {
+        if (isNewer(job, byId.get(job.id))) byId.set(job.id, job);
+      }
+      const known = new Set(current.map((job) => job.id));
+      // Changes arrive oldest first; unseen jobs go on top, newest first
+      const added = [...byId.values()]
+        .filter((job) => !known.has(job.id))
+        .reverse();
+      return [
+        ...added,
+        ...current.map((job) => {
+          const update = byId.get(job.id);
+          return update && isNewer(update, job) ? update : job;
+        }),
+      ];
+    });
+  };
+
   const handleManualRefresh = () => {
     loadTranslations(false);
   };
@@ -58,60 +101,68 @@ export const TranslationList: React.FC<TranslationListProps> = ({
     (job) => job.status === "pending" || job.status === "processing"
   );
 
-  // Set up polling for active jobs
+  // While jobs are active, long-poll for changed jobs only
   useEffect(() => {
-    if (hasActiveJobs && user) {
-      // Poll every 3 seconds for active jobs
-      pollingIntervalRef.current = setInterval(() => {
-        console.log("Polling for translation updates...");
-        loadTranslations();
-      }, 3000);
-
-      return () => {
-        if (pollingIntervalRef.current) {
-          clearInterval(pollingIntervalRef.current);
-          pollingIntervalRef.current = null;
+    if (!hasActiveJobs || !user) return;
+
+    let cancelled = false;
+    const poll = async () => {
+      let cursor: string | null = null;
+      while (!cancelled && watermarkRef.current) {
+        try {
+          // Read the remaining pages of a change set before waiting again
+          const changes = await apiService.getTranslationChanges(
+            watermarkRef.current,
+            cursor ? undefined : 10,
+            cursor ?? undefined
+          );
+          if (cancelled) return;
+          watermarkRef.current = changes.watermark;
+          cursor = changes.cursor;
+          if (changes.items.length > 0) {
+            console.log("Translation changes received:", changes.items.length);
+            mergeChanges(changes.items);
+          }
+        } catch (error) {
+          console.error("Failed to poll translation changes:", error);
+          await new Promise((resolve) => setTimeout(resolve, 3000));
         }
-      };
-    } else {
-      // Clear polling if no active jobs
-      if (pollingIntervalRef.current) {
-        clearInterval(pollingIntervalRef.current);
-        pollingIntervalRef.current = null;
       }
-    }
+    };
+    poll();
+
+    return () => {
+      cancelled = true;
+    };
   }, [hasActiveJobs, user]);
 
   useEffect(() => {
     loadTranslations();
   }, [user, refresh]);
 
-  const handleDownload = async (jobId: string, fileName: string) => {
+  const handleDownload = async (
+    jobId: string,
+    fileName: string,
+    language?: string
+  ) => {
     try {
-      // Find the job to get the download URL
+      // The list no longer carries signed URLs; ask for one only when needed
       const job = translations.find((t) => t.id === jobId);
+      const cachedUrl = language
+        ? job?.results?.[language]?.download_url
+        : job?.download_url;
+      const downloadUrl =
+        cachedUrl || (await apiService.getDownloadUrl(jobId, language));
 
-      if (job?.download_url) {
-        // Use the pre-signed URL directly
-        const link = document.createElement("a");
-        link.href = job.download_url;
-        link.download = `translated-${fileName}`;
-        link.target = "_blank";
-        document.body.appendChild(link);
-        link.click();
-        document.body.removeChild(link);
-      } else {
-        // Fallback to API call
-        const blob = await apiService.downloadTranslation(jobId);
-        const url = window.URL.createObjectURL(blob);
-        const link = document.createElement("a");
-        link.href = url;
-        link.download = `translated-${fileName}`;
-        document.body.appendChild(link);
-        link.click();
-        document.body.removeChild(link);
-        window.URL.revokeObjectURL(url);
-      }
+      const link = document.createElement("a");
+      link.href = downloadUrl;
+      link.download = language
+        ? `translated-${language}-${fileName}`
+        : `translated-${fileName}`;
+      link.target = "_blank";
+      document.body.appendChild(link);
+      link.click();
+      document.body.removeChild(link);
     } catch (error) {
       console.error("Download failed:", error);
     }
@@ -206,7 +257,11 @@ export const TranslationList: React.FC<TranslationListProps> = ({
                     </h3>
                     <p className="text-sm text-gray-500">
                       {job.source_language?.toUpperCase() || "Unknown"} →{" "}
-                      {job.target_language?.toUpperCase() || "Unknown"}
+                      {job.target_languages
+                        ? job.target_languages
+                            .map((language) => language.toUpperCase())
+                            .join(", ")
+                        : job.target_language?.toUpperCase() || "Unknown"}
                     </p>
                   </div>
                 </div>
@@ -220,10 +275,13 @@ export const TranslationList: React.FC<TranslationListProps> = ({
                       )}`}
                     >
                       {job.status.charAt(0).toUpperCase() + job.status.slice(1)}
+                      {job.status === "processing" &&
+                        job.progress_percent !== undefined &&
+                        ` ${job.progress_percent}%`}
                     </span>
                   </div>
 
-                  {job.status === "completed" && (
+                  {job.status === "completed" && !job.results && (
                     <button
                       onClick={() => handleDownload(job.id, job.file_name)}
                       className="flex items-center px-3 py-1 text-sm text-blue-600 hover:text-blue-700 hover:bg-blue-50 rounded-md transition-colors"
@@ -235,6 +293,30 @@ export const TranslationList: React.FC<TranslationListProps> = ({
                 </div>
               </div>
 
+              {job.results && (
+                <div className="mt-3 flex flex-wrap gap-2">
+                  {Object.entries(job.results).map(([language, result]) => (
+                    <button
+                      key={language}
+                      onClick={() =>
+                        handleDownload(job.id, job.file_name, language)
+                      }
+                      disabled={result.status !== "completed"}
+                      className="flex items-center px-2 py-1 text-xs text-blue-600 hover:text-blue-700 hover:bg-blue-50 rounded-md transition-colors disabled:text-gray-400 disabled:hover:bg-transparent"
+                    >
+                      {result.status === "completed" ? (
+                        <Download className="h-3 w-3 mr-1" />
+                      ) : result.status === "failed" ? (
+                        <XCircle className="h-3 w-3 mr-1 text-red-500" />
+                      ) : (
+                        <Clock className="h-3 w-3 mr-1 text-yellow-500" />
+                      )}
+                      {language.toUpperCase()}
+                    </button>
+                  ))}
+                </div>
+              )}
+
               <div className="mt-3 text-xs text-gray-500">
                 Created: {new Date(job.created_at).toLocaleDateString()}
                 {job.completed_at && (
@@ -245,6 +327,18 @@ export const TranslationList: React.FC<TranslationListProps> = ({
               </div>
             </div>
           ))}
+          {nextCursor && (
+            <div className="flex justify-center pt-2">
+              <button
+                onClick={loadMoreTranslations}
+                disabled={loadingMore}
+                className="flex items-center space-x-1 px-3 py-1 text-sm text-gray-600 hover:text-gray-800 hover:bg-gray-100 rounded-md transition-colors disabled:opacity-50"
+              >
+                {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+                <span>Load more</span>
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
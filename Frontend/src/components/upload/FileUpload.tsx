@@ -116,7 +116,7 @@ export const FileUpload: React.FC<FileUploadProps> = ({ onUploadComplete }) => {
             <input
               type="file"
               onChange={handleFileSelect}
-              accept=".txt,.doc,.docx,.pdf"
+              accept=".txt,.doc,.docx,.pdf,.html,.htm,.md,.markdown,.json,.srt"
               className="hidden"
               id="file-upload"
             />
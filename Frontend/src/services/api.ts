@@ -1,4 +1,11 @@
-import { TranslationJob, Language } from "../types";
+import {
+  TranslationJob,
+  TranslationPage,
+  TranslationChanges,
+  TranslationListParams,
+  Language,
+  UploadUrlResponse,
+} from "../types";
 import { fetchAuthSession } from "aws-amplify/auth";
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL;
@@ -31,7 +38,7 @@ export const apiService = {
   uploadDocument: async (
     file: File,
     sourceLanguage: string,
-    targetLanguage: string
+    targetLanguage: string | string[]
   ): Promise<TranslationJob> => {
     console.log("=== UPLOAD DOCUMENT START ===");
     console.log("File details:", {
@@ -42,52 +49,31 @@ export const apiService = {
     });
     console.log("Languages:", { sourceLanguage, targetLanguage });
 
-    // Read file content based on file type
-    let fileContent: string;
-    if (
+    const fileType =
       file.type === "application/pdf" ||
       file.name.toLowerCase().endsWith(".pdf")
-    ) {
-      console.log("PDF file detected, converting to base64...");
-      // For PDF files, convert to base64
-      const arrayBuffer = await file.arrayBuffer();
-      const uint8Array = new Uint8Array(arrayBuffer);
-      fileContent = btoa(String.fromCharCode(...uint8Array));
-      console.log("PDF converted to base64, length:", fileContent.length);
-    } else {
-      // For text files, read as text
-      fileContent = await file.text();
-      console.log("Text file content length:", fileContent.length);
-      console.log(
-        "File content preview:",
-        fileContent.substring(0, 200) + "..."
-      );
-    }
+        ? "application/pdf"
+        : "text/plain";
 
     const authHeaders = await getAuthHeaders();
-    console.log("Auth headers:", authHeaders);
-
-    const requestBody = {
-      fileName: file.name,
-      sourceLanguage,
-      targetLanguage,
-      fileContent,
-      fileType: file.type,
-    };
-    console.log("Request body keys:", Object.keys(requestBody));
-    console.log("Request body size:", JSON.stringify(requestBody).length);
 
-    const res = await fetch(`${API_BASE_URL}/translations`, {
+    // Create the job first; the file itself goes straight to S3
+    const res = await fetch(`${API_BASE_URL}/translations/upload-url`, {
       method: "POST",
-      headers: {
-        ...authHeaders,
-        "Content-Type": "application/json",
-      },
-      body: JSON.stringify(requestBody),
+      headers: authHeaders,
+      body: JSON.stringify({
+        fileName: file.name,
+        sourceLanguage,
+        // An array fans the upload out into one job with a result per language
+        ...(Array.isArray(targetLanguage)
+          ? { targetLanguages: targetLanguage }
+          : { targetLanguage }),
+        fileType,
+        fileSize: file.size,
+      }),
     });
 
     console.log("Response status:", res.status);
-    console.log("Response headers:", Object.fromEntries(res.headers.entries()));
 
     if (!res.ok) {
       const errorText = await res.text();
@@ -97,22 +83,77 @@ export const apiService = {
       );
     }
 
-    const responseData = await res.json();
-    console.log("Response data:", responseData);
+    const { job, upload }: UploadUrlResponse = await res.json();
+    console.log("Created job:", job.id);
+
+    const form = new FormData();
+    Object.entries(upload.fields).forEach(([key, value]) =>
+      form.append(key, value)
+    );
+    // S3 requires the file to be the last form field
+    form.append("file", file);
+
+    const uploadRes = await fetch(upload.url, { method: "POST", body: form });
+    if (!uploadRes.ok) {
+      const errorText = await uploadRes.text();
+      console.error("S3 upload error body:", errorText);
+      throw new Error(`Failed to upload document: ${uploadRes.status}`);
+    }
+
     console.log("=== UPLOAD DOCUMENT SUCCESS ===");
-    return responseData;
+    return job;
   },
 
-  getTranslations: async (): Promise<TranslationJob[]> => {
+  getTranslations: async (
+    params: TranslationListParams = {}
+  ): Promise<TranslationPage> => {
     const authHeaders = await getAuthHeaders();
 
-    const res = await fetch(`${API_BASE_URL}/translations`, {
-      headers: authHeaders,
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== "") {
+        query.set(key, String(value));
+      }
     });
+    const queryString = query.toString();
+
+    const res = await fetch(
+      `${API_BASE_URL}/translations${queryString ? `?${queryString}` : ""}`,
+      {
+        headers: authHeaders,
+      }
+    );
     if (!res.ok) throw new Error("Failed to fetch translations");
     return res.json();
   },
 
+  // Jobs updated after `since` (a previous watermark), plus a few seconds of
+  // overlap before it, so merge the items by id. Without `since`, returns only the
+  // current watermark. `wait` long-polls for up to that many seconds. When
+  // `hasMore`, call again with the same `since` and the returned `cursor`.
+  getTranslationChanges: async (
+    since?: string,
+    wait?: number,
+    cursor?: string
+  ): Promise<TranslationChanges> => {
+    const authHeaders = await getAuthHeaders();
+
+    const query = new URLSearchParams();
+    if (since) query.set("since", since);
+    if (wait) query.set("wait", String(wait));
+    if (cursor) query.set("cursor", cursor);
+    const queryString = query.toString();
+
+    const res = await fetch(
+      `${API_BASE_URL}/translations/changes${queryString ? `?${queryString}` : ""}`,
+      {
+        headers: authHeaders,
+      }
+    );
+    if (!res.ok) throw new Error("Failed to fetch translation changes");
+    return res.json();
+  },
+
   getTranslation: async (jobId: string): Promise<TranslationJob | null> => {
     const authHeaders = await getAuthHeaders();
 
@@ -123,13 +164,18 @@ export const apiService = {
     return res.json();
   },
 
-  downloadTranslation: async (jobId: string): Promise<Blob> => {
+  getDownloadUrl: async (jobId: string, language?: string): Promise<string> => {
     const authHeaders = await getAuthHeaders();
 
-    const res = await fetch(`${API_BASE_URL}/translations/${jobId}/download`, {
-      headers: authHeaders,
-    });
-    if (!res.ok) throw new Error("Failed to download translation");
-    return res.blob();
+    const query = language ? `?language=${encodeURIComponent(language)}` : "";
+    const res = await fetch(
+      `${API_BASE_URL}/translations/${jobId}/download${query}`,
+      {
+        headers: authHeaders,
+      }
+    );
+    if (!res.ok) throw new Error("Failed to get download URL");
+    const data: { download_url: string } = await res.json();
+    return data.download_url;
   },
 };
@@ -4,20 +4,65 @@ export interface User {
   name: string;
 }
 
+export interface TranslationLanguageResult {
+  status: "pending" | "completed" | "failed";
+  s3_output_key?: string;
+  completed_at?: string;
+  download_url?: string;
+  download_path?: string;
+  error?: string;
+}
+
 export interface TranslationJob {
   id: string;
   user_id: string;
   file_name: string;
-  original_text: string;
-  translated_text?: string;
+  original_preview?: string;
+  translated_preview?: string;
   source_language: string;
-  target_language: string;
+  target_language?: string;
+  target_languages?: string[];
+  results?: Record<string, TranslationLanguageResult>;
+  failed_languages?: string[];
   status: "pending" | "processing" | "completed" | "failed";
+  progress_percent?: number;
   created_at: string;
+  updated_at?: string;
   completed_at?: string;
   s3_input_key: string;
   s3_output_key?: string;
   download_url?: string;
+  download_path?: string;
+}
+
+export interface TranslationPage {
+  items: TranslationJob[];
+  nextCursor: string | null;
+}
+
+export interface TranslationChanges {
+  items: TranslationJob[];
+  watermark: string;
+  hasMore: boolean;
+  cursor: string | null;
+}
+
+export interface UploadUrlResponse {
+  job: TranslationJob;
+  upload: {
+    url: string;
+    fields: Record<string, string>;
+    expires_in: number;
+    max_bytes: number;
+  };
+}
+
+export interface TranslationListParams {
+  limit?: number;
+  cursor?: string;
+  status?: TranslationJob["status"];
+  from?: string;
+  to?: string;
 }
 
 export interface Language {
@@ -8,6 +8,9 @@ resource "aws_api_gateway_rest_api" "main" {
   }
 
   binary_media_types = ["application/pdf", "image/*"]
+
+  # Responses at least this large are gzipped for clients that send Accept-Encoding
+  minimum_compression_size = var.api_minimum_compression_size
 }
 
 
@@ -23,6 +26,42 @@ resource "aws_api_gateway_resource" "translation_by_id" {
   path_part   = "{id}"
 }
 
+resource "aws_api_gateway_resource" "translation_download" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.translation_by_id.id
+  path_part   = "download"
+}
+
+resource "aws_api_gateway_resource" "translation_upload_url" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.translations.id
+  path_part   = "upload-url"
+}
+
+resource "aws_api_gateway_resource" "translation_changes" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.translations.id
+  path_part   = "changes"
+}
+
+resource "aws_api_gateway_resource" "translation_status" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.translations.id
+  path_part   = "status"
+}
+
+resource "aws_api_gateway_resource" "translation_batch" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.translations.id
+  path_part   = "batch"
+}
+
+resource "aws_api_gateway_resource" "translation_batch_by_id" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.translation_batch.id
+  path_part   = "{batchId}"
+}
+
 resource "aws_api_gateway_resource" "languages" {
   rest_api_id = aws_api_gateway_rest_api.main.id
   parent_id   = aws_api_gateway_rest_api.main.root_resource_id
@@ -121,6 +160,120 @@ resource "aws_api_gateway_integration" "get_translation" {
 }
 
 
+resource "aws_api_gateway_method" "get_translation_download" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_download.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_translation_download" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_download.id
+  http_method = aws_api_gateway_method.get_translation_download.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.api_handler.invoke_arn
+}
+
+
+resource "aws_api_gateway_method" "post_translation_upload_url" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_upload_url.id
+  http_method   = "POST"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "post_translation_upload_url" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_upload_url.id
+  http_method = aws_api_gateway_method.post_translation_upload_url.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.api_handler.invoke_arn
+}
+
+
+resource "aws_api_gateway_method" "get_translation_changes" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_changes.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_translation_changes" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_changes.id
+  http_method = aws_api_gateway_method.get_translation_changes.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.api_handler.invoke_arn
+}
+
+
+resource "aws_api_gateway_method" "post_translation_status" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_status.id
+  http_method   = "POST"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "post_translation_status" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_status.id
+  http_method = aws_api_gateway_method.post_translation_status.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.api_handler.invoke_arn
+}
+
+
+resource "aws_api_gateway_method" "post_translation_batch" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_batch.id
+  http_method   = "POST"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "post_translation_batch" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_batch.id
+  http_method = aws_api_gateway_method.post_translation_batch.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.api_handler.invoke_arn
+}
+
+
+resource "aws_api_gateway_method" "get_translation_batch" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_batch_by_id.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_translation_batch" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_batch_by_id.id
+  http_method = aws_api_gateway_method.get_translation_batch.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.api_handler.invoke_arn
+}
+
+
 resource "aws_api_gateway_method" "get_languages" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
   resource_id   = aws_api_gateway_resource.languages.id
@@ -172,6 +325,204 @@ resource "aws_api_gateway_integration" "translation_by_id_options" {
 
 
 
+resource "aws_api_gateway_method" "translation_download_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_download.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_method_response" "translation_download_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_download.id
+  http_method = aws_api_gateway_method.translation_download_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration" "translation_download_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_download.id
+  http_method = aws_api_gateway_method.translation_download_options.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.cors_handler.invoke_arn
+}
+
+
+
+
+resource "aws_api_gateway_method" "translation_upload_url_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_upload_url.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_method_response" "translation_upload_url_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_upload_url.id
+  http_method = aws_api_gateway_method.translation_upload_url_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration" "translation_upload_url_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_upload_url.id
+  http_method = aws_api_gateway_method.translation_upload_url_options.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.cors_handler.invoke_arn
+}
+
+
+
+
+resource "aws_api_gateway_method" "translation_changes_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_changes.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_method_response" "translation_changes_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_changes.id
+  http_method = aws_api_gateway_method.translation_changes_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration" "translation_changes_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_changes.id
+  http_method = aws_api_gateway_method.translation_changes_options.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.cors_handler.invoke_arn
+}
+
+
+
+
+resource "aws_api_gateway_method" "translation_status_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_status.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_method_response" "translation_status_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_status.id
+  http_method = aws_api_gateway_method.translation_status_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration" "translation_status_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_status.id
+  http_method = aws_api_gateway_method.translation_status_options.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.cors_handler.invoke_arn
+}
+
+
+
+
+resource "aws_api_gateway_method" "translation_batch_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_batch.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_method_response" "translation_batch_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_batch.id
+  http_method = aws_api_gateway_method.translation_batch_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration" "translation_batch_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_batch.id
+  http_method = aws_api_gateway_method.translation_batch_options.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.cors_handler.invoke_arn
+}
+
+
+
+
+resource "aws_api_gateway_method" "translation_batch_by_id_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.translation_batch_by_id.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_method_response" "translation_batch_by_id_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_batch_by_id.id
+  http_method = aws_api_gateway_method.translation_batch_by_id_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration" "translation_batch_by_id_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.translation_batch_by_id.id
+  http_method = aws_api_gateway_method.translation_batch_by_id_options.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.cors_handler.invoke_arn
+}
+
+
+
+
 resource "aws_api_gateway_method" "languages_options" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
   resource_id   = aws_api_gateway_resource.languages.id
@@ -255,6 +606,18 @@ resource "aws_api_gateway_deployment" "main" {
     aws_api_gateway_integration.post_translations,
     aws_api_gateway_integration.get_translation,
     aws_api_gateway_integration.get_languages,
+    aws_api_gateway_integration.get_translation_download,
+    aws_api_gateway_integration.translation_download_options,
+    aws_api_gateway_integration.post_translation_upload_url,
+    aws_api_gateway_integration.translation_upload_url_options,
+    aws_api_gateway_integration.get_translation_changes,
+    aws_api_gateway_integration.translation_changes_options,
+    aws_api_gateway_integration.post_translation_status,
+    aws_api_gateway_integration.translation_status_options,
+    aws_api_gateway_integration.post_translation_batch,
+    aws_api_gateway_integration.get_translation_batch,
+    aws_api_gateway_integration.translation_batch_options,
+    aws_api_gateway_integration.translation_batch_by_id_options,
     aws_api_gateway_integration.translations_options,
     aws_api_gateway_integration.translation_by_id_options,
     aws_api_gateway_integration.languages_options,
@@ -264,6 +627,71 @@ resource "aws_api_gateway_deployment" "main" {
 
   rest_api_id = aws_api_gateway_rest_api.main.id
 
+  # A deployment is a snapshot of the API: any change to its routes, methods or
+  # integrations, or to the compression setting, only reaches the stage with a new one
+  triggers = {
+    redeployment = sha1(jsonencode([
+      aws_api_gateway_resource.translations,
+      aws_api_gateway_resource.translation_by_id,
+      aws_api_gateway_resource.translation_download,
+      aws_api_gateway_resource.translation_upload_url,
+      aws_api_gateway_resource.translation_changes,
+      aws_api_gateway_resource.translation_status,
+      aws_api_gateway_resource.translation_batch,
+      aws_api_gateway_resource.translation_batch_by_id,
+      aws_api_gateway_resource.languages,
+      aws_api_gateway_method.translations_options,
+      aws_api_gateway_method.get_translations,
+      aws_api_gateway_method.post_translations,
+      aws_api_gateway_method.get_translation,
+      aws_api_gateway_method.get_translation_download,
+      aws_api_gateway_method.post_translation_upload_url,
+      aws_api_gateway_method.get_translation_changes,
+      aws_api_gateway_method.post_translation_status,
+      aws_api_gateway_method.post_translation_batch,
+      aws_api_gateway_method.get_translation_batch,
+      aws_api_gateway_method.get_languages,
+      aws_api_gateway_method.translation_by_id_options,
+      aws_api_gateway_method.translation_download_options,
+      aws_api_gateway_method.translation_upload_url_options,
+      aws_api_gateway_method.translation_changes_options,
+      aws_api_gateway_method.translation_status_options,
+      aws_api_gateway_method.translation_batch_options,
+      aws_api_gateway_method.translation_batch_by_id_options,
+      aws_api_gateway_method.languages_options,
+      aws_api_gateway_method_response.translations_options,
+      aws_api_gateway_method_response.translation_by_id_options,
+      aws_api_gateway_method_response.translation_download_options,
+      aws_api_gateway_method_response.translation_upload_url_options,
+      aws_api_gateway_method_response.translation_changes_options,
+      aws_api_gateway_method_response.translation_status_options,
+      aws_api_gateway_method_response.translation_batch_options,
+      aws_api_gateway_method_response.translation_batch_by_id_options,
+      aws_api_gateway_method_response.languages_options,
+      aws_api_gateway_integration.translations_options,
+      aws_api_gateway_integration.get_translations,
+      aws_api_gateway_integration.post_translations,
+      aws_api_gateway_integration.get_translation,
+      aws_api_gateway_integration.get_translation_download,
+      aws_api_gateway_integration.post_translation_upload_url,
+      aws_api_gateway_integration.get_translation_changes,
+      aws_api_gateway_integration.post_translation_status,
+      aws_api_gateway_integration.post_translation_batch,
+      aws_api_gateway_integration.get_translation_batch,
+      aws_api_gateway_integration.get_languages,
+      aws_api_gateway_integration.translation_by_id_options,
+      aws_api_gateway_integration.translation_download_options,
+      aws_api_gateway_integration.translation_upload_url_options,
+      aws_api_gateway_integration.translation_changes_options,
+      aws_api_gateway_integration.translation_status_options,
+      aws_api_gateway_integration.translation_batch_options,
+      aws_api_gateway_integration.translation_batch_by_id_options,
+      aws_api_gateway_integration.languages_options,
+      aws_api_gateway_authorizer.cognito,
+    ]))
+    minimum_compression_size = var.api_minimum_compression_size
+  }
+
   lifecycle {
     create_before_destroy = true
   }
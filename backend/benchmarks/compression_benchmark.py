@@ -0,0 +1,165 @@
+"""
+Bytes moved and latency with and without compressed storage, at several document
+sizes. For each size a text document goes through the whole path: the API stores
+the upload, the worker reads, translates and writes the output, and the client
+downloads it. Each path runs once with objects stored raw and once with gzip.
+
+Reported per run:
+  stored      bytes of the input and output objects in S3
+  moved       bytes crossing the network: upload to S3, worker read and write, download
+  worker_ms   measured worker time, including gzip and gunzip CPU
+  transfer_ms moved bytes at --mbps, a stand-in for S3 transfer time
+  memory      translation memory item bytes and write capacity units (1 KB each)
+
+Also reports the gzipped size of GET /translations response bodies, which API
+Gateway compresses above its minimum_compression_size.
+
+Usage: python benchmarks/compression_benchmark.py [--sizes-kb 10,100,1000,10000] [--mbps 80] [--json]
+"""
+import argparse
+import gzip
+import json
+import math
+import random
+import time
+
+from fakes import FakeDynamoDB, FakeS3, FakeTranslate, setup_environment
+
+setup_environment()
+
+import api_handler  # noqa: E402
+import s3_streams  # noqa: E402
+import translation_worker  # noqa: E402
+from translation_memory import encode_translation  # noqa: E402
+
+ENCODINGS = {'raw': '', 'gzip': s3_streams.GZIP}
+
+
+def make_document(size: int, seed: int) -> str:
+    """Prose-like text from a fixed vocabulary, so it compresses roughly like real documents."""
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 10)))
+                  for _ in range(3000)]
+    sentences, length = [], 0
+    while length < size:
+        sentence = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(6, 20))).capitalize() + '. '
+        if rng.random() < 0.15:
+            sentence += '\n\n'
+        sentences.append(sentence)
+        length += len(sentence)
+    return ''.join(sentences)[:size]
+
+
+def use_encoding(encoding: str) -> None:
+    api_handler.STORAGE_CONTENT_ENCODING = encoding
+    translation_worker.STORAGE_CONTENT_ENCODING = encoding
+
+
+def run(mode: str, size: int, mbps: float) -> dict:
+    use_encoding(ENCODINGS[mode])
+    s3, dynamodb = FakeS3(), FakeDynamoDB()
+    api_handler.s3_client = translation_worker.s3_client = s3
+    api_handler.dynamodb = translation_worker.dynamodb = dynamodb
+    translation_worker.translate_client = FakeTranslate()
+    translation_worker.translation_memory.clear()
+
+    document = make_document(size, seed=size).encode('utf-8')
+    job_id = f"job-{size}"
+    input_key = f"input/benchmark-user/{job_id}/document.txt"
+    api_handler.put_input_object(input_key, document, 'text/plain')
+    dynamodb.Table(api_handler.TRANSLATION_JOBS_TABLE).put_item(Item={
+        'id': job_id, 'user_id': 'benchmark-user', 'file_name': 'document.txt',
+        'source_language': 'en', 'target_language': 'es', 'status': 'pending',
+        'created_at': '2025-01-01T00:00:00', 's3_input_key': input_key,
+    })
+    uploaded = len(s3.objects[(api_handler.INPUT_BUCKET, input_key)])
+
+    started = time.perf_counter()
+    translation_worker.process_translation_request_direct({'job_id': job_id, 'input_key': input_key})
+    worker_ms = (time.perf_counter() - started) * 1000
+
+    item = dynamodb.Table(api_handler.TRANSLATION_JOBS_TABLE).get_item(Key={'id': job_id})['Item']
+    assert item['status'] == 'completed', item
+    output_key = (api_handler.OUTPUT_BUCKET, item['s3_output_key'])
+    output = s3.objects[output_key]
+    output_text = s3_streams.read_body(s3.get_object(Bucket=output_key[0], Key=output_key[1]))
+    assert len(output_text) == item['output_size_bytes']
+
+    # Upload, worker read, worker write and client download each move the stored bytes once
+    moved = uploaded * 2 + len(output) * 2
+    memory_bytes = memory_units = 0
+    for segment in translation_worker.iter_segments(iter([output_text.decode('utf-8')])):
+        stored = encode_translation(segment) if mode == 'gzip' else segment
+        stored_size = len(stored) if isinstance(stored, bytes) else len(stored.encode('utf-8'))
+        memory_bytes += stored_size
+        memory_units += math.ceil((stored_size + 100) / 1024)
+    transfer_ms = moved / (mbps * 1024 * 1024) * 1000
+    return {
+        'mode': mode,
+        'size_kb': size // 1024,
+        'input_stored': uploaded,
+        'output_stored': len(output),
+        'moved': moved,
+        'worker_ms': round(worker_ms, 1),
+        'transfer_ms': round(transfer_ms, 1),
+        'total_ms': round(worker_ms + transfer_ms, 1),
+        'memory_bytes': memory_bytes,
+        'memory_wcu': memory_units,
+    }
+
+
+def list_response_sizes(page_sizes) -> list:
+    """Raw and gzipped bytes of GET /translations bodies with full previews."""
+    results = []
+    for count in page_sizes:
+        items = [{
+            'id': f"{i:08x}-0000-0000-0000-000000000000",
+            'file_name': f"document-{i}.txt",
+            'source_language': 'en',
+            'target_language': 'es',
+            'status': 'completed',
+            'created_at': '2025-01-01T00:00:00',
+            'updated_at': '2025-01-01T00:05:00',
+            'original_preview': make_document(200, seed=i),
+            'translated_preview': make_document(200, seed=i + 1),
+            'output_size_bytes': 1000 + i,
+            'progress_percent': 100,
+            'download_path': f"/translations/{i:08x}-0000-0000-0000-000000000000/download",
+        } for i in range(count)]
+        body = json.dumps({'items': items, 'next_token': None}).encode('utf-8')
+        started = time.perf_counter()
+        compressed = gzip.compress(body)
+        results.append({
+            'items': count,
+            'raw': len(body),
+            'gzip': len(compressed),
+            'gzip_ms': round((time.perf_counter() - started) * 1000, 2),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes-kb', default='10,100,1000,10000')
+    parser.add_argument('--mbps', type=float, default=80.0, help='assumed S3 transfer rate, MiB/s')
+    parser.add_argument('--page-sizes', default='1,10,50,100')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    sizes = [int(kb) * 1024 for kb in args.sizes_kb.split(',')]
+    documents = [run(mode, size, args.mbps) for size in sizes for mode in ENCODINGS]
+    responses = list_response_sizes([int(n) for n in args.page_sizes.split(',')])
+    if args.json:
+        print(json.dumps({'documents': documents, 'list_responses': responses}, indent=2))
+        return
+    for r in documents:
+        print(f"{r['size_kb']:>6}KB {r['mode']:<5}stored in={r['input_stored']} out={r['output_stored']} "
+              f"moved={r['moved']} worker={r['worker_ms']}ms transfer={r['transfer_ms']}ms "
+              f"total={r['total_ms']}ms memory={r['memory_bytes']}B/{r['memory_wcu']}WCU")
+    for r in responses:
+        print(f"GET /translations {r['items']:>3} items raw={r['raw']} gzip={r['gzip']} "
+              f"({r['gzip'] / r['raw']:.0%}) gzip_ms={r['gzip_ms']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Latency of small users' jobs while one bulk user has a large batch in flight, with
+and without the per-user scheduler. The bulk user submits --bulk-jobs at once
+through the batch path; meanwhile --small-users each submit a single job every
+--interval seconds. A pool of --workers threads drains the SQS job queue one
+message at a time, standing in for concurrent worker invocations.
+
+Reports p50/p99 submit-to-completion latency for the small users' jobs and how
+many bulk jobs finished in the same time.
+
+Usage: python benchmarks/fair_scheduling_benchmark.py [--bulk-jobs 200] [--workers 8] [--max-in-flight 4] [--json]
+"""
+import argparse
+import json
+import math
+import threading
+import time
+
+from fakes import FakeDynamoDB, FakeQueue, FakeS3, FakeTranslate, setup_environment
+
+setup_environment()
+
+import api_handler  # noqa: E402
+import translation_worker  # noqa: E402
+from scheduler import DynamoDBSchedulerStore, JobScheduler  # noqa: E402
+
+QUEUE_URL = 'jobs'
+
+
+def percentile(samples, fraction: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def new_job(s3, table, user_id: str, job_id: str, document: str) -> dict:
+    input_key = f"input/{user_id}/{job_id}/document.txt"
+    # Unique text per job so the translation memory does not short-circuit Translate
+    s3.objects[(translation_worker.INPUT_BUCKET, input_key)] = f"{job_id}: {document}".encode('utf-8')
+    job = {
+        'id': job_id, 'user_id': user_id, 'file_name': 'document.txt',
+        'source_language': 'en', 'target_language': 'es', 'status': 'pending',
+        'created_at': '2025-01-01T00:00:00', 's3_input_key': input_key,
+    }
+    table.put_item(Item=job)
+    return job
+
+
+def install(mode: str, args, s3, dynamodb, queue) -> None:
+    for module in (api_handler, translation_worker):
+        module.dynamodb = dynamodb
+        module.sqs_client = queue
+        module.TRANSLATION_QUEUE_URL = QUEUE_URL
+    translation_worker.s3_client = s3
+    translation_worker.translate_client = FakeTranslate(args.translate_latency)
+    translation_worker.translation_memory.clear()
+
+    store = None
+    if mode == 'per-user':
+        store = DynamoDBSchedulerStore(dynamodb.Table(api_handler.TRANSLATION_JOBS_TABLE), dynamodb.Table('scheduler'))
+    api_handler.job_scheduler = JobScheduler(
+        lambda job: api_handler.invoke_translation_worker(job['id'], job['s3_input_key']),
+        store, max_in_flight=args.max_in_flight
+    )
+    translation_worker.job_scheduler = JobScheduler(translation_worker.dispatch_job, store,
+                                                    max_in_flight=args.max_in_flight)
+
+
+def run(args, mode: str, document: str) -> dict:
+    s3, dynamodb, queue = FakeS3(), FakeDynamoDB(), FakeQueue()
+    install(mode, args, s3, dynamodb, queue)
+    table = dynamodb.Table(api_handler.TRANSLATION_JOBS_TABLE)
+
+    submitted, finished = {}, {}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def worker() -> None:
+        while not stop.is_set():
+            event = queue.receive_event(1)
+            if event is None:
+                time.sleep(0.002)
+                continue
+            translation_worker.lambda_handler(event, None)
+            job_id = json.loads(event['Records'][0]['body'])['job_id']
+            with lock:
+                finished[job_id] = time.perf_counter()
+
+    workers = [threading.Thread(target=worker) for _ in range(args.workers)]
+    for t in workers:
+        t.start()
+
+    started = time.perf_counter()
+    bulk = [new_job(s3, table, 'bulk-user', f"bulk-{i:05d}", document) for i in range(args.bulk_jobs)]
+    api_handler.enqueue_translation_jobs(bulk)
+
+    small_ids = []
+    for round_number in range(args.rounds):
+        for user in range(args.small_users):
+            job_id = f"small-{user}-{round_number:03d}"
+            job = new_job(s3, table, f"small-user-{user}", job_id, document)
+            submitted[job_id] = time.perf_counter()
+            api_handler.job_scheduler.submit(job)
+            small_ids.append(job_id)
+        time.sleep(args.interval)
+
+    while True:
+        with lock:
+            if all(job_id in finished for job_id in small_ids):
+                break
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for t in workers:
+        t.join()
+
+    latencies = [finished[job_id] - submitted[job_id] for job_id in small_ids]
+    return {
+        'mode': mode,
+        'bulk_jobs': args.bulk_jobs,
+        'small_jobs': len(small_ids),
+        'workers': args.workers,
+        'max_in_flight': args.max_in_flight if mode == 'per-user' else None,
+        'small_p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'small_p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'bulk_completed': sum(1 for job in bulk if job['id'] in finished),
+        'seconds': round(elapsed, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bulk-jobs', type=int, default=200)
+    parser.add_argument('--small-users', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=10, help='jobs each small user submits')
+    parser.add_argument('--interval', type=float, default=0.05, help='seconds between small-user rounds')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--max-in-flight', type=int, default=4)
+    parser.add_argument('--document-chars', type=int, default=2000)
+    parser.add_argument('--translate-latency', type=float, default=0.02)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    document = ('Benchmark sentence for the fair scheduler. ' * (args.document_chars // 43 + 1))[:args.document_chars]
+    results = [run(args, 'none', document), run(args, 'per-user', document)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['mode']:<10}small p50={r['small_p50_ms']}ms p99={r['small_p99_ms']}ms "
+              f"bulk_completed={r['bulk_completed']}/{r['bulk_jobs']} seconds={r['seconds']}")
+
+
+if __name__ == '__main__':
+    main()
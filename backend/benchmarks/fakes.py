@@ -0,0 +1,594 @@
+"""
+In-memory stand-ins for the AWS clients the Lambdas use, so benchmarks run offline.
+They implement only the calls and expression shapes the handlers issue.
+"""
+import io
+import json
+import operator
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions')
+
+BENCHMARK_ENVIRONMENT = {
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'benchmark',
+    'AWS_SECRET_ACCESS_KEY': 'benchmark',
+    'TRANSLATION_JOBS_TABLE': 'jobs',
+    'INPUT_BUCKET': 'input-bucket',
+    'OUTPUT_BUCKET': 'output-bucket',
+    'COGNITO_USER_POOL_ID': 'pool',
+    'TRANSLATION_WORKER_FUNCTION_NAME': 'translation-worker',
+    'METRICS_ENABLED': 'false',
+}
+
+
+def setup_environment() -> None:
+    """Set the environment the handlers read at import and put lambda_functions on sys.path."""
+    for name, value in BENCHMARK_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+    if LAMBDA_DIR not in sys.path:
+        sys.path.insert(0, LAMBDA_DIR)
+
+
+class FakeStreamingBody(io.BytesIO):
+    def iter_chunks(self, chunk_size: int = 1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class FakeS3:
+    """S3 stand-in. With discard_writes, written bodies are counted but not kept (for memory profiling)."""
+
+    def __init__(self, latency: float = 0.0, discard_writes: bool = False):
+        self.latency = latency
+        self.discard_writes = discard_writes
+        self.objects: Dict[tuple, bytes] = {}
+        # ContentEncoding and Metadata given when each object was written
+        self.headers: Dict[tuple, Dict[str, Any]] = {}
+        self.bytes_written = 0
+        self.calls: Dict[str, int] = {}
+        self._uploads: Dict[str, List[bytes]] = {}
+        self._upload_headers: Dict[str, Dict[str, Any]] = {}
+
+    def _call(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _store(self, Bucket: str, Key: str, data: bytes) -> None:
+        self.bytes_written += len(data)
+        self.objects[(Bucket, Key)] = b'' if self.discard_writes else data
+
+    @staticmethod
+    def _headers(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: kwargs[name] for name in ('ContentEncoding', 'Metadata') if name in kwargs}
+
+    def put_object(self, Bucket: str, Key: str, Body: Any, **kwargs) -> Dict[str, Any]:
+        self._call('put_object')
+        self._store(Bucket, Key, Body if isinstance(Body, bytes) else Body.read())
+        self.headers[(Bucket, Key)] = self._headers(kwargs)
+        return {'ETag': '"fake"'}
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        self._call('create_multipart_upload')
+        upload_id = f"upload-{len(self._uploads) + 1}"
+        self._uploads[upload_id] = []
+        self._upload_headers[upload_id] = self._headers(kwargs)
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes, **kwargs) -> Dict[str, Any]:
+        self._call('upload_part')
+        self.bytes_written += len(Body)
+        self._uploads[UploadId].append(b'' if self.discard_writes else Body)
+        return {'ETag': f'"part-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: Dict[str, Any],
+                                  **kwargs) -> Dict[str, Any]:
+        self._call('complete_multipart_upload')
+        self.objects[(Bucket, Key)] = b''.join(self._uploads.pop(UploadId))
+        self.headers[(Bucket, Key)] = self._upload_headers.pop(UploadId)
+        return {}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **kwargs) -> Dict[str, Any]:
+        self._call('abort_multipart_upload')
+        self._uploads.pop(UploadId, None)
+        self._upload_headers.pop(UploadId, None)
+        return {}
+
+    def get_object(self, Bucket: str, Key: str, Range: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """Supports open-ended ranges, bytes=N-, which like S3 apply to the stored (possibly gzipped) bytes."""
+        self._call('get_object')
+        data = self.objects[(Bucket, Key)]
+        if Range:
+            data = data[int(re.fullmatch(r'bytes=(\d+)-', Range).group(1)):]
+        return dict(self.headers.get((Bucket, Key), {}), Body=FakeStreamingBody(data), ContentLength=len(data))
+
+    def delete_objects(self, Bucket: str, Delete: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._call('delete_objects')
+        for entry in Delete['Objects']:
+            self.objects.pop((Bucket, entry['Key']), None)
+            self.headers.pop((Bucket, entry['Key']), None)
+        return {'Deleted': [{'Key': entry['Key']} for entry in Delete['Objects']]}
+
+    def copy_object(self, Bucket: str, Key: str, CopySource: Dict[str, str], **kwargs) -> Dict[str, Any]:
+        self._call('copy_object')
+        source = (CopySource['Bucket'], CopySource['Key'])
+        self.objects[(Bucket, Key)] = self.objects[source]
+        self.headers[(Bucket, Key)] = dict(self.headers.get(source, {}))
+        return {}
+
+    def generate_presigned_url(self, operation: str, Params: Dict[str, Any], ExpiresIn: int = 3600, **kwargs) -> str:
+        self._call('generate_presigned_url')
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+    def generate_presigned_post(self, Bucket: str, Key: str, Fields: Optional[Dict[str, Any]] = None,
+                                Conditions: Optional[List[Any]] = None, ExpiresIn: int = 3600) -> Dict[str, Any]:
+        self._call('generate_presigned_post')
+        return {'url': f"https://{Bucket}.s3.amazonaws.com/", 'fields': dict(Fields or {}, key=Key)}
+
+
+RANGE_COMPARISONS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+COMPARISONS = dict(RANGE_COMPARISONS, **{'=': operator.eq, '<>': operator.ne})
+MISSING = object()
+
+
+def split_top_level(text: str, separator: str = ',') -> List[str]:
+    """Split on separator outside parentheses, e.g. the assignments of a SET clause."""
+    parts, depth, current = [], 0, ''
+    for char in text:
+        depth += {'(': 1, ')': -1}.get(char, 0)
+        if char == separator and depth == 0:
+            parts.append(current.strip())
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def resolve_path(path: str, names: Dict[str, str]) -> List[str]:
+    return [names.get(part, part) for part in path.strip().split('.')]
+
+
+def read_path(item: Dict[str, Any], path: List[str]) -> Any:
+    target: Any = item
+    for part in path:
+        if not isinstance(target, dict) or part not in target:
+            return MISSING
+        target = target[part]
+    return target
+
+
+def evaluate(operand: str, item: Dict[str, Any], names: Dict[str, str], values: Dict[str, Any]) -> Any:
+    """Value of an update or condition operand: :value, path, if_not_exists(path, operand) or a + b / a - b."""
+    operand = operand.strip()
+    match = re.fullmatch(r'if_not_exists\((.+)\)', operand)
+    if match:
+        path, default = split_top_level(match.group(1))
+        current = read_path(item, resolve_path(path, names))
+        return evaluate(default, item, names, values) if current is MISSING else current
+    for sign in (' + ', ' - '):
+        if sign in operand:
+            left, right = operand.rsplit(sign, 1)
+            left, right = evaluate(left, item, names, values), evaluate(right, item, names, values)
+            return left + right if sign == ' + ' else left - right
+    if operand.startswith(':'):
+        return values[operand]
+    return read_path(item, resolve_path(operand, names))
+
+
+def condition_holds(expression: str, item: Dict[str, Any], names: Dict[str, str], values: Dict[str, Any]) -> bool:
+    """Conditions joined by AND/OR (AND binds tighter) over comparisons, IN and attribute_(not_)exists."""
+    def term_holds(term: str) -> bool:
+        match = re.fullmatch(r'(attribute_exists|attribute_not_exists)\((.+)\)', term)
+        if match:
+            exists = read_path(item, resolve_path(match.group(2), names)) is not MISSING
+            return exists if match.group(1) == 'attribute_exists' else not exists
+        match = re.fullmatch(r'(\S+) IN \((.+)\)', term)
+        if match:
+            current = evaluate(match.group(1), item, names, values)
+            return current in [values[name.strip()] for name in match.group(2).split(',')]
+        left, comparison, right = re.fullmatch(r'(.+?) (=|<>|<=|>=|<|>) (.+)', term).groups()
+        left, right = evaluate(left, item, names, values), evaluate(right, item, names, values)
+        if left is MISSING or right is MISSING:
+            return False
+        return COMPARISONS[comparison](left, right)
+
+    return any(
+        all(term_holds(term.strip()) for term in re.split(r'\s+AND\s+', clause))
+        for clause in re.split(r'\s+OR\s+', expression)
+    )
+
+
+def apply_update(item: Dict[str, Any], expression: str, names: Dict[str, str], values: Dict[str, Any]) -> None:
+    """Apply SET (with if_not_exists and +/-), REMOVE and numeric ADD clauses to item in place."""
+    sections = re.split(r'\b(SET|REMOVE|ADD)\b', expression)
+    for action, body in zip(sections[1::2], sections[2::2]):
+        for clause in split_top_level(body):
+            if action == 'SET':
+                path, operand = clause.split('=', 1)
+                value = evaluate(operand, item, names, values)
+                path = resolve_path(path, names)
+            elif action == 'ADD':
+                path, operand = clause.split()
+                path = resolve_path(path, names)
+                current = read_path(item, path)
+                value = (0 if current is MISSING else current) + values[operand]
+            else:
+                *parents, last = resolve_path(clause, names)
+                parent = read_path(item, parents)
+                if isinstance(parent, dict):
+                    parent.pop(last, None)
+                continue
+            target = item
+            for part in path[:-1]:
+                target = target.setdefault(part, {})
+            target[path[-1]] = value
+
+
+def conditional_check_failed(operation: str) -> Exception:
+    from botocore.exceptions import ClientError
+
+    return ClientError({'Error': {'Code': 'ConditionalCheckFailedException',
+                                  'Message': 'The conditional request failed'}}, operation)
+
+
+class FakeBatchWriter:
+    """table.batch_writer(): buffers puts and flushes them 25 at a time, like boto3."""
+
+    def __init__(self, table: 'FakeTable'):
+        self.table = table
+        self.pending: List[Dict[str, Any]] = []
+
+    def put_item(self, Item: Dict[str, Any]) -> None:
+        self.pending.append(Item)
+        if len(self.pending) == 25:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.pending:
+            self.table._call('batch_write_item')
+            with self.table._lock:
+                for item in self.pending:
+                    self.table.items[item[self.table.key]] = dict(item)
+                self.table._index = {}
+            self.pending = []
+
+    def __enter__(self) -> 'FakeBatchWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._flush()
+
+
+class FakeTable:
+    """
+    A DynamoDB table keyed on a single hash key. Queries run against indexes on
+    whichever attribute the key condition names (user_id, batch_id), sorted on
+    created_at, updated_at or queued_at (picked from IndexName), with simple range conditions.
+    """
+
+    def __init__(self, name: str, key: str = 'id', latency: float = 0.0):
+        self.name = name
+        self.key = key
+        self.latency = latency
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Items grouped by index hash key and sorted on the range key, rebuilt after
+        # writes so large tables don't turn every query into a full sort
+        self._index: Dict[str, Any] = {}
+        self._index_size = -1
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get_item(self, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._call('get_item')
+        item = self.items.get(Key[self.key])
+        return {'Item': dict(item)} if item else {}
+
+    def put_item(self, Item: Dict[str, Any], ConditionExpression: Optional[str] = None,
+                 ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                 ExpressionAttributeValues: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        self._call('put_item')
+        with self._lock:
+            if ConditionExpression and not condition_holds(
+                    ConditionExpression, self.items.get(Item[self.key], {}),
+                    ExpressionAttributeNames or {}, ExpressionAttributeValues or {}):
+                raise conditional_check_failed('PutItem')
+            self.items[Item[self.key]] = dict(Item)
+            self._index = {}
+        return {}
+
+    def batch_writer(self, **kwargs) -> FakeBatchWriter:
+        return FakeBatchWriter(self)
+
+    def update_item(self, Key: Dict[str, Any], UpdateExpression: str,
+                    ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+                    ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                    ConditionExpression: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        self._call('update_item')
+        names = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues or {}
+        with self._lock:
+            if ConditionExpression and not condition_holds(
+                    ConditionExpression, self.items.get(Key[self.key], {}), names, values):
+                raise conditional_check_failed('UpdateItem')
+            self._index = {}
+            item = self.items.setdefault(Key[self.key], dict(Key))
+            apply_update(item, UpdateExpression, names, values)
+            return {'Attributes': dict(item)}
+
+    def scan(self, FilterExpression: Optional[str] = None, ProjectionExpression: Optional[str] = None,
+             ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+             ExpressionAttributeValues: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """One page holding every matching item."""
+        self._call('scan')
+        names = ExpressionAttributeNames or {}
+        with self._lock:
+            items = [dict(i) for i in self.items.values()
+                     if not FilterExpression or condition_holds(FilterExpression, i, names,
+                                                                ExpressionAttributeValues or {})]
+        if ProjectionExpression:
+            fields = [names.get(f.strip(), f.strip()) for f in ProjectionExpression.split(',')]
+            items = [{k: v for k, v in i.items() if k in fields} for i in items]
+        return {'Items': items}
+
+    def query(self, KeyConditionExpression: str, ExpressionAttributeValues: Dict[str, Any],
+              Limit: Optional[int] = None, ExclusiveStartKey: Optional[Dict[str, Any]] = None,
+              ScanIndexForward: bool = True, **kwargs) -> Dict[str, Any]:
+        self._call('query')
+        hash_key, hash_name = re.match(r"(\w+) = (:\w+)", KeyConditionExpression).groups()
+        index_name = kwargs.get('IndexName', '')
+        range_key = next((key for key in ('updated_at', 'queued_at') if key.replace('_', '-') in index_name),
+                         'created_at')
+        items, positions = self._sorted_index(hash_key, range_key).get(ExpressionAttributeValues[hash_name], ([], {}))
+        if not ScanIndexForward:
+            items = items[::-1]
+        if ExclusiveStartKey and ExclusiveStartKey[self.key] in positions:
+            position = positions[ExclusiveStartKey[self.key]]
+            items = items[(position if ScanIndexForward else len(items) - 1 - position) + 1:]
+        for comparison, name in re.findall(rf"{range_key} (>=|<=|>|<|BETWEEN) (:\w+)", KeyConditionExpression):
+            bound = ExpressionAttributeValues[name]
+            if comparison == 'BETWEEN':
+                upper_name = re.search(rf"BETWEEN {name} AND (:\w+)", KeyConditionExpression).group(1)
+                upper = ExpressionAttributeValues[upper_name]
+                items = [i for i in items if bound <= i[range_key] <= upper]
+            else:
+                compare = RANGE_COMPARISONS[comparison]
+                items = [i for i in items if compare(i[range_key], bound)]
+        response: Dict[str, Any] = {}
+        if Limit is not None and len(items) > Limit:
+            items = items[:Limit]
+            last = items[-1]
+            response['LastEvaluatedKey'] = {self.key: last[self.key], hash_key: last[hash_key],
+                                            range_key: last[range_key]}
+        if 'FilterExpression' in kwargs:
+            # As in DynamoDB, the filter applies after Limit, so a page can come back short
+            items = [i for i in items if condition_holds(kwargs['FilterExpression'], i,
+                                                         kwargs.get('ExpressionAttributeNames', {}),
+                                                         ExpressionAttributeValues)]
+        response['Items'] = [dict(i) for i in items]
+        return response
+
+    def _sorted_index(self, hash_key: str, range_key: str) -> Dict[str, Any]:
+        """hash value -> (items sorted by range_key, {key: position})."""
+        with self._lock:
+            if self._index_size != len(self.items):
+                self._index, self._index_size = {}, len(self.items)
+            if (hash_key, range_key) not in self._index:
+                grouped: Dict[str, List[Dict[str, Any]]] = {}
+                for item in self.items.values():
+                    if hash_key in item and range_key in item:
+                        grouped.setdefault(item[hash_key], []).append(item)
+                index = {}
+                for value, items in grouped.items():
+                    items.sort(key=lambda i: i[range_key])
+                    index[value] = (items, {i[self.key]: n for n, i in enumerate(items)})
+                self._index[(hash_key, range_key)] = index
+            return self._index[(hash_key, range_key)]
+
+
+class FakeDynamoDB:
+    """
+    Table factory plus batch_get_item. With batch_get_limit, each BatchGetItem call
+    returns at most that many keys and the rest as UnprocessedKeys, as DynamoDB does
+    when a response would exceed its size limit.
+    """
+    KEYS = {'content-index': 'content_hash', 'translation-memory': 'segment_hash', 'rate-limit': 'bucket_id',
+            'scheduler': 'user_id'}
+
+    def __init__(self, latency: float = 0.0, batch_get_limit: Optional[int] = None):
+        self.latency = latency
+        self.batch_get_limit = batch_get_limit
+        self.tables: Dict[str, FakeTable] = {}
+
+    def Table(self, name: str) -> FakeTable:
+        if name not in self.tables:
+            self.tables[name] = FakeTable(name, self.KEYS.get(name, 'id'), self.latency)
+        return self.tables[name]
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """Items for the keys found, honouring a ProjectionExpression of plain or #name attributes."""
+        responses, unprocessed = {}, {}
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            table._call('batch_get_item')
+            keys = request['Keys']
+            if self.batch_get_limit is not None and len(keys) > self.batch_get_limit:
+                unprocessed[name] = dict(request, Keys=keys[self.batch_get_limit:])
+                keys = keys[:self.batch_get_limit]
+            fields = None
+            if 'ProjectionExpression' in request:
+                names = request.get('ExpressionAttributeNames', {})
+                fields = [names.get(f.strip(), f.strip()) for f in request['ProjectionExpression'].split(',')]
+            found = [table.items.get(key[table.key]) for key in keys]
+            responses[name] = [
+                {k: v for k, v in item.items() if fields is None or k in fields}
+                for item in found if item
+            ]
+        return {'Responses': responses, 'UnprocessedKeys': unprocessed}
+
+
+class FakeLambda:
+    def __init__(self):
+        self.payloads: List[Dict[str, Any]] = []
+
+    def invoke(self, FunctionName: str, InvocationType: str, Payload: str, **kwargs) -> Dict[str, Any]:
+        self.payloads.append(json.loads(Payload))
+        return {'StatusCode': 202}
+
+
+class FakeQueue:
+    """
+    In-memory SQS stand-in: send_message matches the boto3 client and
+    receive_event builds the batch event Lambda's SQS event source delivers.
+    Sending and receiving are thread-safe; complete() assumes one consumer.
+    """
+
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def send_message(self, QueueUrl: str, MessageBody: str, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.sent += 1
+            message_id = f"message-{self.sent:06d}"
+            self.messages.append({'messageId': message_id, 'body': MessageBody, 'attempts': 0})
+        return {'MessageId': message_id}
+
+    def send_message_batch(self, QueueUrl: str, Entries: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        successful = []
+        for entry in Entries:
+            response = self.send_message(QueueUrl, entry['MessageBody'])
+            successful.append({'Id': entry['Id'], 'MessageId': response['MessageId']})
+        return {'Successful': successful, 'Failed': []}
+
+    def receive_event(self, batch_size: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            batch, self.messages = self.messages[:batch_size], self.messages[batch_size:]
+        if not batch:
+            return None
+        for message in batch:
+            message['attempts'] += 1
+        self._in_flight = {m['messageId']: m for m in batch}
+        return {'Records': [
+            {'messageId': m['messageId'], 'body': m['body'], 'eventSource': 'aws:sqs',
+             'attributes': {'ApproximateReceiveCount': str(m['attempts'])}}
+            for m in batch
+        ]}
+
+    def complete(self, response: Dict[str, Any], max_attempts: int = 3) -> int:
+        """Apply a partial batch response: failed messages go back on the queue. Returns the failure count."""
+        failures = response.get('batchItemFailures', [])
+        for failure in failures:
+            message = self._in_flight[failure['itemIdentifier']]
+            if message['attempts'] < max_attempts:
+                self.messages.append(message)
+        self._in_flight = {}
+        return len(failures)
+
+
+class FakeTranslate:
+    """
+    Translate stand-in with per-call latency, an optional random throttling rate and
+    an optional account quota: calls that would push the characters accepted in the
+    trailing second past chars_per_second are throttled.
+    """
+
+    def __init__(self, latency: float = 0.0, throttle_rate: float = 0.0, seed: int = 7,
+                 chars_per_second: float = 0.0):
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.chars_per_second = chars_per_second
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.characters = 0
+        self.throttled = 0
+        self._window: 'deque[tuple]' = deque()
+        self._window_chars = 0
+        self._lock = threading.Lock()
+
+    def _over_quota(self, characters: int) -> bool:
+        now = time.monotonic()
+        while self._window and self._window[0][0] <= now - 1.0:
+            self._window_chars -= self._window.popleft()[1]
+        if self._window_chars + characters > self.chars_per_second:
+            return True
+        self._window.append((now, characters))
+        self._window_chars += characters
+        return False
+
+    def translate_text(self, Text: str, SourceLanguageCode: str, TargetLanguageCode: str, **kwargs) -> Dict[str, Any]:
+        from botocore.exceptions import ClientError
+
+        with self._lock:
+            self.calls += 1
+            self.characters += len(Text)
+            throttled = self.random.random() < self.throttle_rate
+            if not throttled and self.chars_per_second:
+                throttled = self._over_quota(len(Text))
+            if throttled:
+                self.throttled += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            raise ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, 'TranslateText')
+        return {'TranslatedText': Text, 'SourceLanguageCode': SourceLanguageCode,
+                'TargetLanguageCode': TargetLanguageCode}
+
+
+def api_event(method: str, path: str, user_id: str = 'benchmark-user', body: Any = None,
+              path_parameters: Optional[Dict[str, str]] = None,
+              query: Optional[Dict[str, str]] = None, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Build an API Gateway proxy event with Cognito claims."""
+    return {
+        'httpMethod': method,
+        'path': path,
+        'headers': headers or {},
+        'pathParameters': path_parameters,
+        'queryStringParameters': query,
+        'body': json.dumps(body) if body is not None else None,
+        'isBase64Encoded': False,
+        'requestContext': {'authorizer': {'claims': {'sub': user_id}}},
+    }
+
+
+SEED_EPOCH = datetime(2025, 1, 1)
+
+
+def seed_jobs(table: FakeTable, user_id: str, count: int, completed_ratio: float = 0.9) -> None:
+    """Fill the jobs table with count jobs for user_id, most of them completed."""
+    for i in range(count):
+        job_id = f"job-{i:06d}"
+        completed = i < count * completed_ratio
+        timestamp = (SEED_EPOCH + timedelta(seconds=i)).isoformat()
+        table.items[job_id] = {
+            'id': job_id,
+            'user_id': user_id,
+            'file_name': f"document-{i}.txt",
+            'source_language': 'en',
+            'target_language': 'es',
+            'status': 'completed' if completed else 'processing',
+            'created_at': timestamp,
+            'updated_at': timestamp,
+            's3_input_key': f"input/{user_id}/{job_id}/document-{i}.txt",
+            's3_output_key': f"output/{user_id}/{job_id}/document-{i}.txt" if completed else None,
+        }
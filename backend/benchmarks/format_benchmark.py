@@ -0,0 +1,122 @@
+"""
+Translate calls and billed characters for structured documents (SRT, HTML,
+Markdown, JSON) under three strategies:
+
+  flat     the whole file segmented as plain text, markup included (the old path)
+  per-node one Translate request per extracted text node
+  packed   text nodes packed into requests with NODE_DELIMITER (the worker's path)
+
+Cues, headings and values are numbered so the translation memory rarely
+short-circuits Translate. With Translate echoing its input, each output is also
+checked to keep the source's structure: SRT sequence numbers, timings and line
+counts, the parsed JSON value, and HTML and Markdown byte for byte.
+
+Usage: python benchmarks/format_benchmark.py [--cues 3000] [--translate-latency 0.01] [--json]
+"""
+import argparse
+import json
+import re
+import time
+from functools import partial
+
+from fakes import FakeTranslate, setup_environment
+
+setup_environment()
+
+import translation_worker  # noqa: E402
+from document_formats import parse_document  # noqa: E402
+from segmenter import segment_text  # noqa: E402
+
+
+def make_srt(cues: int) -> str:
+    blocks = []
+    for i in range(1, cues + 1):
+        start, end = i * 3, i * 3 + 2
+        blocks.append(f"{i}\n00:{start // 60 % 60:02d}:{start % 60:02d},000 --> "
+                      f"00:{end // 60 % 60:02d}:{end % 60:02d},500\n"
+                      f"Subtitle line {i} says something short,\nand a second line {i}.\n")
+    return '\n'.join(blocks)
+
+
+def make_html(sections: int) -> str:
+    body = ''.join(
+        f'<section id="s{i}" class="content"><h2>Section {i} heading</h2>\n'
+        f'<p>Paragraph {i} has <a href="https://example.com/{i}">a link</a> and <em>emphasis</em>.</p>\n'
+        f'<ul><li>First point {i}</li><li>Second point {i}</li></ul></section>\n'
+        for i in range(sections))
+    return f'<!DOCTYPE html>\n<html><head><title>Benchmark</title></head>\n<body>\n{body}</body></html>\n'
+
+
+def make_markdown(sections: int) -> str:
+    return ''.join(
+        f"## Section {i}\n\nParagraph {i} explains the feature, with `code_{i}` and a "
+        f"[link](https://example.com/{i}).\n\n- Point one of {i}\n- Point two of {i}\n\n"
+        f"```\nconfig_{i} = true\n```\n\n"
+        for i in range(sections))
+
+
+def make_json(entries: int) -> str:
+    return json.dumps({f"key_{i}": {"title": f"Title number {i}", "body": f"Body text for entry {i}.",
+                                    "url": f"https://example.com/{i}", "count": i}
+                       for i in range(entries)}, indent=2)
+
+
+def structure(file_name: str, text: str):
+    if file_name.endswith('.srt'):
+        return [(block.split('\n')[:2], block.count('\n')) for block in re.split(r'\n\n', text)]
+    if file_name.endswith('.json'):
+        return json.loads(text)
+    return text
+
+
+def run(strategy: str, file_name: str, text: str, latency: float) -> dict:
+    translate = FakeTranslate(latency)
+    translation_worker.translate_client = translate
+    translation_worker.translation_memory.clear()
+    document = parse_document(file_name, text)
+    started = time.perf_counter()
+    if strategy == 'flat':
+        output = ''.join(translation_worker.translate_chunks(segment_text(text), 'en', 'es'))
+    else:
+        packs = document.packs(max_nodes=1) if strategy == 'per-node' else document.packs()
+        output = ''.join(translation_worker.translate_chunks(
+            packs, 'en', 'es', translate=partial(translation_worker.translate_pack, document)))
+    return {
+        'file': file_name,
+        'strategy': strategy,
+        'bytes': len(text.encode('utf-8')),
+        'text_nodes': len(document.nodes),
+        'translate_calls': translate.calls,
+        'billed_characters': translate.characters,
+        'seconds': round(time.perf_counter() - started, 3),
+        'structure_kept': structure(file_name, output) == structure(file_name, text),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cues', type=int, default=3000)
+    parser.add_argument('--sections', type=int, default=500)
+    parser.add_argument('--translate-latency', type=float, default=0.01)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    documents = [
+        ('subtitles.srt', make_srt(args.cues)),
+        ('page.html', make_html(args.sections)),
+        ('guide.md', make_markdown(args.sections)),
+        ('strings.json', make_json(args.sections)),
+    ]
+    results = [run(strategy, name, text, args.translate_latency)
+               for name, text in documents for strategy in ('flat', 'per-node', 'packed')]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['file']:<14}{r['strategy']:<10}nodes={r['text_nodes']:<6}calls={r['translate_calls']:<6}"
+              f"billed={r['billed_characters']:<8}bytes={r['bytes']:<8}seconds={r['seconds']:<8}"
+              f"structure_kept={r['structure_kept']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+List latency against job count, signing every completed item (before) versus
+returning download paths and signing on demand (after).
+
+Signing uses a real botocore S3 client with dummy credentials, which signs
+locally without network access.
+
+Usage: python benchmarks/list_presign_benchmark.py [--json]
+"""
+import argparse
+import json
+import statistics
+import time
+
+from fakes import FakeDynamoDB, api_event, seed_jobs, setup_environment
+
+setup_environment()
+
+import boto3  # noqa: E402
+
+import api_handler  # noqa: E402
+
+JOB_COUNTS = (10, 100, 1000, 2000)
+
+
+def sign_every_item(items: list, s3_client) -> None:
+    """The previous list behaviour, kept for comparison."""
+    for item in items:
+        if item.get('status') == 'completed' and item.get('s3_output_key'):
+            item['download_url'] = s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': api_handler.OUTPUT_BUCKET, 'Key': item['s3_output_key']},
+                ExpiresIn=900
+            )
+
+
+def time_call(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    s3_client = boto3.client('s3', region_name='us-east-1')
+    api_handler.s3_client = s3_client
+    results = []
+
+    for count in JOB_COUNTS:
+        dynamodb = FakeDynamoDB()
+        api_handler.dynamodb = dynamodb
+        table = dynamodb.Table(api_handler.TRANSLATION_JOBS_TABLE)
+        seed_jobs(table, 'benchmark-user', count)
+        items = list(table.items.values())
+
+        before = time_call(lambda: sign_every_item([dict(i) for i in items], s3_client), args.repeats)
+        event = api_event('GET', '/translations', query={'limit': str(api_handler.MAX_PAGE_SIZE)})
+        after = time_call(lambda: api_handler.get_translations(event), args.repeats)
+        download = time_call(lambda: api_handler.get_download_url(
+            'job-000000', api_event('GET', '/translations/job-000000/download')), args.repeats)
+
+        results.append({'jobs': count, 'sign_all_ms': round(before, 3),
+                        'list_page_ms': round(after, 3), 'download_ms': round(download, 3)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'jobs':>6}{'sign all (ms)':>16}{'list page (ms)':>16}{'download (ms)':>16}")
+    for r in results:
+        print(f"{r['jobs']:>6}{r['sign_all_ms']:>16}{r['list_page_ms']:>16}{r['download_ms']:>16}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+PDF pipeline timing: text extraction plus page-parallel translation, compared with
+translating one chunk at a time. Uses PDFs given on the command line, or a
+generated multi-page sample when none are given. Requires pypdf.
+
+Usage: python benchmarks/pdf_benchmark.py [manual.pdf ...] [--pages 100] [--translate-latency 0.02]
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from fakes import FakeDynamoDB, FakeS3, FakeTranslate, setup_environment
+
+setup_environment()
+
+import translation_worker  # noqa: E402
+
+SAMPLE_LINE = "Page {page}, line {line}: Refer to the maintenance schedule before servicing the unit."
+
+
+def build_sample_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """Write a minimal uncompressed PDF with text on every page."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    for page in range(1, pages + 1):
+        lines = ' '.join(
+            f"({SAMPLE_LINE.format(page=page, line=line)}) Tj T*" for line in range(1, lines_per_page + 1)
+        )
+        stream = f"BT /F1 10 Tf 12 TL 40 780 Td {lines} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output.extend(f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1'))
+    xref = len(output)
+    output.extend(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1'))
+    for offset in offsets:
+        output.extend(f"{offset:010d} 00000 n \n".encode('latin-1'))
+    output.extend(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1'))
+    return bytes(output)
+
+
+def run(name: str, pdf_bytes: bytes, concurrency: int, latency: float) -> dict:
+    s3, dynamodb, translate = FakeS3(discard_writes=True), FakeDynamoDB(), FakeTranslate(latency)
+    translation_worker.s3_client = s3
+    translation_worker.dynamodb = dynamodb
+    translation_worker.translate_client = translate
+    translation_worker.TRANSLATE_MAX_CONCURRENCY = concurrency
+    translation_worker.translation_memory.clear()
+
+    job_id = f"pdf-{concurrency}"
+    input_key = f"input/benchmark-user/{job_id}/{name}"
+    s3.objects[(translation_worker.INPUT_BUCKET, input_key)] = pdf_bytes
+    dynamodb.Table(translation_worker.TRANSLATION_JOBS_TABLE).items[job_id] = {
+        'id': job_id, 'user_id': 'benchmark-user', 'file_name': name, 'status': 'pending',
+        'source_language': 'en', 'target_language': 'es', 's3_input_key': input_key,
+    }
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    translation_worker.process_translation_request_direct({'job_id': job_id, 's3_input_key': input_key})
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'file': name, 'pdf_kb': len(pdf_bytes) // 1024, 'concurrency': concurrency,
+            'translate_calls': translate.calls, 'output_bytes': s3.bytes_written,
+            'seconds': round(elapsed, 3), 'peak_heap_mb': round(peak / (1024 * 1024), 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('pdfs', nargs='*', help='local PDF files to benchmark')
+    parser.add_argument('--pages', type=int, default=100, help='pages in the generated sample')
+    parser.add_argument('--translate-latency', type=float, default=0.02)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    samples = [(os.path.basename(path), open(path, 'rb').read()) for path in args.pdfs]
+    if not samples:
+        samples = [(f"sample-{args.pages}-pages.pdf", build_sample_pdf(args.pages))]
+
+    results = []
+    for name, pdf_bytes in samples:
+        for concurrency in (1, args.concurrency):
+            results.append(run(name, pdf_bytes, concurrency, args.translate_latency))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['file']:<28} {r['pdf_kb']:>6} KB  concurrency={r['concurrency']:<3} calls={r['translate_calls']:<5} "
+              f"output={r['output_bytes']:<9} {r['seconds']:>7}s  peak={r['peak_heap_mb']} MB")
+
+
+if __name__ == '__main__':
+    main()
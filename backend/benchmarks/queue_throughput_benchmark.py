@@ -0,0 +1,108 @@
+"""
+Worker throughput for one job per invocation versus SQS batches processed
+concurrently, against in-memory S3, DynamoDB, SQS and a Translate stand-in
+with configurable latency and throttling.
+
+Usage: python benchmarks/queue_throughput_benchmark.py [--jobs 100] [--batch-size 10] [--json]
+"""
+import argparse
+import json
+import time
+
+from fakes import FakeDynamoDB, FakeQueue, FakeS3, FakeTranslate, setup_environment
+
+setup_environment()
+
+import translation_worker  # noqa: E402
+
+
+def seed(jobs: int, document: str):
+    s3, dynamodb = FakeS3(), FakeDynamoDB()
+    table = dynamodb.Table(translation_worker.TRANSLATION_JOBS_TABLE)
+    requests = []
+    for i in range(jobs):
+        job_id = f"job-{i:06d}"
+        input_key = f"input/user-{i % 10}/{job_id}/document.txt"
+        # Unique text per job so the translation memory does not short-circuit Translate
+        s3.objects[(translation_worker.INPUT_BUCKET, input_key)] = f"{job_id}: {document}".encode('utf-8')
+        table.items[job_id] = {
+            'id': job_id, 'user_id': f"user-{i % 10}", 'file_name': 'document.txt',
+            'source_language': 'en', 'target_language': 'es', 'status': 'pending',
+            'created_at': '2025-01-01T00:00:00', 's3_input_key': input_key,
+        }
+        requests.append({'job_id': job_id, 's3_input_key': input_key})
+    return s3, dynamodb, requests
+
+
+def install(s3, dynamodb, translate) -> None:
+    translation_worker.s3_client = s3
+    translation_worker.dynamodb = dynamodb
+    translation_worker.translate_client = translate
+    translation_worker.translation_memory.clear()
+
+
+def run_direct(args, document: str) -> dict:
+    s3, dynamodb, requests = seed(args.jobs, document)
+    install(s3, dynamodb, FakeTranslate(args.translate_latency, args.throttle_rate))
+    started = time.perf_counter()
+    invocations = failed = 0
+    for request in requests:
+        # Lambda retries a failed asynchronous invocation up to twice
+        for attempt in range(3):
+            invocations += 1
+            try:
+                translation_worker.lambda_handler(request, None)
+                break
+            except Exception:
+                failed += 1
+    elapsed = time.perf_counter() - started
+    return {'mode': 'direct', 'jobs': args.jobs, 'invocations': invocations, 'failed_messages': failed,
+            'seconds': round(elapsed, 3), 'jobs_per_second': round(args.jobs / elapsed, 2)}
+
+
+def run_queue(args, document: str) -> dict:
+    s3, dynamodb, requests = seed(args.jobs, document)
+    install(s3, dynamodb, FakeTranslate(args.translate_latency, args.throttle_rate))
+    queue = FakeQueue()
+    for request in requests:
+        queue.send_message(QueueUrl='jobs', MessageBody=json.dumps(request))
+
+    invocations = failed = 0
+    started = time.perf_counter()
+    while True:
+        event = queue.receive_event(args.batch_size)
+        if event is None:
+            break
+        invocations += 1
+        failed += queue.complete(translation_worker.lambda_handler(event, None))
+    elapsed = time.perf_counter() - started
+    return {'mode': 'queue', 'jobs': args.jobs, 'invocations': invocations, 'failed_messages': failed,
+            'seconds': round(elapsed, 3), 'jobs_per_second': round(args.jobs / elapsed, 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=translation_worker.JOB_BATCH_CONCURRENCY)
+    parser.add_argument('--document-chars', type=int, default=2000)
+    parser.add_argument('--translate-latency', type=float, default=0.02)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    translation_worker.JOB_BATCH_CONCURRENCY = args.concurrency
+    translation_worker.TRANSLATE_RETRY_BASE_DELAY = 0.01
+    document = ('Benchmark sentence for the translation queue. ' * (args.document_chars // 47 + 1))[:args.document_chars]
+
+    results = [run_direct(args, document), run_queue(args, document)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['mode']:<8}jobs={r['jobs']} invocations={r['invocations']} failed={r['failed_messages']} "
+              f"seconds={r['seconds']} jobs/s={r['jobs_per_second']}")
+
+
+if __name__ == '__main__':
+    main()
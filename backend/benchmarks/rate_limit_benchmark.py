@@ -0,0 +1,129 @@
+"""
+Aggregate Translate throughput when many worker containers share one account quota,
+with and without the shared token bucket. Each simulated container has its own
+TokenBucket and DynamoDB store over one shared in-memory table, and a pool of
+threads calling translate_chunk against a Translate stand-in that throttles
+anything over --quota characters per second.
+
+Reports accepted characters per second, throttled calls, chunks that failed after
+exhausting retries, and the variation of throughput between time slices after the
+first second (oscillation between idle and throttled shows up as a high value).
+
+Usage: python benchmarks/rate_limit_benchmark.py [--containers 8] [--quota 20000] [--seconds 5] [--json]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+
+from fakes import FakeDynamoDB, FakeTranslate, setup_environment
+
+setup_environment()
+
+import translation_worker  # noqa: E402
+from rate_limiter import DynamoDBBucketStore, TokenBucket  # noqa: E402
+
+SLICE_SECONDS = 0.25
+
+
+class ContainerLimiter:
+    """Stands in for the worker's module-level limiter, dispatching to the calling thread's container."""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def acquire(self, tokens: float, deadline: float = None) -> float:
+        return self.local.limiter.acquire(tokens, deadline)
+
+
+def run(args, mode: str) -> dict:
+    translate = FakeTranslate(args.translate_latency, chars_per_second=args.quota)
+    dynamodb = FakeDynamoDB(args.aws_latency)
+    table = dynamodb.Table('rate-limit')
+    rate = args.quota * args.budget if mode == 'shared' else 0
+    limiters = [TokenBucket(rate, store=DynamoDBBucketStore(table)) for _ in range(args.containers)]
+
+    dispatcher = ContainerLimiter()
+    translation_worker.translate_client = translate
+    translation_worker.translate_rate_limiter = dispatcher
+    translation_worker.translation_memory.clear()
+
+    deadline = time.perf_counter() + args.seconds
+    completions = []
+    failures = []
+    lock = threading.Lock()
+
+    def worker(container: int, thread: int) -> None:
+        dispatcher.local.limiter = limiters[container]
+        n = 0
+        while time.perf_counter() < deadline:
+            # Unique text so the translation memory never answers
+            chunk = f"[{mode} {container}.{thread}.{n}] " + 'x' * args.chunk_chars
+            n += 1
+            try:
+                translation_worker.translate_chunk(chunk, 'en', 'es')
+                with lock:
+                    completions.append((time.perf_counter(), len(chunk)))
+            except Exception:
+                with lock:
+                    failures.append(container)
+
+    threads = [threading.Thread(target=worker, args=(c, t))
+               for c in range(args.containers) for t in range(args.threads)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Calls still in flight at the deadline finish late; only the window itself counts
+    completions = [(finished - started, characters) for finished, characters in completions
+                   if finished - started < args.seconds]
+    slices = [0] * int(args.seconds / SLICE_SECONDS)
+    for offset, characters in completions:
+        slices[int(offset / SLICE_SECONDS)] += characters
+    # The first second includes the initial burst from a full bucket
+    steady = slices[int(1 / SLICE_SECONDS):]
+    mean = statistics.mean(steady) if steady else 0
+    return {
+        'mode': mode,
+        'containers': args.containers,
+        'threads_per_container': args.threads,
+        'quota_chars_per_second': args.quota,
+        'budget_chars_per_second': rate or None,
+        'chars_per_second': round(sum(c for _, c in completions) / args.seconds),
+        'chunks': len(completions),
+        'failed_chunks': len(failures),
+        'translate_calls': translate.calls,
+        'throttled_calls': translate.throttled,
+        'throughput_variation': round(statistics.pstdev(steady) / mean, 3) if mean else None,
+        'limiter_table_calls': dict(table.calls),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--containers', type=int, default=8)
+    parser.add_argument('--threads', type=int, default=4, help='concurrent Translate calls per container')
+    parser.add_argument('--quota', type=float, default=20000, help='account quota in characters per second')
+    parser.add_argument('--budget', type=float, default=0.9, help='limiter rate as a fraction of the quota')
+    parser.add_argument('--chunk-chars', type=int, default=1000)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--translate-latency', type=float, default=0.05)
+    parser.add_argument('--aws-latency', type=float, default=0.005, help='seconds per limiter DynamoDB call')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    results = [run(args, 'none'), run(args, 'shared')]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['mode']:<8}chars/s={r['chars_per_second']} (quota {int(args.quota)}) chunks={r['chunks']} "
+              f"failed={r['failed_chunks']} throttled={r['throttled_calls']}/{r['translate_calls']} "
+              f"variation={r['throughput_variation']} table_calls={r['limiter_table_calls']}")
+
+
+if __name__ == '__main__':
+    main()
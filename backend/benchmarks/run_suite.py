@@ -0,0 +1,235 @@
+"""
+Offline benchmark suite for the API and worker hot paths:
+
+  create_translation   POST /translations through lambda_handler, per document size
+  get_translations     GET /translations first page and full pagination, 10 to 10,000 jobs
+  translate_text       worker segmentation + concurrent Translate, per document size
+
+Everything runs against the in-memory fakes, with optional per-call AWS latency
+and Translate latency/throttling. Results are JSON (p50/p99/mean latency and
+throughput per case). Pass --baseline with a previous results file to fail
+(exit 1) when any case's p50 or p99 regresses by more than --tolerance.
+
+Usage:
+  python benchmarks/run_suite.py --output results.json
+  python benchmarks/run_suite.py --quick --baseline results.json --tolerance 0.25
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from fakes import (FakeDynamoDB, FakeLambda, FakeS3, FakeTranslate, api_event, seed_jobs,
+                   setup_environment)
+
+setup_environment()
+
+import api_handler  # noqa: E402
+import translation_worker  # noqa: E402
+
+USER_ID = 'benchmark-user'
+SENTENCE = "The quarterly report covers revenue, staffing and the maintenance schedule. "
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarise(name: str, params: Dict[str, Any], samples: List[float], units: int = 1) -> Dict[str, Any]:
+    """Latency stats in milliseconds plus throughput in operations (or units, e.g. characters) per second."""
+    total = sum(samples)
+    return {
+        'name': name,
+        'params': params,
+        'iterations': len(samples),
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+        'mean_ms': round(total / len(samples) * 1000, 3),
+        'throughput_per_s': round(len(samples) * units / total, 1) if total else None,
+    }
+
+
+def measure(fn: Callable[[int], Any], iterations: int, warmup: int = 2) -> List[float]:
+    for i in range(warmup):
+        fn(-1 - i)
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def document(size_bytes: int, seed: int) -> str:
+    """Text of roughly size_bytes whose sentences differ per seed, so neither dedup nor translation memory hit."""
+    sentences = []
+    length = 0
+    n = 0
+    while length < size_bytes:
+        sentence = f"[{seed}.{n}] {SENTENCE}"
+        sentences.append(sentence)
+        length += len(sentence)
+        n += 1
+    return ''.join(sentences)[:size_bytes]
+
+
+def bench_create_translation(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    for size in (1024, 100 * 1024):
+        dynamodb = FakeDynamoDB(args.aws_latency)
+        api_handler.dynamodb = dynamodb
+        api_handler.s3_client = FakeS3(args.aws_latency, discard_writes=True)
+        api_handler.lambda_client = FakeLambda()
+        api_handler.TRANSLATION_QUEUE_URL = None
+        bodies = {}
+
+        def request(i: int) -> None:
+            response = api_handler.lambda_handler(api_event('POST', '/translations', USER_ID, bodies[i]), None)
+            assert response['statusCode'] == 201, response
+
+        for i in list(range(-2, 0)) + list(range(args.iterations)):
+            bodies[i] = {'fileName': f"doc-{i}.txt", 'sourceLanguage': 'en', 'targetLanguage': 'es',
+                         'fileContent': document(size, i)}
+        results.append(summarise('create_translation', {'document_bytes': size},
+                                 measure(request, args.iterations)))
+    return results
+
+
+def bench_get_translations(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    job_counts = (10, 100, 1000) if args.quick else (10, 100, 1000, 10000)
+    api_handler.s3_client = FakeS3(args.aws_latency)
+    for count in job_counts:
+        dynamodb = FakeDynamoDB(args.aws_latency)
+        api_handler.dynamodb = dynamodb
+        seed_jobs(dynamodb.Table(api_handler.TRANSLATION_JOBS_TABLE), USER_ID, count)
+
+        def first_page(i: int) -> None:
+            response = api_handler.lambda_handler(api_event('GET', '/translations', USER_ID), None)
+            assert response['statusCode'] == 200, response
+
+        results.append(summarise('get_translations.first_page', {'jobs': count},
+                                 measure(first_page, args.iterations)))
+
+        # Walk every page once at the maximum page size
+        page_samples = []
+        cursor = None
+        while True:
+            query = {'limit': str(api_handler.MAX_PAGE_SIZE)}
+            if cursor:
+                query['cursor'] = cursor
+            started = time.perf_counter()
+            response = api_handler.lambda_handler(api_event('GET', '/translations', USER_ID, query=query), None)
+            page_samples.append(time.perf_counter() - started)
+            cursor = json.loads(response['body'])['nextCursor']
+            if not cursor:
+                break
+        results.append(summarise('get_translations.paginate', {'jobs': count, 'pages': len(page_samples)},
+                                 page_samples))
+    return results
+
+
+def bench_translate_text(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    sizes = (1024, 10 * 1024, 100 * 1024) if args.quick else (1024, 10 * 1024, 100 * 1024, 1024 * 1024)
+    for size in sizes:
+        translate = FakeTranslate(args.translate_latency, args.throttle_rate)
+        translation_worker.translate_client = translate
+        texts = {}
+
+        def run(i: int) -> None:
+            translation_worker.translation_memory.clear()
+            translation_worker.translate_text(texts[i], 'en', 'es')
+
+        # Large documents take long enough that a few iterations give stable percentiles
+        iterations = max(3, args.iterations // max(1, size // (10 * 1024)))
+        for i in list(range(-2, 0)) + list(range(iterations)):
+            texts[i] = document(size, i)
+        samples = measure(run, iterations)
+        result = summarise('translate_text', {'document_bytes': size}, samples)
+        result['characters_per_s'] = round(size * len(samples) / sum(samples))
+        result['translate_calls'] = translate.calls
+        results.append(result)
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Return a description of every case whose p50 or p99 exceeds the baseline by more than tolerance."""
+    previous = {(r['name'], json.dumps(r['params'], sort_keys=True)): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result['name'], json.dumps(result['params'], sort_keys=True)))
+        if not before:
+            continue
+        for stat in ('p50_ms', 'p99_ms'):
+            if before[stat] and result[stat] > before[stat] * (1 + tolerance):
+                regressions.append(f"{result['name']} {result['params']}: {stat} "
+                                   f"{before[stat]} -> {result[stat]}")
+    return regressions
+
+
+SCENARIOS = {
+    'create_translation': bench_create_translation,
+    'get_translations': bench_get_translations,
+    'translate_text': bench_translate_text,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', choices=sorted(SCENARIOS), action='append', help='run only these scenarios')
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--quick', action='store_true', help='fewer iterations and smaller sizes')
+    parser.add_argument('--aws-latency', type=float, default=0.0, help='seconds added to each S3/DynamoDB call')
+    parser.add_argument('--translate-latency', type=float, default=0.005, help='seconds per Translate call')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of Translate calls throttled')
+    parser.add_argument('--output', help='write results JSON to this file (default: stdout)')
+    parser.add_argument('--baseline', help='previous results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed fractional slowdown')
+    args = parser.parse_args()
+    if args.quick:
+        args.iterations = min(args.iterations, 20)
+    translation_worker.TRANSLATE_RETRY_BASE_DELAY = min(translation_worker.TRANSLATE_RETRY_BASE_DELAY, 0.01)
+
+    results = []
+    for name, scenario in SCENARIOS.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"Running {name}...", file=sys.stderr)
+        results.extend(scenario(args))
+
+    report = {
+        'generated_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {k: v for k, v in vars(args).items() if k not in ('output', 'baseline')},
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    for r in results:
+        print(f"{r['name']:<28} {json.dumps(r['params']):<36} p50={r['p50_ms']:>9}ms "
+              f"p99={r['p99_ms']:>9}ms  {r['throughput_per_s']}/s", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
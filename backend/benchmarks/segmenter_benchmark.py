@@ -0,0 +1,85 @@
+"""
+Compare Translate call counts between the fixed 4000-character slicer and the
+boundary-aware segmenter on English, Arabic and CJK corpora.
+
+Usage: python benchmarks/segmenter_benchmark.py [--size-kb 200] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+from segmenter import DEFAULT_MAX_CHUNK_BYTES, byte_length, segment_text, slice_text  # noqa: E402
+
+SAMPLE_PARAGRAPHS = {
+    'english': (
+        "The parties agree that this agreement shall be governed by the laws of the state. "
+        "Any dispute arising out of or in connection with it shall be settled by arbitration. "
+        "Notices must be delivered in writing to the addresses listed above.\n\n"
+    ),
+    'arabic': (
+        "يتفق الطرفان على أن تخضع هذه الاتفاقية لقوانين الدولة. "
+        "تتم تسوية أي نزاع ينشأ عنها أو يتعلق بها عن طريق التحكيم. "
+        "يجب تسليم الإشعارات كتابيًا إلى العناوين المذكورة أعلاه.\n\n"
+    ),
+    'cjk': (
+        "双方同意本协议受本州法律管辖。"
+        "因本协议引起或与之相关的任何争议应通过仲裁解决。"
+        "通知必须以书面形式送达上述地址。\n\n"
+    ),
+}
+
+
+def build_corpus(paragraph: str, size_kb: int) -> str:
+    target = size_kb * 1024
+    repeats = max(1, target // byte_length(paragraph))
+    return paragraph * repeats
+
+
+def measure(name: str, text: str, max_bytes: int) -> dict:
+    sliced = slice_text(text)
+    started = time.perf_counter()
+    segmented = segment_text(text, max_bytes)
+    elapsed = time.perf_counter() - started
+
+    assert ''.join(segmented) == text
+    oversized = sum(1 for chunk in sliced if byte_length(chunk) > max_bytes)
+
+    return {
+        'corpus': name,
+        'bytes': byte_length(text),
+        'slicer_calls': len(sliced),
+        'slicer_chunks_over_limit': oversized,
+        'segmenter_calls': len(segmented),
+        'segmenter_max_chunk_bytes': max(byte_length(chunk) for chunk in segmented),
+        'segmenter_seconds': round(elapsed, 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-kb', type=int, default=200)
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_CHUNK_BYTES)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = [
+        measure(name, build_corpus(paragraph, args.size_kb), args.max_bytes)
+        for name, paragraph in SAMPLE_PARAGRAPHS.items()
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'corpus':<10}{'bytes':>10}{'slicer':>10}{'over':>8}{'segmenter':>12}{'max bytes':>12}{'seconds':>10}")
+    for r in results:
+        print(f"{r['corpus']:<10}{r['bytes']:>10}{r['slicer_calls']:>10}{r['slicer_chunks_over_limit']:>8}"
+              f"{r['segmenter_calls']:>12}{r['segmenter_max_chunk_bytes']:>12}{r['segmenter_seconds']:>10}")
+
+
+if __name__ == '__main__':
+    main()
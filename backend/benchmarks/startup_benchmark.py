@@ -0,0 +1,124 @@
+"""
+Cold-start cost per route: module import time, first request latency and which
+AWS clients the request built. Every sample runs in a fresh interpreter.
+
+boto3 clients are really constructed, since that is the cost being tracked, but
+their calls are served by the in-memory fakes so nothing touches the network.
+--eager builds every module-level client right after import, which is how the
+handlers behaved before clients were created lazily.
+
+Usage: python benchmarks/startup_benchmark.py [--runs 5] [--eager] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROUTES = {
+    'GET /languages': ('api_handler', lambda f: f.api_event('GET', '/languages', user_id=None)),
+    'GET /translations': ('api_handler', lambda f: f.api_event('GET', '/translations')),
+    'GET /translations/{id}': ('api_handler', lambda f: f.api_event(
+        'GET', '/translations/job-000000', path_parameters={'id': 'job-000000'})),
+    'GET /translations/{id}/download': ('api_handler', lambda f: f.api_event(
+        'GET', '/translations/job-000000/download', path_parameters={'id': 'job-000000'})),
+    'POST /translations': ('api_handler', lambda f: f.api_event('POST', '/translations', body={
+        'fileName': 'notes.txt', 'sourceLanguage': 'en', 'targetLanguage': 'es',
+        'fileContent': 'Hello world. ' * 100})),
+    'POST /translations/upload-url': ('api_handler', lambda f: f.api_event('POST', '/translations/upload-url', body={
+        'fileName': 'notes.txt', 'sourceLanguage': 'en', 'targetLanguage': 'es', 'fileSize': 1300})),
+    'worker job': ('translation_worker', lambda f: {
+        'job_id': 'job-000099', 's3_input_key': 'input/benchmark-user/job-000099/document-99.txt'}),
+}
+
+
+def child(route: str, eager: bool) -> None:
+    """Measure one cold start of route in this (fresh) interpreter and print the result as JSON."""
+    import fakes
+    fakes.setup_environment()
+
+    import aws_clients
+
+    dynamodb = fakes.FakeDynamoDB()
+    jobs = dynamodb.Table('jobs')
+    fakes.seed_jobs(jobs, 'benchmark-user', 100)
+    jobs.items['job-000099']['status'] = 'pending'
+    s3 = fakes.FakeS3()
+    s3.objects[('input-bucket', 'input/benchmark-user/job-000099/document-99.txt')] = b'Hello world. ' * 100
+    doubles = {'dynamodb': dynamodb, 's3': s3, 'lambda': fakes.FakeLambda(),
+               'sqs': fakes.FakeQueue(), 'translate': fakes.FakeTranslate()}
+
+    built = []
+    build = aws_clients._build
+
+    def build_then_fake(kind, service):
+        build(kind, service)
+        built.append(service)
+        return doubles[service]
+
+    aws_clients._build = build_then_fake
+
+    module_name, make_event = ROUTES[route]
+    started = time.perf_counter()
+    module = __import__(module_name)
+    if eager:
+        for value in list(vars(module).values()):
+            if isinstance(value, aws_clients.LazyClient):
+                value.get()
+    imported = time.perf_counter()
+    response = module.lambda_handler(make_event(fakes), None)
+    first = time.perf_counter()
+    module.lambda_handler(make_event(fakes), None)
+    second = time.perf_counter()
+
+    print(json.dumps({
+        'status': response.get('statusCode'),
+        'import_ms': (imported - started) * 1000,
+        'first_request_ms': (first - imported) * 1000,
+        'warm_request_ms': (second - first) * 1000,
+        'clients_built': built,
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--eager', action='store_true', help='build all clients at import (previous behaviour)')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.eager)
+        return
+
+    results = []
+    for route in ROUTES:
+        samples = []
+        for _ in range(args.runs):
+            command = [sys.executable, os.path.abspath(__file__), '--child', route] + (['--eager'] if args.eager else [])
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+        results.append({
+            'route': route,
+            'status': samples[0]['status'],
+            'import_ms': round(statistics.median(s['import_ms'] for s in samples), 1),
+            'first_request_ms': round(statistics.median(s['first_request_ms'] for s in samples), 1),
+            'cold_total_ms': round(statistics.median(s['import_ms'] + s['first_request_ms'] for s in samples), 1),
+            'warm_request_ms': round(statistics.median(s['warm_request_ms'] for s in samples), 2),
+            'clients_built': samples[0]['clients_built'],
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'route':<34} {'status':>6} {'import':>9} {'first req':>10} {'cold total':>11} {'warm':>8}  clients")
+    for r in results:
+        print(f"{r['route']:<34} {r['status']:>6} {r['import_ms']:>7}ms {r['first_request_ms']:>8}ms "
+              f"{r['cold_total_ms']:>9}ms {r['warm_request_ms']:>6}ms  {', '.join(r['clients_built']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Peak memory while the worker translates a large text file end to end (S3 read,
+segmentation, Translate, multipart upload). The input is seeded before measuring
+starts and written parts are discarded, so the figures are the worker's own
+working set. Exits non-zero if the peak heap exceeds --budget-mb.
+
+Two figures are reported:
+  peak_heap_mb  tracemalloc's peak: memory allocated through Python's allocator
+                (strings, bytes, buffers). It does not see zlib's internal state
+                or memory the interpreter holds on to after freeing it.
+  peak_rss_mb   growth of the process's resident set over the run, sampled every
+                few milliseconds from /proc (Linux only; null elsewhere). Closer to
+                what counts against the Lambda memory size, but noisier.
+
+Output is stored uncompressed by default: a gzipped output of a repetitive input
+is small enough to fit in a single put_object and would skip the multipart path.
+
+Usage: python benchmarks/streaming_memory_benchmark.py [--size-mb 50] [--budget-mb 512] [--content-encoding gzip]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Optional
+
+from fakes import FakeDynamoDB, FakeS3, FakeTranslate, setup_environment
+
+setup_environment()
+
+import translation_worker  # noqa: E402
+
+PARAGRAPH = (
+    "The streaming pipeline reads the input incrementally and translates it chunk by chunk. "
+    "Each translated chunk is appended to a multipart upload part buffer.\n\n"
+)
+RSS_SAMPLE_SECONDS = 0.005
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size in bytes, or None where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+class RssSampler:
+    """Background thread recording the highest resident set size seen while running."""
+
+    def __init__(self):
+        self.baseline = current_rss()
+        self.peak = self.baseline
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self) -> 'RssSampler':
+        if self.baseline is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+            self.peak = max(self.peak, current_rss())
+
+    @property
+    def growth(self) -> Optional[int]:
+        return None if self.baseline is None else self.peak - self.baseline
+
+
+def measure(size: int, content_encoding: str = '') -> Dict[str, Any]:
+    """Translate a generated document of `size` bytes and report memory, calls and parts."""
+    document = (PARAGRAPH * (size // len(PARAGRAPH) + 1))[:size].encode('utf-8')
+
+    s3, dynamodb, translate = FakeS3(discard_writes=True), FakeDynamoDB(), FakeTranslate()
+    translation_worker.s3_client = s3
+    translation_worker.dynamodb = dynamodb
+    translation_worker.translate_client = translate
+    translation_worker.STORAGE_CONTENT_ENCODING = content_encoding
+    # Repeated paragraphs would otherwise be served from the translation memory
+    translation_worker.translation_memory.max_entries = 0
+
+    job_id = 'memory-benchmark'
+    input_key = f"input/benchmark-user/{job_id}/large.txt"
+    s3.objects[(translation_worker.INPUT_BUCKET, input_key)] = document
+    dynamodb.Table(translation_worker.TRANSLATION_JOBS_TABLE).items[job_id] = {
+        'id': job_id, 'user_id': 'benchmark-user', 'file_name': 'large.txt', 'status': 'pending',
+        'source_language': 'en', 'target_language': 'es', 's3_input_key': input_key,
+    }
+
+    with RssSampler() as rss:
+        tracemalloc.start()
+        started = time.perf_counter()
+        translation_worker.process_translation_request_direct({'job_id': job_id, 's3_input_key': input_key})
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'input_mb': round(size / (1024 * 1024), 1),
+        'content_encoding': content_encoding or 'identity',
+        'peak_heap_mb': round(peak / (1024 * 1024), 1),
+        'peak_rss_mb': None if rss.growth is None else round(rss.growth / (1024 * 1024), 1),
+        'translate_calls': translate.calls,
+        'bytes_written': s3.bytes_written,
+        'multipart_parts': s3.calls.get('upload_part', 0),
+        'seconds': round(elapsed, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=int, default=50)
+    parser.add_argument('--budget-mb', type=int, default=512)
+    parser.add_argument('--content-encoding', default='', choices=['', 'gzip'])
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    result = measure(args.size_mb * 1024 * 1024, args.content_encoding)
+    result['budget_mb'] = args.budget_mb
+    print(json.dumps(result, indent=None if not args.json else 2))
+    if result['peak_heap_mb'] > args.budget_mb:
+        raise SystemExit(f"Peak heap {result['peak_heap_mb']} MB exceeds {args.budget_mb} MB budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -19,11 +19,85 @@ resource "aws_dynamodb_table" "translation_jobs" {
     type = "S"
   }
 
+  attribute {
+    name = "updated_at"
+    type = "S"
+  }
+
+  attribute {
+    name = "batch_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "queued_at"
+    type = "S"
+  }
+
+  # Only the fields the job list renders are projected; document text lives in S3
   global_secondary_index {
     name     = "user-id-created-at-index"
     hash_key = "user_id"
     range_key = "created_at"
-    projection_type = "ALL"
+    projection_type = "INCLUDE"
+    non_key_attributes = [
+      "file_name",
+      "source_language",
+      "target_language",
+      "target_languages",
+      "results",
+      "status",
+      "progress_percent",
+      "updated_at",
+      "completed_at",
+      "s3_output_key",
+      "original_preview",
+      "translated_preview"
+    ]
+  }
+
+  # GET /translations/changes reads a user's jobs by last update
+  global_secondary_index {
+    name     = "user-id-updated-at-index"
+    hash_key = "user_id"
+    range_key = "updated_at"
+    projection_type = "INCLUDE"
+    non_key_attributes = [
+      "file_name",
+      "source_language",
+      "target_language",
+      "target_languages",
+      "results",
+      "status",
+      "progress_percent",
+      "created_at",
+      "completed_at",
+      "s3_output_key"
+    ]
+  }
+
+  # Sparse: only jobs submitted through POST /translations/batch carry a batch_id
+  global_secondary_index {
+    name     = "batch-id-index"
+    hash_key = "batch_id"
+    range_key = "created_at"
+    projection_type = "INCLUDE"
+    non_key_attributes = [
+      "user_id",
+      "file_name",
+      "status"
+    ]
+  }
+
+  # Sparse: a job carries queued_at only while the scheduler holds it back
+  global_secondary_index {
+    name     = "user-id-queued-at-index"
+    hash_key = "user_id"
+    range_key = "queued_at"
+    projection_type = "INCLUDE"
+    non_key_attributes = [
+      "s3_input_key"
+    ]
   }
 
   ttl {
@@ -43,4 +117,100 @@ resource "aws_dynamodb_table" "translation_jobs" {
     Environment = var.environment
     Project     = var.project_name
   }
-} 
\ No newline at end of file
+}
+
+
+resource "aws_dynamodb_table" "translation_memory" {
+  name           = "${var.project_name}-translation-memory-${random_string.suffix.result}"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "segment_hash"
+
+  attribute {
+    name = "segment_hash"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  server_side_encryption {
+    enabled = true
+  }
+
+  tags = {
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+
+# One item per token bucket; workers share the Translate budget through it
+resource "aws_dynamodb_table" "translate_rate_limit" {
+  name           = "${var.project_name}-translate-rate-limit-${random_string.suffix.result}"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "bucket_id"
+
+  attribute {
+    name = "bucket_id"
+    type = "S"
+  }
+
+  server_side_encryption {
+    enabled = true
+  }
+
+  tags = {
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+
+# One item per user: in-flight job slots, queued count and an optional max_in_flight override
+resource "aws_dynamodb_table" "scheduler" {
+  name           = "${var.project_name}-scheduler-${random_string.suffix.result}"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "user_id"
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+
+  server_side_encryption {
+    enabled = true
+  }
+
+  tags = {
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+
+resource "aws_dynamodb_table" "content_index" {
+  name           = "${var.project_name}-content-index-${random_string.suffix.result}"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "content_hash"
+
+  attribute {
+    name = "content_hash"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  server_side_encryption {
+    enabled = true
+  }
+
+  tags = {
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
@@ -43,6 +43,7 @@ resource "aws_iam_role_policy" "lambda_policy" {
           "s3:GetObject",
           "s3:PutObject",
           "s3:DeleteObject",
+          "s3:AbortMultipartUpload",
           "s3:ListBucket"
         ]
         Resource = [
@@ -60,11 +61,17 @@ resource "aws_iam_role_policy" "lambda_policy" {
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchGetItem",
+          "dynamodb:BatchWriteItem"
         ]
         Resource = [
           aws_dynamodb_table.translation_jobs.arn,
-          "${aws_dynamodb_table.translation_jobs.arn}/index/*"
+          "${aws_dynamodb_table.translation_jobs.arn}/index/*",
+          aws_dynamodb_table.translation_memory.arn,
+          aws_dynamodb_table.translate_rate_limit.arn,
+          aws_dynamodb_table.scheduler.arn,
+          aws_dynamodb_table.content_index.arn
         ]
       },
       {
@@ -75,6 +82,18 @@ resource "aws_iam_role_policy" "lambda_policy" {
         ]
         Resource = "*"
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:SendMessage",
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = [
+          aws_sqs_queue.translation_jobs.arn
+        ]
+      },
       {
         Effect = "Allow"
         Action = [
@@ -90,16 +109,32 @@ resource "aws_iam_role_policy" "lambda_policy" {
 
 data "archive_file" "api_handler" {
   type        = "zip"
-  source_file = "${path.module}/lambda_functions/api_handler.py"
+  source_dir  = "${path.module}/lambda_functions"
+  excludes    = ["*.zip", "__pycache__", "translation_worker.py", "cors_handler.py"]
   output_path = "${path.module}/lambda_functions/api_handler.zip"
 }
 
 data "archive_file" "translation_worker" {
   type        = "zip"
-  source_file = "${path.module}/lambda_functions/translation_worker.py"
+  source_dir  = "${path.module}/lambda_functions"
+  excludes    = ["*.zip", "__pycache__", "api_handler.py", "cors_handler.py"]
   output_path = "${path.module}/lambda_functions/translation_worker.zip"
 }
 
+# Built by deploy_fully_automated.sh: pip install -r requirements-worker.txt -t build/worker_layer/python
+data "archive_file" "worker_layer" {
+  type        = "zip"
+  source_dir  = "${path.module}/build/worker_layer"
+  output_path = "${path.module}/build/worker_layer.zip"
+}
+
+resource "aws_lambda_layer_version" "worker_dependencies" {
+  layer_name          = "${var.project_name}-worker-dependencies-${random_string.suffix.result}"
+  filename            = data.archive_file.worker_layer.output_path
+  source_code_hash    = data.archive_file.worker_layer.output_base64sha256
+  compatible_runtimes = ["python3.11"]
+}
+
 data "archive_file" "cors_handler" {
   type        = "zip"
   source_file = "${path.module}/lambda_functions/cors_handler.py"
@@ -123,6 +158,11 @@ resource "aws_lambda_function" "api_handler" {
       OUTPUT_BUCKET         = aws_s3_bucket.document_output.bucket
       COGNITO_USER_POOL_ID  = aws_cognito_user_pool.main.id
       TRANSLATION_WORKER_FUNCTION_NAME = aws_lambda_function.translation_worker.function_name
+      CONTENT_INDEX_TABLE   = aws_dynamodb_table.content_index.name
+      TRANSLATION_QUEUE_URL = aws_sqs_queue.translation_jobs.url
+      SCHEDULER_TABLE       = aws_dynamodb_table.scheduler.name
+      USER_MAX_IN_FLIGHT    = tostring(var.user_max_in_flight)
+      STORAGE_CONTENT_ENCODING = var.storage_content_encoding
     }
   }
 
@@ -141,12 +181,25 @@ resource "aws_lambda_function" "translation_worker" {
   runtime         = "python3.11"
   timeout         = 300
   memory_size     = 512
+  layers          = [aws_lambda_layer_version.worker_dependencies.arn]
 
   environment {
     variables = {
       TRANSLATION_JOBS_TABLE = aws_dynamodb_table.translation_jobs.name
       INPUT_BUCKET          = aws_s3_bucket.document_input.bucket
       OUTPUT_BUCKET         = aws_s3_bucket.document_output.bucket
+      TRANSLATE_MAX_CONCURRENCY = "8"
+      TRANSLATION_MEMORY_TABLE  = aws_dynamodb_table.translation_memory.name
+      CONTENT_INDEX_TABLE       = aws_dynamodb_table.content_index.name
+      JOB_BATCH_CONCURRENCY     = tostring(var.job_batch_concurrency)
+      TARGET_LANGUAGE_CONCURRENCY = "4"
+      TRANSLATE_RATE_LIMIT_TABLE  = aws_dynamodb_table.translate_rate_limit.name
+      TRANSLATE_CHARS_PER_SECOND  = tostring(var.translate_chars_per_second)
+      TRANSLATION_QUEUE_URL       = aws_sqs_queue.translation_jobs.url
+      SCHEDULER_TABLE             = aws_dynamodb_table.scheduler.name
+      USER_MAX_IN_FLIGHT          = tostring(var.user_max_in_flight)
+      STORAGE_CONTENT_ENCODING    = var.storage_content_encoding
+      JOB_QUEUE_MAX_RECEIVE_COUNT = tostring(var.translation_queue_max_receive_count)
     }
   }
 
@@ -194,7 +247,7 @@ resource "aws_s3_bucket_notification" "document_input_notification" {
   lambda_function {
     lambda_function_arn = aws_lambda_function.api_handler.arn
     events              = ["s3:ObjectCreated:*"]
-    filter_suffix       = ".txt"
+    filter_prefix       = "input/"
   }
 
   depends_on = [aws_lambda_permission.allow_s3_invoke]
@@ -216,4 +269,24 @@ resource "aws_lambda_permission" "allow_api_handler_invoke_translation_worker" {
   function_name = aws_lambda_function.translation_worker.function_name
   principal     = "lambda.amazonaws.com"
   source_arn    = aws_lambda_function.api_handler.arn
-}
\ No newline at end of file
+}
+
+
+# Dispatches queued jobs whose slots were freed by expired leases (e.g. a worker timeout)
+resource "aws_cloudwatch_event_rule" "scheduler_sweep" {
+  name                = "${var.project_name}-scheduler-sweep-${random_string.suffix.result}"
+  schedule_expression = "rate(1 minute)"
+}
+
+resource "aws_cloudwatch_event_target" "scheduler_sweep" {
+  rule = aws_cloudwatch_event_rule.scheduler_sweep.name
+  arn  = aws_lambda_function.translation_worker.arn
+}
+
+resource "aws_lambda_permission" "allow_scheduler_sweep" {
+  statement_id  = "AllowSchedulerSweep"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.translation_worker.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.scheduler_sweep.arn
+}
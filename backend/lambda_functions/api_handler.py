@@ -1,20 +1,30 @@
 import json
-import boto3
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any
 import uuid
 import base64
+import hashlib
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import aws_clients
+from document_formats import document_format, job_output_key
+from s3_streams import STORAGE_CONTENT_ENCODING, encoded_object
+from scheduler import JobScheduler
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
-lambda_client = boto3.client('lambda')
+# AWS clients are built on first use, so e.g. GET /languages never constructs one
+dynamodb = aws_clients.resource('dynamodb')
+s3_client = aws_clients.client('s3')
+lambda_client = aws_clients.client('lambda')
+sqs_client = aws_clients.client('sqs')
 
 # Environment variables
 TRANSLATION_JOBS_TABLE = os.environ['TRANSLATION_JOBS_TABLE']
@@ -22,10 +32,64 @@ INPUT_BUCKET = os.environ['INPUT_BUCKET']
 OUTPUT_BUCKET = os.environ['OUTPUT_BUCKET']
 COGNITO_USER_POOL_ID = os.environ['COGNITO_USER_POOL_ID']
 TRANSLATION_WORKER_FUNCTION_NAME = os.environ['TRANSLATION_WORKER_FUNCTION_NAME']
+CONTENT_INDEX_TABLE = os.environ.get('CONTENT_INDEX_TABLE')
+TRANSLATION_QUEUE_URL = os.environ.get('TRANSLATION_QUEUE_URL')
+PREVIEW_LENGTH = int(os.environ.get('PREVIEW_LENGTH', '200'))
+
+# Job listing
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+LIST_FIELDS = ['id', 'user_id', 'file_name', 'source_language', 'target_language', 'target_languages',
+               'results', 'status', 'progress_percent', 'created_at', 'updated_at', 'completed_at',
+               's3_output_key']
+JOB_STATUSES = ('pending', 'processing', 'completed', 'failed')
+MAX_TARGET_LANGUAGES = 10
+
+# GET /translations/changes: how long a request may wait for changes, and how often it re-checks
+CHANGES_MAX_WAIT_SECONDS = 20
+CHANGES_POLL_INTERVAL_SECONDS = 1.0
+# Changes are re-read from this far below the watermark and the client merges them by id:
+# updated_at is stamped by several writers with their own clocks and the index is
+# eventually consistent, so a change can become visible after later ones were returned
+CHANGES_OVERLAP_SECONDS = 5
+CHANGES_CURSOR_FIELDS = ('id', 'user_id', 'updated_at')
+CHANGES_SINCE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?$')
+
+# Pre-signed download URLs are cached per container and dropped well before they expire
+PRESIGNED_URL_EXPIRES_IN = 900
+PRESIGNED_URL_MIN_REMAINING = 300
+PRESIGNED_URL_CACHE_SIZE = 1024
+_presigned_url_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+_presigned_url_lock = threading.Lock()
+
+# Direct-to-S3 uploads: the browser POSTs the file to a pre-signed form on the input bucket
+UPLOAD_URL_EXPIRES_IN = 900
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', str(50 * 1024 * 1024)))
+
+# POST /translations/batch: files per request and concurrent S3 uploads/worker invokes
+MAX_BATCH_FILES = 100
+BATCH_UPLOAD_CONCURRENCY = int(os.environ.get('BATCH_UPLOAD_CONCURRENCY', '16'))
+SQS_SEND_BATCH_SIZE = 10
+
+# BatchGetItem accepts at most 100 keys; unprocessed keys are retried with backoff
+BATCH_GET_MAX_KEYS = 100
+BATCH_RETRY_ATTEMPTS = 5
+
+# POST /translations/status reads only what a progress display needs
+MAX_STATUS_IDS = BATCH_GET_MAX_KEYS
+STATUS_FIELDS = ['id', 'user_id', 'file_name', 'status', 'progress_percent', 'results', 'failed_languages',
+                 'updated_at', 'completed_at']
+
+# Per-user in-flight caps between job creation and the worker; dispatches
+# immediately when SCHEDULER_TABLE is not configured
+job_scheduler = JobScheduler.from_environment(
+    dynamodb, lambda job: invoke_translation_worker(job['id'], job['s3_input_key'])
+)
 
 CORS_HEADERS = {
     'Access-Control-Allow-Origin': '*',  
-    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Amz-User-Agent',
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Amz-User-Agent,If-None-Match',
+    'Access-Control-Expose-Headers': 'ETag',
     'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS,PATCH',
     'Access-Control-Max-Age': '86400',
     'Access-Control-Allow-Credentials': 'true'
@@ -34,7 +98,8 @@ CORS_HEADERS = {
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main Lambda handler for API requests and document processing."""
     logger.info("=== LAMBDA HANDLER START ===")
-    logger.info(f"Event: {json.dumps(event, default=str)}")
+    # The full event can carry a whole document, so only its shape is logged
+    logger.info(f"Event: {event.get('httpMethod')} {event.get('path')}, records: {len(event.get('Records') or [])}")
     logger.info(f"Context: {context}")
     
     try:
@@ -46,15 +111,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Handle API Gateway requests
         http_method = event['httpMethod']
         path = event['path']
-        path_parameters = event.get('pathParameters') or {}
         
-        logger.info(f"HTTP Method: {http_method}")
-        logger.info(f"Path: {path}")
-        logger.info(f"Path Parameters: {path_parameters}")
-        logger.info(f"Request Headers: {event.get('headers', {})}")
-        logger.info(f"Query Parameters: {event.get('queryStringParameters', {})}")
-        
-       
         if http_method == 'OPTIONS':
             return {
                 'statusCode': 200,
@@ -62,28 +119,22 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': json.dumps({'message': 'CORS preflight successful'})
             }
         
-    
-        logger.info(f"Routing request: {http_method} {path}")
-        
-        if http_method == 'GET' and path == '/languages':
-            logger.info("Routing to get_languages")
-            return get_languages()
-        elif http_method == 'GET' and path == '/translations':
-            logger.info("Routing to get_translations")
-            return get_translations(event)
-        elif http_method == 'POST' and path == '/translations':
-            logger.info("Routing to create_translation")
-            return create_translation(event)
-        elif http_method == 'GET' and path.startswith('/translations/'):
-            logger.info(f"Routing to get_translation with ID: {path_parameters.get('id')}")
-            return get_translation(path_parameters.get('id'), event)
-        else:
+        route = match_route(http_method, path)
+        if not route:
             logger.warning(f"No route found for {http_method} {path}")
             return {
                 'statusCode': 404,
                 'headers': CORS_HEADERS,
                 'body': json.dumps({'error': 'Route not found'})
             }
+        
+        handler, path_parameters = route
+        # API Gateway's own (decoded) path parameters win over the pattern's groups
+        for name, value in (event.get('pathParameters') or {}).items():
+            if name in path_parameters:
+                path_parameters[name] = value
+        logger.info(f"Routing {http_method} {path} with {path_parameters}")
+        return handler(event, **path_parameters)
     except Exception as e:
         logger.error(f"=== LAMBDA HANDLER ERROR ===")
         logger.error(f"Error type: {type(e).__name__}")
@@ -139,7 +190,7 @@ def process_s3_event(event: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 def process_document(s3_event: Dict[str, Any]) -> None:
-    """Process a single document from S3 event."""
+    """Hand a newly uploaded document to the translation worker by reference."""
     bucket = s3_event['bucket']['name']
     key = s3_event['object']['key']
     
@@ -151,22 +202,6 @@ def process_document(s3_event: Dict[str, Any]) -> None:
     logger.info(f"Decoded key: {decoded_key}")
     
     try:
-      
-        response = s3_client.get_object(Bucket=bucket, Key=decoded_key)
-  
-        file_name = key.split('/')[-1]  
-        if file_name.lower().endswith('.pdf'):
-           
-            import base64
-            content_bytes = response['Body'].read()
-            content = base64.b64encode(content_bytes).decode('utf-8')
-            logger.info(f"PDF file read as base64, length: {len(content)}")
-        else:
-          
-            content = response['Body'].read().decode('utf-8')
-            logger.info(f"Text file read as UTF-8, length: {len(content)}")
-        
-      
         job_id = extract_job_id_from_key(decoded_key)
         
       
@@ -176,12 +211,22 @@ def process_document(s3_event: Dict[str, Any]) -> None:
             logger.error(f"Translation job not found for key: {decoded_key}")
             return
         
-      
-        update_job_status(job_id, 'processing')
+        # Only the exact key issued for the job may start it, and only once
+        if job.get('s3_input_key') != decoded_key:
+            logger.warning(f"Ignoring upload {decoded_key}: job {job_id} expects {job.get('s3_input_key')}")
+            return
+        if job.get('status') != 'pending':
+            logger.info(f"Job {job_id} is already {job.get('status')}, not re-queuing")
+            return
         
-       
-        invoke_translation_worker(job_id, content, job)
-        logger.info(f"Invoked translation worker for job: {job_id}")
+        if 'input_size_bytes' not in job:
+            record_input_size(job_id, s3_event['object'].get('size', 0))
+        
+        # The worker reads the object itself and claims the job, so a duplicate
+        # delivery from create_translation's own invoke is ignored there (and the
+        # scheduler only queues a job once)
+        job_scheduler.submit(job)
+        logger.info(f"Submitted job {job_id} to the translation worker")
         
     except Exception as e:
         logger.error(f"Error processing document: {str(e)}")
@@ -223,18 +268,36 @@ def update_job_status(job_id: str, status: str) -> None:
     except Exception as e:
         logger.error(f"Error updating job status: {str(e)}")
 
-def invoke_translation_worker(job_id: str, content: str, job: Dict[str, Any]) -> None:
-    """Invoke translation worker lambda directly."""
+def record_input_size(job_id: str, size: int) -> None:
+    """Store the size of a direct upload, which the API never saw."""
+    try:
+        table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        table.update_item(
+            Key={'id': job_id},
+            UpdateExpression='SET input_size_bytes = :size',
+            ExpressionAttributeValues={':size': size}
+        )
+    except Exception as e:
+        logger.error(f"Error recording input size: {str(e)}")
+
+def invoke_translation_worker(job_id: str, input_key: str) -> None:
+    """
+    Hand a job to the translation worker with a claim check for the S3 input.
+    Uses the SQS job queue when TRANSLATION_QUEUE_URL is set, otherwise an async invoke.
+    """
     try:
         payload = {
             'job_id': job_id,
-            'content': content,
-            'source_language': job['source_language'],
-            'target_language': job['target_language'],
-            'file_name': job['file_name'],
-            'user_id': job['user_id']
+            's3_input_key': input_key
         }
         
+        if TRANSLATION_QUEUE_URL:
+            sqs_client.send_message(
+                QueueUrl=TRANSLATION_QUEUE_URL,
+                MessageBody=json.dumps(payload)
+            )
+            return
+        
         lambda_client.invoke(
             FunctionName=TRANSLATION_WORKER_FUNCTION_NAME,
             InvocationType='Event',  # Asynchronous invocation
@@ -244,8 +307,110 @@ def invoke_translation_worker(job_id: str, content: str, job: Dict[str, Any]) ->
         logger.error(f"Error invoking translation worker: {str(e)}")
         raise e
 
-def get_languages() -> Dict[str, Any]:
-    """Get list of supported languages."""
+def enqueue_translation_jobs(jobs: list) -> None:
+    """
+    Hand many jobs to the worker at once: through the scheduler when it is enabled,
+    else SendMessageBatch in groups of ten when the job queue is configured, otherwise
+    concurrent async invokes. A job that cannot be enqueued is logged and left
+    pending, as in create_translation.
+    """
+    if job_scheduler.enabled:
+        try:
+            job_scheduler.submit_many(jobs)
+        except Exception as e:
+            logger.error(f"Error scheduling {len(jobs)} translation jobs: {str(e)}")
+        return
+    
+    payloads = [{'job_id': job['id'], 's3_input_key': job['s3_input_key']} for job in jobs]
+    if not payloads:
+        return
+    
+    if TRANSLATION_QUEUE_URL:
+        for start in range(0, len(payloads), SQS_SEND_BATCH_SIZE):
+            group = payloads[start:start + SQS_SEND_BATCH_SIZE]
+            try:
+                response = sqs_client.send_message_batch(
+                    QueueUrl=TRANSLATION_QUEUE_URL,
+                    Entries=[{'Id': payload['job_id'], 'MessageBody': json.dumps(payload)} for payload in group]
+                )
+            except Exception as e:
+                logger.error(f"Error enqueuing {len(group)} translation jobs: {str(e)}")
+                continue
+            for failure in response.get('Failed', []):
+                logger.error(f"Failed to enqueue job {failure['Id']}: {failure.get('Message')}")
+        return
+    
+    def invoke(payload: Dict[str, Any]) -> None:
+        try:
+            invoke_translation_worker(payload['job_id'], payload['s3_input_key'])
+        except Exception:
+            pass  # already logged; the job stays pending
+    
+    with ThreadPoolExecutor(max_workers=min(BATCH_UPLOAD_CONCURRENCY, len(payloads))) as executor:
+        list(executor.map(invoke, payloads))
+
+def match_route(http_method: str, path: str) -> tuple:
+    """Find (handler, path_parameters) for a request in ROUTES, or None."""
+    for method, pattern, handler in ROUTES:
+        if method == http_method:
+            match = pattern.match(path)
+            if match:
+                return handler, match.groupdict()
+    return None
+
+def get_header(event: Dict[str, Any], name: str) -> str:
+    """Case-insensitive request header lookup."""
+    name = name.lower()
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given version parts."""
+    digest = hashlib.sha256('\x00'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+def etag_matches(event: Dict[str, Any], etag: str) -> bool:
+    """True if the request's If-None-Match names etag (or is *)."""
+    header = get_header(event, 'If-None-Match')
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(',')]
+    return '*' in candidates or etag in [
+        candidate[2:] if candidate.startswith('W/') else candidate for candidate in candidates
+    ]
+
+def not_modified(headers: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        'statusCode': 304,
+        'headers': headers,
+        'body': ''
+    }
+
+def build_static_response(payload: Any, max_age: int) -> Dict[str, Any]:
+    """Serialise a static payload once, with validators, for reuse by every request in the container."""
+    body = json.dumps(payload)
+    return {
+        'statusCode': 200,
+        'headers': {
+            **CORS_HEADERS,
+            'Content-Type': 'application/json',
+            'ETag': make_etag(body),
+            'Cache-Control': f"public, max-age={max_age}"
+        },
+        'body': body
+    }
+
+def get_languages(event: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Get list of supported languages, answering If-None-Match with 304."""
+    response = STATIC_RESPONSES['/languages']
+    if event and etag_matches(event, response['headers']['ETag']):
+        return not_modified(response['headers'])
+    return response
+
+def _languages() -> list:
+    """Supported languages."""
     languages = [
         {'code': 'en', 'name': 'English'},
         {'code': 'es', 'name': 'Spanish'},
@@ -264,14 +429,13 @@ def get_languages() -> Dict[str, Any]:
         {'code': 'pl', 'name': 'Polish'}
     ]
     
-    return {
-        'statusCode': 200,
-        'headers': CORS_HEADERS,
-        'body': json.dumps(languages)
-    }
+    return languages
 
 def get_translations(event: Dict[str, Any]) -> Dict[str, Any]:
-    """Get user's translation jobs with proper user isolation and pre-signed S3 URLs for completed jobs."""
+    """
+    Get one page of the user's translation jobs, newest first.
+    Query parameters: limit, cursor (from a previous nextCursor), status, from/to (created_at bounds).
+    """
     user_id = get_user_id_from_event(event)
     
     if not user_id:
@@ -281,34 +445,30 @@ def get_translations(event: Dict[str, Any]) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Unauthorized'})
         }
     
+    try:
+        query_kwargs = build_translations_query(user_id, event.get('queryStringParameters') or {})
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': str(e)})
+        }
+    
     try:
         table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
         
      
-        response = table.query(
-            IndexName='user-id-created-at-index',
-            KeyConditionExpression='user_id = :user_id',
-            ExpressionAttributeValues={':user_id': user_id},
-            ScanIndexForward=False 
-        )
-        items = response['Items']
-       
-        for item in items:
-            if item.get('status') == 'completed' and item.get('s3_output_key'):
-                try:
-                    presigned_url = s3_client.generate_presigned_url(
-                        'get_object',
-                        Params={'Bucket': OUTPUT_BUCKET, 'Key': item['s3_output_key']},
-                        ExpiresIn=900  
-                    )
-                    item['download_url'] = presigned_url
-                except Exception as e:
-                    logger.error(f"Error generating pre-signed URL for job {item.get('id')}: {str(e)}")
-                    item['download_url'] = None
+        response = table.query(**query_kwargs)
+        items = add_download_paths(response['Items'])
+        
+        last_key = response.get('LastEvaluatedKey')
         return {
             'statusCode': 200,
             'headers': CORS_HEADERS,
-            'body': json.dumps(items, default=str)
+            'body': json.dumps({
+                'items': items,
+                'nextCursor': encode_cursor(last_key) if last_key else None
+            }, default=str)
         }
     except Exception as e:
         logger.error(f"Error getting translations: {str(e)}")
@@ -318,6 +478,209 @@ def get_translations(event: Dict[str, Any]) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Failed to get translations'})
         }
 
+def add_download_paths(items: list) -> list:
+    """Point completed items at GET /translations/{id}/download; URLs are signed on demand there."""
+    for item in items:
+        if item.get('status') == 'completed' and item.get('s3_output_key'):
+            item['download_path'] = f"/translations/{item['id']}/download"
+        for language, result in (item.get('results') or {}).items():
+            if result.get('status') == 'completed':
+                result['download_path'] = f"/translations/{item['id']}/download?language={language}"
+    return items
+
+def get_translation_changes(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Jobs updated after ?since=<updated_at watermark>, oldest change first, read from the
+    user-id-updated-at-index so the cost follows what changed rather than history size.
+    Returns {items, watermark, hasMore, cursor}; pass watermark back as the next since.
+    Items from the last CHANGES_OVERLAP_SECONDS before since are returned again, so
+    callers merge items by id. With hasMore, fetch the rest with the same since and
+    ?cursor=<cursor> before moving on. With ?wait=<seconds> (up to
+    CHANGES_MAX_WAIT_SECONDS) the request long-polls until something newer than since
+    appears. Without since, returns no items and the current watermark.
+    """
+    user_id = get_user_id_from_event(event)
+    
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Unauthorized'})
+        }
+    
+    params = event.get('queryStringParameters') or {}
+    since = params.get('since')
+    try:
+        wait = float(params.get('wait') or 0)
+    except ValueError:
+        wait = -1
+    if not 0 <= wait <= CHANGES_MAX_WAIT_SECONDS:
+        return {
+            'statusCode': 400,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': f"wait must be between 0 and {CHANGES_MAX_WAIT_SECONDS} seconds"})
+        }
+    if since is not None and not CHANGES_SINCE_PATTERN.match(since):
+        return {
+            'statusCode': 400,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'since must be an ISO 8601 timestamp'})
+        }
+    start_key = None
+    if params.get('cursor'):
+        try:
+            start_key = decode_cursor(params['cursor'], CHANGES_CURSOR_FIELDS)
+            if start_key['user_id'] != user_id:
+                raise ValueError('Invalid cursor')
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': str(e)})
+            }
+    
+    try:
+        table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        
+        def latest_update(after: str = None) -> str:
+            """updated_at of the user's newest job (newer than after, if given), or None."""
+            key_condition = 'user_id = :user_id'
+            values = {':user_id': user_id}
+            if after is not None:
+                key_condition += ' AND updated_at > :after'
+                values[':after'] = after
+            response = table.query(
+                IndexName='user-id-updated-at-index',
+                KeyConditionExpression=key_condition,
+                ExpressionAttributeValues=values,
+                ProjectionExpression='updated_at',
+                ScanIndexForward=False,
+                Limit=1
+            )
+            return response['Items'][0]['updated_at'] if response['Items'] else None
+        
+        if since is None:
+            latest = latest_update() or datetime.utcnow().isoformat()
+            return {
+                'statusCode': 200,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'items': [], 'watermark': latest, 'hasMore': False, 'cursor': None})
+            }
+        
+        if start_key is None:
+            # Wait on a one-item key read; the overlap alone is not news
+            deadline = time.monotonic() + wait
+            while latest_update(since) is None and time.monotonic() + CHANGES_POLL_INTERVAL_SECONDS <= deadline:
+                time.sleep(CHANGES_POLL_INTERVAL_SECONDS)
+        
+        names = {f"#f{i}": field for i, field in enumerate(LIST_FIELDS)}
+        overlap_start = (datetime.fromisoformat(since) - timedelta(seconds=CHANGES_OVERLAP_SECONDS)).isoformat()
+        query_kwargs = {
+            'IndexName': 'user-id-updated-at-index',
+            'KeyConditionExpression': 'user_id = :user_id AND updated_at > :start',
+            'ProjectionExpression': ', '.join(names.keys()),
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': {':user_id': user_id, ':start': overlap_start},
+            'ScanIndexForward': True,
+            'Limit': MAX_PAGE_SIZE
+        }
+        if start_key is not None:
+            query_kwargs['ExclusiveStartKey'] = start_key
+        response = table.query(**query_kwargs)
+        items = response['Items']
+        last_key = response.get('LastEvaluatedKey')
+        # The watermark only moves once every page is read, so items sharing a
+        # timestamp across a page boundary are not skipped
+        watermark = since if last_key else max([since] + [item['updated_at'] for item in items])
+        
+        return {
+            'statusCode': 200,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({
+                'items': add_download_paths(items),
+                'watermark': watermark,
+                'hasMore': last_key is not None,
+                'cursor': encode_cursor(last_key) if last_key else None
+            }, default=str)
+        }
+    except Exception as e:
+        logger.error(f"Error getting translation changes: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Failed to get translation changes'})
+        }
+
+def build_translations_query(user_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate list query parameters into table.query arguments. Raises ValueError on bad input."""
+    try:
+        limit = int(params.get('limit') or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    
+    names = {f"#f{i}": field for i, field in enumerate(LIST_FIELDS)}
+    values = {':user_id': user_id}
+    key_condition = 'user_id = :user_id'
+    
+    created_from = params.get('from')
+    created_to = params.get('to')
+    if created_from and created_to:
+        key_condition += ' AND created_at BETWEEN :created_from AND :created_to'
+    elif created_from:
+        key_condition += ' AND created_at >= :created_from'
+    elif created_to:
+        key_condition += ' AND created_at <= :created_to'
+    if created_from:
+        values[':created_from'] = created_from
+    if created_to:
+        # created_at is a full ISO timestamp, so a bare date should include that whole day
+        values[':created_to'] = created_to + '~' if len(created_to) == 10 else created_to
+    
+    query_kwargs = {
+        'IndexName': 'user-id-created-at-index',
+        'KeyConditionExpression': key_condition,
+        'ProjectionExpression': ', '.join(names.keys()),
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+        'ScanIndexForward': False,
+        'Limit': limit
+    }
+    
+    status = params.get('status')
+    if status:
+        if status not in JOB_STATUSES:
+            raise ValueError(f"status must be one of {', '.join(JOB_STATUSES)}")
+        status_name = next(name for name, field in names.items() if field == 'status')
+        values[':status'] = status
+        query_kwargs['FilterExpression'] = f"{status_name} = :status"
+    
+    cursor = params.get('cursor')
+    if cursor:
+        start_key = decode_cursor(cursor)
+        if start_key.get('user_id') != user_id:
+            raise ValueError('Invalid cursor')
+        query_kwargs['ExclusiveStartKey'] = start_key
+    
+    return query_kwargs
+
+def encode_cursor(last_evaluated_key: Dict[str, Any]) -> str:
+    """Opaque, URL-safe pagination cursor for a DynamoDB LastEvaluatedKey."""
+    raw = json.dumps(last_evaluated_key, default=str, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, key_fields: tuple = ('id', 'user_id', 'created_at')) -> Dict[str, Any]:
+    """Inverse of encode_cursor for a key of the given index's fields. Raises ValueError on malformed cursors."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        start_key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(start_key, dict) or set(start_key) != set(key_fields):
+        raise ValueError('Invalid cursor')
+    return start_key
+
 def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
     """Create new translation job with user isolation."""
     logger.info("=== CREATE TRANSLATION START ===")
@@ -338,12 +701,6 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
         # Add detailed logging for debugging
         logger.info(f"Event body type: {type(event.get('body'))}")
         logger.info(f"Event body length: {len(event.get('body', ''))}")
-        logger.info(f"Event body preview: {repr(event.get('body', '')[:200])}...")
-        logger.info(f"Event headers: {event.get('headers', {})}")
-        logger.info(f"Content-Type header: {event.get('headers', {}).get('Content-Type', 'NOT_SET')}")
-        logger.info(f"Content-Length header: {event.get('headers', {}).get('Content-Length', 'NOT_SET')}")
-        logger.info(f"User-Agent header: {event.get('headers', {}).get('User-Agent', 'NOT_SET')}")
-        logger.info(f"Authorization header present: {'Authorization' in event.get('headers', {})}")
         
         
         if not event.get('body'):
@@ -364,7 +721,6 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
             
             if is_base64:
                 logger.info("Body is base64 encoded, decoding...")
-                import base64
                 try:
                     body_content = base64.b64decode(body_content).decode('utf-8')
                     logger.info("Base64 decode successful")
@@ -378,12 +734,6 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
             
             body = json.loads(body_content)
             logger.info(f"JSON parsed successfully. Body keys: {list(body.keys())}")
-            logger.info(f"Body values preview:")
-            for key, value in body.items():
-                if isinstance(value, str):
-                    logger.info(f"  {key}: {repr(value[:100])}... (length: {len(value)})")
-                else:
-                    logger.info(f"  {key}: {value}")
         except json.JSONDecodeError as json_error:
             logger.error(f"=== JSON PARSING ERROR ===")
             logger.error(f"JSON error type: {type(json_error).__name__}")
@@ -391,9 +741,6 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
             logger.error(f"JSON error line: {json_error.lineno}")
             logger.error(f"JSON error column: {json_error.colno}")
             logger.error(f"JSON error position: {json_error.pos}")
-            logger.error(f"Body content (raw): {repr(event['body'])}")
-            logger.error(f"Body content (first 500 chars): {repr(event['body'][:500])}")
-            logger.error(f"Body content (last 500 chars): {repr(event['body'][-500:])}")
             logger.error(f"Is base64 encoded: {event.get('isBase64Encoded', False)}")
             return {
                 'statusCode': 400,
@@ -404,6 +751,7 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
         file_name = body.get('fileName')
         source_language = body.get('sourceLanguage')
         target_language = body.get('targetLanguage')
+        target_languages = body.get('targetLanguages')
         file_content = body.get('fileContent')
         file_type = body.get('fileType', 'text/plain')
         
@@ -413,10 +761,6 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"  - targetLanguage: {target_language} (type: {type(target_language)})")
         logger.info(f"  - fileContent length: {len(file_content) if file_content else 0}")
         logger.info(f"  - fileType: {file_type}")
-        if file_type == 'application/pdf':
-            logger.info(f"  - fileContent (PDF base64): {repr(file_content[:100]) if file_content else 'None'}...")
-        else:
-            logger.info(f"  - fileContent preview: {repr(file_content[:100]) if file_content else 'None'}...")
         
      
         logger.info(f"Field validation:")
@@ -425,7 +769,17 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"  - targetLanguage valid: {bool(target_language and isinstance(target_language, str))}")
         logger.info(f"  - fileContent valid: {bool(file_content and isinstance(file_content, str))}")
         
-        if not all([file_name, source_language, target_language, file_content]):
+        try:
+            target_language, target_languages = parse_target_languages(target_language, target_languages)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': str(e)})
+            }
+        logger.info(f"  - targetLanguages: {target_languages}")
+        
+        if not all([file_name, source_language, target_language or target_languages, file_content]):
             logger.error("Missing required fields in request")
             logger.error(f"  - fileName present: {bool(file_name)}")
             logger.error(f"  - sourceLanguage present: {bool(source_language)}")
@@ -441,44 +795,96 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
                 'body': json.dumps({'error': 'Missing required fields'})
             }
         
+        try:
+            validate_file_name(file_name)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': str(e)})
+            }
+        
         job_id = str(uuid.uuid4())
         input_key = f"input/{user_id}/{job_id}/{file_name}"
         
         logger.info(f"Generated job ID: {job_id}")
         logger.info(f"S3 input key: {input_key}")
         
+        if file_type == 'application/pdf':
+            file_bytes = base64.b64decode(file_content)
+            content_type = 'application/pdf'
+            logger.info(f"PDF file size: {len(file_bytes)} bytes")
+        else:
+            file_bytes = file_content.encode('utf-8')
+            content_type = 'text/plain'
+            logger.info(f"Text file size: {len(file_bytes)} bytes")
+        
+        now = datetime.utcnow()
+        translation_job = {
+            'id': job_id,
+            'user_id': user_id,  
+            'file_name': file_name,
+            'source_language': source_language,
+            'status': 'pending',
+            'created_at': now.isoformat(),
+            'updated_at': now.isoformat(),
+            's3_input_key': input_key,
+            'input_size_bytes': len(file_bytes),
+            'expires_at': int(now.timestamp()) + (30 * 24 * 60 * 60)  
+        }
+        
+        if target_languages:
+            # One parent job; each language reports its own status and output under results
+            translation_job['target_languages'] = target_languages
+            translation_job['results'] = {language: {'status': 'pending'} for language in target_languages}
+            existing = None
+        else:
+            translation_job['target_language'] = target_language
+            translation_job['content_hash'] = compute_content_hash(file_bytes, source_language, target_language,
+                                                                   user_id, file_name)
+            logger.info(f"Content hash: {translation_job['content_hash']}")
+            # The same user already translated identical bytes to the same language: reuse the output
+            existing = find_completed_translation(translation_job['content_hash'])
+        
+        if content_type == 'text/plain' and PREVIEW_LENGTH > 0:
+            translation_job['original_preview'] = file_content[:PREVIEW_LENGTH]
+        
+        if existing:
+            try:
+                output_key = job_output_key(user_id, job_id, file_name)
+                copy_translation_output(existing['s3_output_key'], output_key)
+                translation_job.update({
+                    'status': 'completed',
+                    's3_input_key': existing.get('s3_input_key', input_key),
+                    's3_output_key': output_key,
+                    'completed_at': now.isoformat(),
+                    'updated_at': now.isoformat(),
+                    'deduplicated_from': existing['job_id']
+                })
+                dynamodb.Table(TRANSLATION_JOBS_TABLE).put_item(Item=translation_job)
+                logger.info(f"Job {job_id} deduplicated from job {existing['job_id']}")
+                return {
+                    'statusCode': 201,
+                    'headers': CORS_HEADERS,
+                    'body': json.dumps(translation_job, default=str)
+                }
+            except Exception as dedup_error:
+                # Fall back to a normal translation if the previous output is gone
+                logger.warning(f"Deduplication failed, translating normally: {dedup_error}")
+                translation_job.update({
+                    'status': 'pending',
+                    's3_input_key': input_key
+                })
+                for field in ('s3_output_key', 'completed_at', 'deduplicated_from'):
+                    translation_job.pop(field, None)
+        
         # Upload file to S3 with user-specific path
         try:
             logger.info("Uploading file to S3...")
             logger.info(f"S3 bucket: {INPUT_BUCKET}")
             logger.info(f"S3 key: {input_key}")
             
-         
-            if file_type == 'application/pdf':
-               
-                import base64
-                file_bytes = base64.b64decode(file_content)
-                logger.info(f"PDF file size: {len(file_bytes)} bytes")
-                
-                s3_response = s3_client.put_object(
-                    Bucket=INPUT_BUCKET,
-                    Key=input_key,
-                    Body=file_bytes,
-                    ContentType='application/pdf',
-                    ServerSideEncryption='AES256'
-                )
-            else:
-                # For text files, upload as UTF-8 text
-                file_bytes = file_content.encode('utf-8')
-                logger.info(f"Text file size: {len(file_bytes)} bytes")
-                
-                s3_response = s3_client.put_object(
-                    Bucket=INPUT_BUCKET,
-                    Key=input_key,
-                    Body=file_bytes,
-                    ContentType='text/plain',
-                    ServerSideEncryption='AES256'
-                )
+            s3_response = put_input_object(input_key, file_bytes, content_type)
             
             logger.info(f"S3 upload successful. ETag: {s3_response.get('ETag')}")
             logger.info(f"S3 response: {s3_response}")
@@ -490,24 +896,9 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
             logger.error(f"S3 error traceback: {traceback.format_exc()}")
             raise
         
-     
-        translation_job = {
-            'id': job_id,
-            'user_id': user_id,  
-            'file_name': file_name,
-            'source_language': source_language,
-            'target_language': target_language,
-            'status': 'pending',
-            'created_at': datetime.utcnow().isoformat(),
-            's3_input_key': input_key,
-            'original_text': file_content,
-            'expires_at': int(datetime.utcnow().timestamp()) + (30 * 24 * 60 * 60)  
-        }
-        
         logger.info("Saving translation job to DynamoDB...")
         logger.info(f"DynamoDB table: {TRANSLATION_JOBS_TABLE}")
         logger.info(f"Translation job keys: {list(translation_job.keys())}")
-        logger.info(f"Translation job preview: {json.dumps(translation_job, default=str)[:500]}...")
         
         try:
             table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
@@ -523,9 +914,9 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
         
         
         try:
-            logger.info("Invoking translation worker...")
-            invoke_translation_worker(job_id, file_content, translation_job)
-            logger.info("Translation worker invoked successfully")
+            logger.info("Submitting job to the translation worker...")
+            job_scheduler.submit(translation_job)
+            logger.info("Translation job submitted successfully")
         except Exception as worker_error:
             logger.error(f"Failed to invoke translation worker: {worker_error}")
            
@@ -549,8 +940,518 @@ def create_translation(event: Dict[str, Any]) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Failed to create translation'})
         }
 
+def create_upload_url(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create a pending translation job and return a pre-signed POST for its input key.
+    The file goes straight to S3; the input bucket notification starts translation
+    once the object lands, so document bytes never pass through API Gateway.
+    """
+    user_id = get_user_id_from_event(event)
+    
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Unauthorized'})
+        }
+    
+    try:
+        try:
+            body = json.loads(event.get('body') or '{}')
+        except json.JSONDecodeError:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'Invalid JSON in request body'})
+            }
+        
+        file_name = body.get('fileName')
+        source_language = body.get('sourceLanguage')
+        file_type = 'application/pdf' if body.get('fileType') == 'application/pdf' else 'text/plain'
+        file_size = body.get('fileSize')
+        
+        try:
+            target_language, target_languages = parse_target_languages(
+                body.get('targetLanguage'), body.get('targetLanguages'))
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': str(e)})
+            }
+        
+        if not all([file_name, source_language, target_language or target_languages]):
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'Missing required fields'})
+            }
+        
+        try:
+            validate_file_name(file_name)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': str(e)})
+            }
+        
+        if file_size is not None and (not isinstance(file_size, int) or not 0 < file_size <= MAX_UPLOAD_BYTES):
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': f"fileSize must be between 1 and {MAX_UPLOAD_BYTES} bytes"})
+            }
+        
+        job_id = str(uuid.uuid4())
+        input_key = f"input/{user_id}/{job_id}/{file_name}"
+        
+        now = datetime.utcnow()
+        translation_job = {
+            'id': job_id,
+            'user_id': user_id,
+            'file_name': file_name,
+            'source_language': source_language,
+            'status': 'pending',
+            'created_at': now.isoformat(),
+            'updated_at': now.isoformat(),
+            's3_input_key': input_key,
+            'expires_at': int(now.timestamp()) + (30 * 24 * 60 * 60)
+        }
+        if target_languages:
+            translation_job['target_languages'] = target_languages
+            translation_job['results'] = {language: {'status': 'pending'} for language in target_languages}
+        else:
+            translation_job['target_language'] = target_language
+        
+        upload = create_presigned_upload(input_key, file_type)
+        
+        table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        table.put_item(Item=translation_job)
+        logger.info(f"Created job {job_id} awaiting direct upload to {input_key}")
+        
+        return {
+            'statusCode': 201,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({
+                'job': translation_job,
+                'upload': upload
+            }, default=str)
+        }
+    except Exception as e:
+        logger.error(f"Error creating upload URL: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Failed to create upload URL'})
+        }
+
+def create_translation_batch(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Submit many documents in one request. Each entry in `files` either carries its
+    fileContent, which is uploaded here, or only metadata, in which case it gets a
+    pre-signed POST like POST /translations/upload-url. Uploads run concurrently,
+    job items are written with BatchWriteItem and inline jobs are enqueued in bulk.
+    Every job records the returned batchId for GET /translations/batch/{batchId}.
+    A file that fails validation or upload is reported in its own result entry
+    without failing the rest of the batch.
+    """
+    user_id = get_user_id_from_event(event)
+    
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Unauthorized'})
+        }
+    
+    try:
+        try:
+            body = json.loads(event.get('body') or '{}')
+        except json.JSONDecodeError:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'Invalid JSON in request body'})
+            }
+        
+        files = body.get('files')
+        if not isinstance(files, list) or not files:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'files must be a non-empty list'})
+            }
+        if len(files) > MAX_BATCH_FILES:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': f"At most {MAX_BATCH_FILES} files per batch"})
+            }
+        
+        batch_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        results = [
+            {'index': index, 'fileName': spec.get('fileName') if isinstance(spec, dict) else None}
+            for index, spec in enumerate(files)
+        ]
+        
+        entries = []
+        for index, spec in enumerate(files):
+            try:
+                entry = prepare_batch_file(spec, body, user_id, batch_id, now)
+            except ValueError as e:
+                results[index]['error'] = str(e)
+                continue
+            entry['index'] = index
+            entries.append(entry)
+        
+        # One BatchGetItem on the content index instead of a lookup per file
+        existing = find_completed_translations(
+            [entry['job']['content_hash'] for entry in entries if 'content_hash' in entry['job']])
+        
+        def stage(entry: Dict[str, Any]) -> bool:
+            try:
+                stage_batch_file(entry, existing.get(entry['job'].get('content_hash')))
+                return True
+            except Exception as e:
+                logger.error(f"Failed to stage {entry['job']['s3_input_key']}: {str(e)}")
+                results[entry['index']]['error'] = 'Failed to upload file'
+                return False
+        
+        staged = []
+        if entries:
+            with ThreadPoolExecutor(max_workers=min(BATCH_UPLOAD_CONCURRENCY, len(entries))) as executor:
+                staged = [entry for entry, ok in zip(entries, executor.map(stage, entries)) if ok]
+        
+        if staged:
+            # batch_writer sends BatchWriteItem requests of 25 and resubmits unprocessed items
+            table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+            with table.batch_writer() as batch:
+                for entry in staged:
+                    batch.put_item(Item=entry['job'])
+        
+        # Direct uploads start from the input bucket notification once their object lands
+        enqueue_translation_jobs([
+            entry['job'] for entry in staged
+            if entry['file_bytes'] is not None and entry['job']['status'] == 'pending'
+        ])
+        
+        for entry in staged:
+            results[entry['index']]['job'] = entry['job']
+            if 'upload' in entry:
+                results[entry['index']]['upload'] = entry['upload']
+        
+        logger.info(f"Batch {batch_id}: submitted {len(staged)} of {len(files)} files")
+        return {
+            'statusCode': 201 if staged else 400,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({
+                'batchId': batch_id,
+                'submitted': len(staged),
+                'failed': len(files) - len(staged),
+                'items': results
+            }, default=str)
+        }
+    except Exception as e:
+        logger.error(f"Error creating translation batch: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Failed to create translation batch'})
+        }
+
+def prepare_batch_file(spec: Any, defaults: Dict[str, Any], user_id: str, batch_id: str,
+                       now: datetime) -> Dict[str, Any]:
+    """
+    Validate one batch entry and build its pending job. sourceLanguage and
+    targetLanguage(s) fall back to the batch-level values. Returns
+    {'job', 'file_bytes', 'content_type'}, with file_bytes None for a direct upload.
+    Raises ValueError with a message for the client.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError('Each file must be an object')
+    
+    file_name = validate_file_name(spec.get('fileName'))
+    
+    source_language = spec.get('sourceLanguage') or defaults.get('sourceLanguage')
+    languages = spec if 'targetLanguage' in spec or 'targetLanguages' in spec else defaults
+    target_language, target_languages = parse_target_languages(
+        languages.get('targetLanguage'), languages.get('targetLanguages'))
+    if not source_language or not (target_language or target_languages):
+        raise ValueError('Missing required fields')
+    
+    content_type = 'application/pdf' if spec.get('fileType') == 'application/pdf' else 'text/plain'
+    file_content = spec.get('fileContent')
+    file_bytes = None
+    if file_content is not None:
+        if not isinstance(file_content, str) or not file_content:
+            raise ValueError('fileContent must be a non-empty string')
+        if content_type == 'application/pdf':
+            try:
+                file_bytes = base64.b64decode(file_content)
+            except ValueError:
+                raise ValueError('fileContent must be base64 encoded for PDFs')
+        else:
+            file_bytes = file_content.encode('utf-8')
+    else:
+        file_size = spec.get('fileSize')
+        if file_size is not None and (not isinstance(file_size, int) or not 0 < file_size <= MAX_UPLOAD_BYTES):
+            raise ValueError(f"fileSize must be between 1 and {MAX_UPLOAD_BYTES} bytes")
+    
+    job_id = str(uuid.uuid4())
+    input_key = f"input/{user_id}/{job_id}/{file_name}"
+    job = {
+        'id': job_id,
+        'user_id': user_id,
+        'batch_id': batch_id,
+        'file_name': file_name,
+        'source_language': source_language,
+        'status': 'pending',
+        'created_at': now.isoformat(),
+        'updated_at': now.isoformat(),
+        's3_input_key': input_key,
+        'expires_at': int(now.timestamp()) + (30 * 24 * 60 * 60)
+    }
+    if target_languages:
+        job['target_languages'] = target_languages
+        job['results'] = {language: {'status': 'pending'} for language in target_languages}
+    else:
+        job['target_language'] = target_language
+    
+    if file_bytes is not None:
+        job['input_size_bytes'] = len(file_bytes)
+        if target_language:
+            job['content_hash'] = compute_content_hash(file_bytes, source_language, target_language, user_id, file_name)
+        if content_type == 'text/plain' and PREVIEW_LENGTH > 0:
+            job['original_preview'] = file_content[:PREVIEW_LENGTH]
+    
+    return {'job': job, 'file_bytes': file_bytes, 'content_type': content_type}
+
+def stage_batch_file(entry: Dict[str, Any], existing: Dict[str, Any] = None) -> None:
+    """
+    Put a batch file's input in place: reuse a completed translation of the same
+    content, upload the inline bytes, or sign a direct upload.
+    """
+    job = entry['job']
+    if entry['file_bytes'] is None:
+        entry['upload'] = create_presigned_upload(job['s3_input_key'], entry['content_type'])
+        return
+    
+    if existing:
+        try:
+            output_key = job_output_key(job['user_id'], job['id'], job['file_name'])
+            copy_translation_output(existing['s3_output_key'], output_key)
+            job.update({
+                'status': 'completed',
+                's3_input_key': existing.get('s3_input_key', job['s3_input_key']),
+                's3_output_key': output_key,
+                'completed_at': job['created_at'],
+                'deduplicated_from': existing['job_id']
+            })
+            return
+        except Exception as dedup_error:
+            logger.warning(f"Deduplication failed for job {job['id']}, translating normally: {dedup_error}")
+    
+    put_input_object(job['s3_input_key'], entry['file_bytes'], entry['content_type'])
+
+def get_translation_batch(batch_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """Aggregate progress of a batch: job counts per status plus each job's status."""
+    user_id = get_user_id_from_event(event)
+    
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Unauthorized'})
+        }
+    
+    try:
+        table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        query_kwargs = {
+            'IndexName': 'batch-id-index',
+            'KeyConditionExpression': 'batch_id = :batch_id',
+            'ExpressionAttributeValues': {':batch_id': batch_id}
+        }
+        items = []
+        while True:
+            response = table.query(**query_kwargs)
+            items.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        # Ensure user can only access their own batches
+        if not items or any(item.get('user_id') != user_id for item in items):
+            return {
+                'statusCode': 404,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'Batch not found'})
+            }
+        
+        counts = {status: 0 for status in JOB_STATUSES}
+        for item in items:
+            counts[item['status']] = counts.get(item['status'], 0) + 1
+        finished = counts['completed'] + counts['failed']
+        
+        return {
+            'statusCode': 200,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({
+                'batchId': batch_id,
+                'total': len(items),
+                'counts': counts,
+                'done': finished == len(items),
+                'items': [
+                    {'id': item['id'], 'file_name': item.get('file_name'), 'status': item['status']}
+                    for item in items
+                ]
+            }, default=str)
+        }
+    except Exception as e:
+        logger.error(f"Error getting translation batch: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Failed to get translation batch'})
+        }
+
+def create_presigned_upload(input_key: str, file_type: str) -> Dict[str, Any]:
+    """Pre-signed POST form for one input key, as returned to the browser."""
+    # The bucket enforces the size limit, content type and encryption on the upload itself
+    upload = s3_client.generate_presigned_post(
+        Bucket=INPUT_BUCKET,
+        Key=input_key,
+        Fields={
+            'Content-Type': file_type,
+            'x-amz-server-side-encryption': 'AES256'
+        },
+        Conditions=[
+            {'Content-Type': file_type},
+            {'x-amz-server-side-encryption': 'AES256'},
+            ['content-length-range', 1, MAX_UPLOAD_BYTES]
+        ],
+        ExpiresIn=UPLOAD_URL_EXPIRES_IN
+    )
+    return {
+        'url': upload['url'],
+        'fields': upload['fields'],
+        'expires_in': UPLOAD_URL_EXPIRES_IN,
+        'max_bytes': MAX_UPLOAD_BYTES
+    }
+
+def put_input_object(input_key: str, file_bytes: bytes, content_type: str) -> Dict[str, Any]:
+    """Store an inline upload in the input bucket, gzipped when it is text. PDFs are already compressed."""
+    content_encoding = STORAGE_CONTENT_ENCODING if content_type.startswith('text/') else None
+    return s3_client.put_object(
+        Bucket=INPUT_BUCKET,
+        Key=input_key,
+        ContentType=content_type,
+        ServerSideEncryption='AES256',
+        **encoded_object(file_bytes, content_encoding)
+    )
+
+def validate_file_name(file_name: Any) -> str:
+    """
+    Check a request's fileName, which becomes the last segment of the job's S3 keys,
+    so it must not add or climb out of a folder. Raises ValueError on bad input.
+    """
+    if not isinstance(file_name, str) or not file_name or '/' in file_name or file_name in ('.', '..'):
+        raise ValueError('fileName must be a plain file name')
+    return file_name
+
+def parse_target_languages(target_language: Any, target_languages: Any) -> tuple:
+    """
+    Normalise targetLanguage/targetLanguages from a request body into
+    (target_language, target_languages); exactly one is set once validated.
+    A single-element list is treated as a plain targetLanguage. Raises ValueError on bad input.
+    """
+    if target_languages is None:
+        return target_language, None
+    if (not isinstance(target_languages, list) or not target_languages
+            or not all(isinstance(language, str) and language for language in target_languages)):
+        raise ValueError('targetLanguages must be a non-empty list of language codes')
+    target_languages = list(dict.fromkeys(target_languages))
+    if len(target_languages) > MAX_TARGET_LANGUAGES:
+        raise ValueError(f"At most {MAX_TARGET_LANGUAGES} target languages per job")
+    if len(target_languages) == 1:
+        return target_languages[0], None
+    return None, target_languages
+
+def compute_content_hash(file_bytes: bytes, source_language: str, target_language: str,
+                         user_id: str, file_name: str) -> str:
+    """
+    Content address for a translation: sha256 over the owner, language pair, document
+    format and uploaded bytes. The owner is part of the address so a lookup only ever
+    finds the caller's own jobs and keys; the format because an .html file is not
+    translated the way the same bytes in a .txt file are.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{user_id}\x00{source_language}\x00{target_language}\x00"
+                  f"{document_format(file_name) or ''}\x00".encode('utf-8'))
+    digest.update(file_bytes)
+    return digest.hexdigest()
+
+def find_completed_translation(content_hash: str) -> Dict[str, Any]:
+    """Look up a completed translation of the same content with a single key read."""
+    if not CONTENT_INDEX_TABLE:
+        return None
+    try:
+        table = dynamodb.Table(CONTENT_INDEX_TABLE)
+        response = table.get_item(Key={'content_hash': content_hash})
+        return response.get('Item')
+    except Exception as e:
+        logger.error(f"Error reading content index: {str(e)}")
+        return None
+
+def find_completed_translations(content_hashes: list) -> Dict[str, Dict[str, Any]]:
+    """Batch form of find_completed_translation: content_hash -> content index entry."""
+    if not CONTENT_INDEX_TABLE or not content_hashes:
+        return {}
+    try:
+        keys = [{'content_hash': content_hash} for content_hash in dict.fromkeys(content_hashes)]
+        return {item['content_hash']: item for item in batch_get_items(CONTENT_INDEX_TABLE, keys)}
+    except Exception as e:
+        logger.error(f"Error reading content index: {str(e)}")
+        return {}
+
+def batch_get_items(table_name: str, keys: list, **options: Any) -> list:
+    """
+    Read many items by key with BatchGetItem, BATCH_GET_MAX_KEYS at a time, retrying
+    UnprocessedKeys with exponential backoff. options (e.g. ProjectionExpression) apply
+    to every request. Items come back in no particular order.
+    """
+    items = []
+    for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request = {table_name: {'Keys': keys[start:start + BATCH_GET_MAX_KEYS], **options}}
+        attempt = 0
+        while request:
+            response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            request = response.get('UnprocessedKeys') or {}
+            if request:
+                attempt += 1
+                if attempt > BATCH_RETRY_ATTEMPTS:
+                    raise RuntimeError(f"{len(request[table_name]['Keys'])} keys still unprocessed "
+                                       f"after {BATCH_RETRY_ATTEMPTS} retries")
+                time.sleep(min(1.0, 0.05 * 2 ** attempt))
+    return items
+
+def copy_translation_output(source_key: str, destination_key: str) -> None:
+    """Server-side copy of an existing translation output into the new job's prefix."""
+    s3_client.copy_object(
+        Bucket=OUTPUT_BUCKET,
+        Key=destination_key,
+        CopySource={'Bucket': OUTPUT_BUCKET, 'Key': source_key},
+        ServerSideEncryption='AES256'
+    )
+
 def get_translation(translation_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
-    """Get specific translation job with user isolation and pre-signed S3 URL if completed."""
+    """
+    Get specific translation job with user isolation and pre-signed S3 URL if completed.
+    Supports conditional GET: the ETag follows the item's updated_at, so a client
+    revalidating an unchanged job gets a bodiless 304 with no signing or serialisation.
+    """
     user_id = get_user_id_from_event(event)
     
     if not user_id:
@@ -580,22 +1481,32 @@ def get_translation(translation_id: str, event: Dict[str, Any]) -> Dict[str, Any
                 'body': json.dumps({'error': 'Access denied'})
             }
         
+        headers = {
+            **CORS_HEADERS,
+            'ETag': translation_etag(item),
+            'Cache-Control': 'private, no-cache'
+        }
+        if etag_matches(event, headers['ETag']):
+            return not_modified(headers)
        
         if item.get('status') == 'completed' and item.get('s3_output_key'):
             try:
-                presigned_url = s3_client.generate_presigned_url(
-                    'get_object',
-                    Params={'Bucket': OUTPUT_BUCKET, 'Key': item['s3_output_key']},
-                    ExpiresIn=900  # 15 minutes
-                )
-                item['download_url'] = presigned_url
+                item['download_url'] = get_presigned_download_url(item['s3_output_key'])
             except Exception as e:
                 logger.error(f"Error generating pre-signed URL: {str(e)}")
                 item['download_url'] = None
         
+        for language, result in (item.get('results') or {}).items():
+            if result.get('status') == 'completed' and result.get('s3_output_key'):
+                try:
+                    result['download_url'] = get_presigned_download_url(result['s3_output_key'])
+                except Exception as e:
+                    logger.error(f"Error generating pre-signed URL for {language}: {str(e)}")
+                    result['download_url'] = None
+        
         return {
             'statusCode': 200,
-            'headers': CORS_HEADERS,
+            'headers': headers,
             'body': json.dumps(item, default=str)
         }
     except Exception as e:
@@ -606,6 +1517,178 @@ def get_translation(translation_id: str, event: Dict[str, Any]) -> Dict[str, Any
             'body': json.dumps({'error': 'Failed to get translation'})
         }
 
+def get_translation_statuses(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Status of up to MAX_STATUS_IDS jobs in one BatchGetItem, projected to STATUS_FIELDS
+    and without pre-signed URLs. Items come back in request order. Ids that do not
+    exist or belong to another user are both listed under `missing`, so the response
+    does not reveal other users' job ids.
+    """
+    user_id = get_user_id_from_event(event)
+    
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Unauthorized'})
+        }
+    
+    try:
+        try:
+            body = json.loads(event.get('body') or '{}')
+        except json.JSONDecodeError:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'Invalid JSON in request body'})
+            }
+        
+        ids = body.get('ids')
+        if (not isinstance(ids, list) or not ids
+                or not all(isinstance(job_id, str) and job_id for job_id in ids)):
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'ids must be a non-empty list of job ids'})
+            }
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > MAX_STATUS_IDS:
+            return {
+                'statusCode': 400,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': f"At most {MAX_STATUS_IDS} ids per request"})
+            }
+        
+        items = batch_get_items(
+            TRANSLATION_JOBS_TABLE,
+            [{'id': job_id} for job_id in ids],
+            ProjectionExpression=', '.join(f"#{field}" for field in STATUS_FIELDS),
+            ExpressionAttributeNames={f"#{field}": field for field in STATUS_FIELDS}
+        )
+        
+        # Same ownership check as get_translation
+        owned = {item['id']: item for item in items if item.get('user_id') == user_id}
+        for item in owned.values():
+            item.pop('user_id', None)
+        
+        return {
+            'statusCode': 200,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({
+                'items': [owned[job_id] for job_id in ids if job_id in owned],
+                'missing': [job_id for job_id in ids if job_id not in owned]
+            }, default=str)
+        }
+    except Exception as e:
+        logger.error(f"Error getting translation statuses: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Failed to get translation statuses'})
+        }
+
+def translation_etag(item: Dict[str, Any]) -> str:
+    """
+    ETag for GET /translations/{id}. Every job update sets updated_at. Jobs with
+    downloads also roll over each PRESIGNED_URL_MIN_REMAINING window, so a cached
+    body never carries a download_url that is about to expire.
+    """
+    version = item.get('updated_at') or item.get('created_at')
+    has_downloads = (item.get('status') == 'completed' and item.get('s3_output_key')) or any(
+        result.get('status') == 'completed' for result in (item.get('results') or {}).values())
+    window = int(time.time()) // PRESIGNED_URL_MIN_REMAINING if has_downloads else ''
+    return make_etag(item.get('id'), version, window)
+
+def get_download_url(translation_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """Sign a download URL for one completed translation owned by the caller."""
+    user_id = get_user_id_from_event(event)
+    
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Unauthorized'})
+        }
+    
+    try:
+        table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        response = table.get_item(
+            Key={'id': translation_id},
+            ProjectionExpression='user_id, #status, s3_output_key, results',
+            ExpressionAttributeNames={'#status': 'status'}
+        )
+        
+        item = response.get('Item')
+        if not item:
+            return {
+                'statusCode': 404,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'Translation not found'})
+            }
+        
+        if item.get('user_id') != user_id:
+            return {
+                'statusCode': 403,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'Access denied'})
+            }
+        
+        # Multi-target jobs keep one output per language under results
+        language = (event.get('queryStringParameters') or {}).get('language')
+        if item.get('results'):
+            result = item['results'].get(language) if language else None
+            if not result:
+                return {
+                    'statusCode': 400,
+                    'headers': CORS_HEADERS,
+                    'body': json.dumps({'error': f"language must be one of {', '.join(item['results'])}"})
+                }
+            output_key = result.get('s3_output_key') if result.get('status') == 'completed' else None
+        else:
+            output_key = item.get('s3_output_key') if item.get('status') == 'completed' else None
+        
+        if not output_key:
+            return {
+                'statusCode': 409,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': 'Translation is not completed'})
+            }
+        
+        return {
+            'statusCode': 200,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'download_url': get_presigned_download_url(output_key)})
+        }
+    except Exception as e:
+        logger.error(f"Error getting download URL: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'error': 'Failed to get download URL'})
+        }
+
+def get_presigned_download_url(output_key: str) -> str:
+    """Return a pre-signed GET URL for an output object, reusing one signed earlier in this container."""
+    now = time.time()
+    with _presigned_url_lock:
+        cached = _presigned_url_cache.get(output_key)
+        if cached and cached[1] - now > PRESIGNED_URL_MIN_REMAINING:
+            _presigned_url_cache.move_to_end(output_key)
+            return cached[0]
+    
+    url = s3_client.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': OUTPUT_BUCKET, 'Key': output_key},
+        ExpiresIn=PRESIGNED_URL_EXPIRES_IN
+    )
+    
+    with _presigned_url_lock:
+        _presigned_url_cache[output_key] = (url, now + PRESIGNED_URL_EXPIRES_IN)
+        _presigned_url_cache.move_to_end(output_key)
+        while len(_presigned_url_cache) > PRESIGNED_URL_CACHE_SIZE:
+            _presigned_url_cache.popitem(last=False)
+    return url
+
 def get_user_id_from_event(event: Dict[str, Any]) -> str:
     """Extract user ID from Cognito JWT token with proper validation."""
     logger.info("=== EXTRACTING USER ID ===")
@@ -618,7 +1701,6 @@ def get_user_id_from_event(event: Dict[str, Any]) -> str:
         logger.info(f"Request context keys: {list(request_context.keys())}")
         logger.info(f"Authorizer keys: {list(authorizer.keys())}")
         logger.info(f"Claims keys: {list(claims.keys())}")
-        logger.info(f"All claims: {claims}")
         
     
         user_id = claims.get('sub') or claims.get('cognito:username')
@@ -627,7 +1709,7 @@ def get_user_id_from_event(event: Dict[str, Any]) -> str:
         
         if not user_id:
             logger.warning("No user ID found in token claims")
-            logger.warning(f"Available claims: {claims}")
+            logger.warning(f"Available claim keys: {list(claims.keys())}")
             return None
         
         return user_id
@@ -638,4 +1720,26 @@ def get_user_id_from_event(event: Dict[str, Any]) -> str:
         logger.error(f"Error details: {e}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
-        return None
\ No newline at end of file
+        return None
+
+
+# Static responses are serialised once per container
+STATIC_RESPONSES = {
+    '/languages': build_static_response(_languages(), max_age=3600)
+}
+
+# (method, path pattern, handler). Handlers take the event plus the pattern's named
+# groups; the first match wins, so more specific patterns come first.
+ROUTES = [
+    ('GET', re.compile(r'^/languages$'), lambda event: get_languages(event)),
+    ('GET', re.compile(r'^/translations$'), lambda event: get_translations(event)),
+    ('POST', re.compile(r'^/translations$'), lambda event: create_translation(event)),
+    ('POST', re.compile(r'^/translations/upload-url$'), lambda event: create_upload_url(event)),
+    ('GET', re.compile(r'^/translations/changes$'), lambda event: get_translation_changes(event)),
+    ('POST', re.compile(r'^/translations/status$'), lambda event: get_translation_statuses(event)),
+    ('POST', re.compile(r'^/translations/batch$'), lambda event: create_translation_batch(event)),
+    ('GET', re.compile(r'^/translations/batch/(?P<batchId>[^/]+)$'),
+     lambda event, batchId: get_translation_batch(batchId, event)),
+    ('GET', re.compile(r'^/translations/(?P<id>[^/]+)/download$'), lambda event, id: get_download_url(id, event)),
+    ('GET', re.compile(r'^/translations/(?P<id>[^/]+)$'), lambda event, id: get_translation(id, event)),
+]
@@ -0,0 +1,57 @@
+import threading
+from typing import Any, Callable, Dict
+
+# Importing boto3 and building a client cost a few hundred milliseconds of cold start,
+# so handlers declare their clients at module level and only pay for the ones a
+# request actually touches.
+
+
+class LazyClient:
+    """Proxy that builds a boto3 client (or table) on first attribute access and reuses it."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    @property
+    def is_built(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+class LazyResource(LazyClient):
+    """LazyClient for a boto3 resource whose Table() handles are memoised by name."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        super().__init__(factory)
+        self._tables: Dict[str, LazyClient] = {}
+
+    def Table(self, name: str) -> LazyClient:
+        table = self._tables.get(name)
+        if table is None:
+            with self._lock:
+                table = self._tables.setdefault(name, LazyClient(lambda: self.get().Table(name)))
+        return table
+
+
+def _build(kind: str, service: str) -> Any:
+    import boto3
+    return getattr(boto3, kind)(service)
+
+
+def client(service: str) -> LazyClient:
+    return LazyClient(lambda: _build('client', service))
+
+
+def resource(service: str) -> LazyResource:
+    return LazyResource(lambda: _build('resource', service))
@@ -0,0 +1,179 @@
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from s3_streams import iter_body, iter_text
+
+logger = logging.getLogger()
+
+# Translated text is saved as a checkpoint part at most this often (and when a job stops early)
+CHECKPOINT_INTERVAL_SECONDS = float(os.environ.get('CHECKPOINT_INTERVAL_SECONDS', '10'))
+# ...or once this much translated text is buffered, so memory stays flat for fast jobs
+CHECKPOINT_MAX_BUFFER_CHARS = 2 * 1024 * 1024
+# Invocation time held back to drain in-flight chunks, save a checkpoint and hand over
+CHECKPOINT_TIME_RESERVE_SECONDS = float(os.environ.get('CHECKPOINT_TIME_RESERVE_SECONDS', '30'))
+CHECKPOINT_PREFIX = 'checkpoints'
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+
+
+class TranslationSuspended(Exception):
+    """Raised when a translation stops at its deadline after saving a checkpoint."""
+
+
+def checkpoint_deadline(context: Any) -> Optional[float]:
+    """time.monotonic() value at which an invocation should checkpoint and hand over; None without a Lambda context."""
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return None
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000 - CHECKPOINT_TIME_RESERVE_SECONDS
+
+
+class TranslationCheckpoint:
+    """
+    Resumable progress of one job's translation. Translated chunks are buffered and
+    saved to S3 as numbered parts under checkpoints/{job_id}/; after each part the
+    job item's `checkpoint` cursor (chunks translated, source units consumed, parts,
+    output bytes, preview) and progress_percent are updated in one write. The cursor
+    only ever counts parts already in S3, so a retry that resumes from it writes
+    the saved parts to the output and translates from the next chunk.
+
+    Saving is best effort: a failed save is logged and checkpointing stops for the
+    rest of the invocation, leaving the last good cursor in place.
+    """
+
+    def __init__(self, s3_client: Any, table: Any, bucket: str, job_id: str, input_key: str, output_key: str,
+                 state: Optional[Dict[str, Any]] = None, interval: float = CHECKPOINT_INTERVAL_SECONDS,
+                 preview_length: int = 200):
+        state = state or {}
+        self.s3_client = s3_client
+        self.table = table
+        self.bucket = bucket
+        self.job_id = job_id
+        self.input_key = input_key
+        self.output_key = output_key
+        self.interval = interval
+        self.preview_length = preview_length
+        self.total = int(state['total']) if state.get('total') else None
+        self.chunks = int(state.get('chunks', 0))
+        self.done = int(state.get('done', 0))
+        self.parts = int(state.get('parts', 0))
+        self.bytes_written = int(state.get('bytes', 0))
+        self.preview = state.get('preview', '')
+        self.enabled = True
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self._buffered_units = 0
+        self._last_save = time.monotonic()
+
+    @classmethod
+    def for_job(cls, s3_client: Any, table: Any, bucket: str, job: Dict[str, Any], input_key: str,
+                output_key: str, preview_length: int = 200) -> 'TranslationCheckpoint':
+        """The job's saved checkpoint when it is for the same input and output, otherwise a new one."""
+        state = job.get('checkpoint') or {}
+        if state and (state.get('input_key') != input_key or state.get('output_key') != output_key):
+            logger.info(f"Discarding checkpoint of job {job['id']} for a different input or output")
+            state = {}
+        checkpoint = cls(s3_client, table, bucket, job['id'], input_key, output_key, state,
+                         preview_length=preview_length)
+        if checkpoint.chunks:
+            logger.info(f"Resuming job {job['id']} after {checkpoint.chunks} chunks in {checkpoint.parts} parts")
+        return checkpoint
+
+    @property
+    def progress_percent(self) -> Optional[int]:
+        return self._percent(self.done)
+
+    def iter_saved(self) -> Iterator[str]:
+        """The translated text of every saved part, in order."""
+        for part in range(self.parts):
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._part_key(part))
+            yield from iter_text(iter_body(response))
+
+    def add(self, translated: str, units: int = 0) -> None:
+        """Buffer one translated chunk (covering `units` of the source) and save a part when the interval is up."""
+        if not self.enabled:
+            return
+        self._buffer.append(translated)
+        self._buffered_chars += len(translated)
+        self._buffered_units += units
+        if (self._buffered_chars >= CHECKPOINT_MAX_BUFFER_CHARS
+                or time.monotonic() - self._last_save >= self.interval):
+            self.save()
+
+    def save(self) -> bool:
+        """Write buffered chunks as the next part and advance the cursor. Returns False if nothing could be saved."""
+        if not self.enabled or not self._buffer:
+            return self.enabled
+        text = ''.join(self._buffer)
+        body = text.encode('utf-8')
+        preview = self.preview
+        if len(preview) < self.preview_length:
+            preview += text[:self.preview_length - len(preview)]
+        state = {
+            'input_key': self.input_key,
+            'output_key': self.output_key,
+            'chunks': self.chunks + len(self._buffer),
+            'done': self.done + self._buffered_units,
+            'parts': self.parts + 1,
+            'bytes': self.bytes_written + len(body),
+            'preview': preview
+        }
+        if self.total:
+            state['total'] = self.total
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=self._part_key(self.parts),
+                Body=body,
+                ContentType='text/plain; charset=utf-8',
+                ServerSideEncryption='AES256'
+            )
+            update_expression = 'SET #checkpoint = :checkpoint, updated_at = :updated_at'
+            values = {':checkpoint': state, ':updated_at': datetime.utcnow().isoformat()}
+            progress = self._percent(state['done'])
+            if progress is not None:
+                update_expression += ', progress_percent = :progress'
+                values[':progress'] = progress
+            self.table.update_item(
+                Key={'id': self.job_id},
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames={'#checkpoint': 'checkpoint'},
+                ExpressionAttributeValues=values
+            )
+        except Exception as e:
+            logger.error(f"Error saving checkpoint for job {self.job_id}, continuing without: {str(e)}")
+            self.enabled = False
+            self._buffer = []
+            self._buffered_chars = 0
+            return False
+        self.chunks, self.done, self.parts = state['chunks'], state['done'], state['parts']
+        self.bytes_written, self.preview = state['bytes'], preview
+        self._buffer = []
+        self._buffered_chars = 0
+        self._buffered_units = 0
+        self._last_save = time.monotonic()
+        logger.info(f"Checkpointed job {self.job_id}: {self.chunks} chunks, part {self.parts}, "
+                    f"{self.progress_percent}%")
+        return True
+
+    def clear(self) -> None:
+        """Delete the saved parts once the output is complete. The job's completion update drops the cursor."""
+        keys = [{'Key': self._part_key(part)} for part in range(self.parts)]
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            try:
+                self.s3_client.delete_objects(Bucket=self.bucket,
+                                              Delete={'Objects': keys[start:start + DELETE_BATCH_SIZE]})
+            except Exception as e:
+                # The bucket's lifecycle rule expires leftover checkpoints
+                logger.error(f"Error deleting checkpoint parts of job {self.job_id}: {str(e)}")
+
+    def _percent(self, done: int) -> Optional[int]:
+        """Share of the source translated and saved; 100 is left for the completed job."""
+        if not self.total:
+            return None
+        return min(99, int(done * 100 / self.total))
+
+    def _part_key(self, part: int) -> str:
+        return f"{CHECKPOINT_PREFIX}/{self.job_id}/{part:05d}"
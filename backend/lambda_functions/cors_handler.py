@@ -17,7 +17,8 @@ def lambda_handler(event, context):
  
     cors_headers = {
         'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Amz-User-Agent',
+        'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Amz-User-Agent,If-None-Match',
+        'Access-Control-Expose-Headers': 'ETag',
         'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS,PATCH',
         'Access-Control-Max-Age': '86400',
         'Access-Control-Allow-Credentials': 'true'
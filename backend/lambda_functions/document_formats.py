@@ -0,0 +1,346 @@
+import html
+import json
+import logging
+import os
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from segmenter import DEFAULT_MAX_CHUNK_BYTES, byte_length
+
+logger = logging.getLogger()
+
+# Packed nodes are joined by a line Translate passes through untouched; a reply that
+# does not split back into the same number of nodes is retranslated in halves
+NODE_DELIMITER = '\n###\n'
+BYTE_ORDER_MARK = '\ufeff'
+_DELIMITER_PATTERN = re.compile(r'\s*#\s*#\s*#\s*')
+TRANSLATE_MAX_NODES_PER_PACK = int(os.environ.get('TRANSLATE_MAX_NODES_PER_PACK', '200'))
+
+# HTML elements whose content is code or data rather than prose
+_HTML_TOKEN = re.compile(
+    r'<!--.*?-->|<!\[CDATA\[.*?\]\]>|<![^>]*>|<\?.*?\?>'
+    r'|<(script|style|code|pre|textarea)\b[^>]*>.*?</\1\s*>|<[^>]+>',
+    re.S | re.I
+)
+# Inline Markdown kept out of Translate: code spans, HTML tags and autolinks, link brackets and destinations
+_MARKDOWN_INLINE_TOKEN = re.compile(
+    r'`+[^`]*`+|<[^>\n]+>|!?\[|\]\([^)\s]*(?:\s+"[^"]*")?\)|\]\[[^\]]*\]|\]'
+)
+_MARKDOWN_BLOCK_PREFIX = re.compile(r'[ \t]*(?:(?:#{1,6}|>|[-*+]|\d{1,9}[.)])[ \t]+(?:\[[ xX]\][ \t]+)?)*')
+_MARKDOWN_FENCE = re.compile(r'[ \t]{0,3}(`{3,}|~{3,})')
+_JSON_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_JSON_KEY_END = re.compile(r'\s*:')
+_SRT_TIMING = re.compile(r'\d+:\d{2}:\d{2}[,.]\d{3}\s*-->\s*\d+:\d{2}:\d{2}[,.]\d{3}')
+# JSON string values that are addresses rather than text
+_JSON_SKIP_VALUE = re.compile(r'^(?:[a-z][a-z0-9+.-]*://|mailto:|#|/)\S*$|^\S+@\S+\.\S+$', re.I)
+
+
+class NodePack(NamedTuple):
+    """The pieces [start, end) of a document, with the translatable ones among them sent in one request."""
+    start: int
+    end: int
+    nodes: List[int]
+
+
+class ParsedDocument:
+    """
+    A document as an ordered list of pieces: markup kept as written, and translatable
+    text nodes held as plain text. Rendering writes each node's translation back in
+    place through its formatter (escaping for the format), so everything outside the
+    nodes is reproduced byte for byte.
+    """
+
+    def __init__(self):
+        self.pieces: List[str] = []
+        self.nodes: List[int] = []
+        self._formatters: Dict[int, Callable[[str], str]] = {}
+
+    def add(self, source: str) -> None:
+        """Append markup or other text that is not translated."""
+        if source:
+            self.pieces.append(source)
+
+    def add_text(self, source: str, decode: Callable[[str], str] = None,
+                 formatter: Callable[[str], str] = None) -> None:
+        """
+        Append a run of source text. Surrounding whitespace stays in the markup and
+        the rest becomes a node when it contains any letters; decode turns the
+        source into plain text and formatter turns a translation back into source.
+        """
+        core = source.strip()
+        leading = source[:len(source) - len(source.lstrip())]
+        trailing = source[len(source.rstrip()):] if core else ''
+        text = decode(core) if decode and core else core
+        if not any(char.isalpha() for char in text):
+            self.add(source)
+            return
+        self.add(leading)
+        self.nodes.append(len(self.pieces))
+        self.pieces.append(text)
+        if formatter is not None:
+            self._formatters[len(self.pieces) - 1] = formatter
+        self.add(trailing)
+
+    def prepend(self, source: str) -> None:
+        """Insert markup before everything parsed so far."""
+        self.pieces.insert(0, source)
+        self.nodes = [index + 1 for index in self.nodes]
+        self._formatters = {index + 1: formatter for index, formatter in self._formatters.items()}
+
+    def texts(self, pack: NodePack) -> List[str]:
+        return [self.pieces[index] for index in pack.nodes]
+
+    def render(self, pack: NodePack, translations: List[str]) -> str:
+        """The pack's pieces with its nodes replaced by their translations."""
+        replaced = dict(zip(pack.nodes, translations))
+        parts = []
+        for index in range(pack.start, pack.end):
+            if index in replaced:
+                formatter = self._formatters.get(index)
+                parts.append(formatter(replaced[index]) if formatter else replaced[index])
+            else:
+                parts.append(self.pieces[index])
+        return ''.join(parts)
+
+    def packs(self, max_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+              max_nodes: int = TRANSLATE_MAX_NODES_PER_PACK) -> List[NodePack]:
+        """
+        Group consecutive nodes into packs whose joined text fits one Translate request.
+        Every piece belongs to exactly one pack, so rendering all packs in order
+        reproduces the document. A node larger than max_bytes gets a pack to itself.
+        """
+        packs = []
+        start = 0
+        current: List[int] = []
+        size = 0
+        keep_alone = False
+        for index in self.nodes:
+            node_bytes = byte_length(self.pieces[index])
+            # A node containing the delimiter could not be told apart from two nodes
+            alone = _DELIMITER_PATTERN.search(self.pieces[index]) is not None
+            if current and (alone or keep_alone or len(current) >= max_nodes
+                            or size + len(NODE_DELIMITER) + node_bytes > max_bytes):
+                packs.append(NodePack(start, index, current))
+                start, current, size = index, [], 0
+            size = size + len(NODE_DELIMITER) + node_bytes if current else node_bytes
+            current.append(index)
+            keep_alone = alone
+        packs.append(NodePack(start, len(self.pieces), current))
+        return packs
+
+
+def pack_texts(texts: List[str]) -> str:
+    return NODE_DELIMITER.join(texts)
+
+
+def unpack_texts(translated: str, count: int) -> Optional[List[str]]:
+    """Split a packed translation back into its nodes; None if the delimiters did not survive intact."""
+    parts = _DELIMITER_PATTERN.split(translated.strip())
+    if len(parts) != count:
+        return None
+    return [part.strip() for part in parts]
+
+
+def parse_html(text: str) -> ParsedDocument:
+    """Text between tags, outside script, style and code blocks; entities decoded and re-escaped."""
+    document = ParsedDocument()
+    position = 0
+    for match in _HTML_TOKEN.finditer(text):
+        document.add_text(text[position:match.start()], html.unescape, _escape_html)
+        document.add(match.group(0))
+        position = match.end()
+    document.add_text(text[position:], html.unescape, _escape_html)
+    return document
+
+
+def parse_markdown(text: str) -> ParsedDocument:
+    """
+    Block text and table cells, with block prefixes (headings, quotes, list markers),
+    fenced and indented code, link destinations and code spans kept as written.
+    Consecutive lines of a paragraph form one node so sentences are translated whole.
+    """
+    document = ParsedDocument()
+    lines = text.splitlines(keepends=True)
+    paragraph: List[str] = []
+    fence = None
+    previous_blank = True
+
+    def flush() -> None:
+        if paragraph:
+            _add_markdown_inline(document, ''.join(paragraph))
+            paragraph.clear()
+
+    for line in lines:
+        body = line.rstrip('\r\n')
+        if fence is not None:
+            document.add(line)
+            if body.strip().startswith(fence):
+                fence = None
+            continue
+        opening = _MARKDOWN_FENCE.match(body)
+        if opening:
+            flush()
+            fence = opening.group(1)[0] * 3
+            document.add(line)
+            previous_blank = False
+            continue
+        if not body.strip():
+            flush()
+            document.add(line)
+            previous_blank = True
+            continue
+        if previous_blank and (body.startswith('    ') or body.startswith('\t')) and not paragraph:
+            # Indented code block
+            document.add(line)
+            continue
+        prefix = _MARKDOWN_BLOCK_PREFIX.match(body).group(0)
+        is_table_row = body.lstrip().startswith('|')
+        if prefix.strip() or is_table_row:
+            flush()
+            document.add(prefix)
+            rest = line[len(prefix):]
+            if is_table_row:
+                for index, cell in enumerate(rest.split('|')):
+                    if index:
+                        document.add('|')
+                    _add_markdown_inline(document, cell)
+            else:
+                _add_markdown_inline(document, rest)
+        else:
+            paragraph.append(line)
+        previous_blank = False
+    flush()
+    return document
+
+
+def _add_markdown_inline(document: ParsedDocument, source: str) -> None:
+    position = 0
+    for match in _MARKDOWN_INLINE_TOKEN.finditer(source):
+        document.add_text(source[position:match.start()], _unwrap_lines)
+        document.add(match.group(0))
+        position = match.end()
+    document.add_text(source[position:], _unwrap_lines)
+
+
+def parse_json(text: str) -> ParsedDocument:
+    """
+    String values, not keys; numbers, literals, URLs and the document's own
+    formatting are kept as written. Raises ValueError for a document that is not JSON.
+    """
+    json.loads(text)
+    document = ParsedDocument()
+    position = 0
+    for match in _JSON_STRING.finditer(text):
+        document.add(text[position:match.start()])
+        token = match.group(0)
+        position = match.end()
+        value = json.loads(token)
+        if _JSON_KEY_END.match(text, position) or _JSON_SKIP_VALUE.match(value.strip()):
+            document.add(token)
+            continue
+        # Whitespace inside the quotes is part of the value, so it is kept around the translation
+        leading = value[:len(value) - len(value.lstrip())]
+        trailing = value[len(value.rstrip()):] if value.strip() else ''
+        document.add_text(token, lambda source: json.loads(source).strip(),
+                          lambda translated, leading=leading, trailing=trailing:
+                          _encode_json_string(leading + translated + trailing))
+    document.add(text[position:])
+    return document
+
+
+def parse_srt(text: str) -> ParsedDocument:
+    """Cue text; sequence numbers and timings are kept, and a translation is rewrapped to the cue's line count."""
+    document = ParsedDocument()
+    lines = text.splitlines(keepends=True)
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        if not _SRT_TIMING.search(line):
+            document.add(line)
+            index += 1
+            continue
+        document.add(line)
+        index += 1
+        cue = []
+        while index < len(lines) and lines[index].strip():
+            cue.append(lines[index])
+            index += 1
+        if not cue:
+            continue
+        newline = cue[0][len(cue[0].rstrip('\r\n')):] or '\n'
+        source = ''.join(cue)
+        text = source.rstrip('\r\n')
+        document.add_text(text, _unwrap_lines, _wrap_lines(len(cue), newline))
+        document.add(source[len(text):])
+    return document
+
+
+FORMAT_PARSERS: Dict[str, Callable[[str], ParsedDocument]] = {
+    '.html': parse_html,
+    '.htm': parse_html,
+    '.md': parse_markdown,
+    '.markdown': parse_markdown,
+    '.json': parse_json,
+    '.srt': parse_srt,
+}
+
+
+def document_format(file_name: str) -> Optional[str]:
+    """The file's extension when it has a format-aware parser, otherwise None (translated as flat text)."""
+    extension = os.path.splitext(file_name.lower())[1]
+    return extension if extension in FORMAT_PARSERS else None
+
+
+def job_output_key(user_id: str, job_id: str, file_name: str, language: str = None) -> str:
+    """
+    Output bucket key for a job's translation, under a per-language folder for
+    multi-target jobs. PDFs are delivered as their extracted text, so the key gets .txt.
+    """
+    folder = f"output/{user_id}/{job_id}/{language}" if language else f"output/{user_id}/{job_id}"
+    key = f"{folder}/{file_name}"
+    return f"{key}.txt" if file_name.lower().endswith('.pdf') else key
+
+
+def parse_document(file_name: str, text: str) -> ParsedDocument:
+    """
+    Parse text with the parser for the file's format. A leading byte order mark is
+    kept as markup, so the output starts with one when the input did. Raises
+    ValueError when the text is not valid for the format.
+    """
+    has_bom = text.startswith(BYTE_ORDER_MARK)
+    document = FORMAT_PARSERS[document_format(file_name)](text[len(BYTE_ORDER_MARK):] if has_bom else text)
+    if has_bom:
+        document.prepend(BYTE_ORDER_MARK)
+    logger.info(f"Parsed {file_name}: {len(document.nodes)} text nodes in {len(document.pieces)} pieces")
+    return document
+
+
+def _escape_html(text: str) -> str:
+    return html.escape(text, quote=False)
+
+
+def _encode_json_string(text: str) -> str:
+    return json.dumps(text, ensure_ascii=False)
+
+
+def _unwrap_lines(text: str) -> str:
+    """Join hard-wrapped lines so Translate sees whole sentences."""
+    return re.sub(r'[ \t]*\r?\n[ \t]*', ' ', text)
+
+
+def _wrap_lines(count: int, newline: str) -> Callable[[str], str]:
+    """Formatter splitting a translation into `count` lines of similar length at spaces."""
+    def wrap(text: str) -> str:
+        lines = []
+        remaining = text
+        for left in range(count, 1, -1):
+            target = len(remaining) // left
+            spaces = [i for i, char in enumerate(remaining) if char == ' ']
+            if not spaces:
+                break
+            split = min(spaces, key=lambda i: abs(i - target))
+            lines.append(remaining[:split])
+            remaining = remaining[split + 1:]
+        lines.append(remaining)
+        return newline.join(lines)
+    return wrap
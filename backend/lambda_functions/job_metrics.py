@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'DocumentTranslation')
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+
+# CloudWatch units for counters; stage durations are always milliseconds
+COUNTER_UNITS = {
+    'translate_calls': 'Count',
+    'translate_characters': 'Count',
+    'translate_retries': 'Count',
+    'translate_api_ms': 'Milliseconds',
+    'rate_limit_wait_ms': 'Milliseconds',
+    'memory_hits': 'Count',
+    'chunks': 'Count',
+    'text_nodes': 'Count',
+    'pack_splits': 'Count',
+    'bytes_read': 'Bytes',
+    'bytes_written': 'Bytes',
+    'bytes_stored': 'Bytes',
+}
+
+
+class JobMetrics:
+    """
+    Per-job stage timings and counters. Safe to update from the translate thread pool.
+    Stage times accumulate, so a stage entered once per chunk or per language reports
+    its total; translate_api_ms sums Translate latency across threads.
+    """
+
+    def __init__(self, job_id: str = None, **properties: Any):
+        self.job_id = job_id
+        self.properties = properties
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, (time.perf_counter() - started) * 1000)
+
+    def add_time(self, name: str, milliseconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0) + milliseconds
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, int]:
+        """Flat integer summary, suitable for storing on the job item (DynamoDB rejects floats)."""
+        with self._lock:
+            summary = {'total_ms': int(round((time.perf_counter() - self._started) * 1000))}
+            summary.update({f"{name}_ms": int(round(value)) for name, value in self.stages.items()})
+            summary.update({name: int(round(value)) for name, value in self.counters.items()})
+        return summary
+
+    def emit(self, status: str) -> Dict[str, Any]:
+        """
+        Print one CloudWatch Embedded Metric Format line. Lambda ships stdout to
+        CloudWatch Logs, which extracts the metrics without any PutMetricData calls.
+        Job-level details are properties rather than dimensions to keep cardinality low.
+        """
+        summary = self.summary()
+        metrics = [
+            {'Name': name, 'Unit': COUNTER_UNITS.get(name, 'Milliseconds' if name.endswith('_ms') else 'Count')}
+            for name in summary
+        ]
+        record = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': METRICS_NAMESPACE,
+                    'Dimensions': [['Status']],
+                    'Metrics': metrics
+                }]
+            },
+            'Status': status,
+            'job_id': self.job_id,
+            **self.properties,
+            **summary
+        }
+        if METRICS_ENABLED:
+            print(json.dumps(record, default=str), flush=True)
+        return record
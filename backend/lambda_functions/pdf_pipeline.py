@@ -0,0 +1,46 @@
+import io
+import logging
+from typing import Any, Iterator
+
+from segmenter import DEFAULT_MAX_CHUNK_BYTES, segment_text
+
+logger = logging.getLogger()
+
+# Whitespace-only, so translate_chunk passes it through without a Translate call
+PAGE_SEPARATOR = '\n\f\n'
+
+
+class PdfSupportUnavailable(RuntimeError):
+    """Raised when the pypdf dependency is not installed in the worker."""
+
+
+def _reader(pdf_bytes: bytes) -> Any:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise PdfSupportUnavailable("PDF translation requires the pypdf package in the worker layer")
+    return PdfReader(io.BytesIO(pdf_bytes))
+
+
+def pdf_page_count(pdf_bytes: bytes) -> int:
+    """Number of pages, read from the page tree without extracting any text."""
+    return len(_reader(pdf_bytes).pages)
+
+
+def iter_pdf_pages(pdf_bytes: bytes) -> Iterator[str]:
+    """Yield the extracted text of each page in order, extracting one page at a time."""
+    reader = _reader(pdf_bytes)
+    logger.info(f"PDF has {len(reader.pages)} pages")
+    for page in reader.pages:
+        yield page.extract_text() or ''
+
+
+def iter_pdf_chunks(pdf_bytes: bytes, max_bytes: int = DEFAULT_MAX_CHUNK_BYTES) -> Iterator[str]:
+    """
+    Segment every page into Translate-sized chunks, separating pages with PAGE_SEPARATOR.
+    Chunks never span pages, so results can be reassembled page by page in order.
+    """
+    for page_number, page_text in enumerate(iter_pdf_pages(pdf_bytes)):
+        if page_number:
+            yield PAGE_SEPARATOR
+        yield from segment_text(page_text, max_bytes)
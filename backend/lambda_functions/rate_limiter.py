@@ -0,0 +1,236 @@
+import logging
+import os
+import random
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger()
+
+TRANSLATE_RATE_LIMIT_TABLE = os.environ.get('TRANSLATE_RATE_LIMIT_TABLE')
+# Characters per second shared by every worker container; 0 disables the limiter
+TRANSLATE_CHARS_PER_SECOND = float(os.environ.get('TRANSLATE_CHARS_PER_SECOND', '0'))
+# Bucket capacity in seconds of budget, i.e. how large a burst an idle bucket allows
+TRANSLATE_BURST_SECONDS = float(os.environ.get('TRANSLATE_BURST_SECONDS', '1'))
+RATE_LIMIT_BUCKET = 'translate'
+# Conditional writes lost to other containers before a take() backs off
+RATE_LIMIT_CONFLICT_RETRIES = 5
+RATE_LIMIT_CONTENTION_BACKOFF = 0.05
+
+
+def refill(tokens: float, updated_at: float, rate: float, capacity: float, now: float) -> float:
+    """Bucket level at `now` given the level stored at `updated_at`."""
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+def reserve(level: float, tokens: float, rate: float, capacity: float, max_wait: float = None) -> tuple:
+    """
+    (new_level, wait): take tokens from a bucket at `level`. Short of tokens, the bucket
+    goes into debt and the caller waits until the refill has paid for its share, so every
+    take succeeds in one write and concurrent callers queue up at distinct times instead
+    of retrying together.
+
+    Debt is capped at one capacity, so no caller is queued more than a burst behind the
+    others (a bucket that is not in debt still admits a take larger than its capacity).
+    A take that would go past the cap, or wait longer than max_wait, is refused: new_level
+    is None and wait is how long until the bucket would admit it.
+    """
+    new_level = level - tokens
+    if level < 0 and new_level < -capacity:
+        return None, (min(0.0, tokens - capacity) - level) / rate
+    wait = max(0.0, -new_level / rate)
+    if max_wait is not None and wait > max_wait:
+        return None, wait
+    return new_level, wait
+
+
+class LocalBucketStore:
+    """Bucket state for a single container, for local runs, tests and when no table is configured."""
+
+    def __init__(self):
+        self.tokens: Optional[float] = None
+        self.updated_at = 0.0
+        self._lock = threading.Lock()
+
+    def take(self, tokens: float, rate: float, capacity: float, now: float,
+             max_wait: float = None) -> Optional[Tuple[bool, float]]:
+        """(reserved, wait) as DynamoDBBucketStore.take; never None, as there are no other writers."""
+        with self._lock:
+            level = capacity if self.tokens is None else refill(self.tokens, self.updated_at, rate, capacity, now)
+            new_level, wait = reserve(level, tokens, rate, capacity, max_wait)
+            if new_level is None:
+                return False, wait
+            self.tokens, self.updated_at = new_level, now
+            return True, wait
+
+
+class DynamoDBBucketStore:
+    """
+    Bucket state shared across containers in one DynamoDB item, updated with a
+    version-conditioned put (optimistic concurrency). The last state this container
+    wrote is remembered, so an uncontended take() is a single write; a lost race
+    costs one consistent read before retrying. The lock only guards that remembered
+    state, never a DynamoDB call, so one thread's round trip does not hold up the others.
+    """
+
+    def __init__(self, table: Any, bucket_id: str = RATE_LIMIT_BUCKET):
+        self.table = table
+        self.bucket_id = bucket_id
+        self._state: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def take(self, tokens: float, rate: float, capacity: float, now: float,
+             max_wait: float = None) -> Optional[Tuple[bool, float]]:
+        """
+        (True, seconds to wait for the reserved tokens), (False, seconds until a refused
+        take would be admitted; see reserve), or None if other writers kept winning the write.
+        """
+        for _ in range(RATE_LIMIT_CONFLICT_RETRIES):
+            with self._lock:
+                state = self._state
+            if state is None:
+                state = self._read()
+            if state is None:
+                level = capacity
+            else:
+                level = refill(state['tokens'], state['updated_at'], rate, capacity, now)
+            level, wait = reserve(level, tokens, rate, capacity, max_wait)
+            if level is None:
+                return False, wait
+            if self._write(state, level, now):
+                return True, wait
+        return None
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        item = self.table.get_item(Key={'bucket_id': self.bucket_id}, ConsistentRead=True).get('Item')
+        if not item:
+            return None
+        state = {
+            'tokens': float(item['tokens']),
+            'updated_at': float(item['updated_at']),
+            'version': int(item['version'])
+        }
+        self._remember(state)
+        return state
+
+    def _write(self, state: Optional[Dict[str, Any]], level: float, now: float) -> bool:
+        version = state['version'] + 1 if state else 1
+        condition = {'ConditionExpression': 'attribute_not_exists(bucket_id)'}
+        if state:
+            condition = {
+                'ConditionExpression': '#version = :version',
+                'ExpressionAttributeNames': {'#version': 'version'},
+                'ExpressionAttributeValues': {':version': state['version']}
+            }
+        try:
+            self.table.put_item(
+                Item={
+                    'bucket_id': self.bucket_id,
+                    'tokens': Decimal(str(round(level, 3))),
+                    'updated_at': Decimal(str(round(now, 3))),
+                    'version': version
+                },
+                **condition
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                with self._lock:
+                    # Forget the stale state unless another thread already replaced it
+                    if self._state is state:
+                        self._state = None
+                return False
+            raise
+        self._remember({'tokens': level, 'updated_at': round(now, 3), 'version': version})
+        return True
+
+    def _remember(self, state: Dict[str, Any]) -> None:
+        """Keep the newest state seen; threads finish their round trips in any order."""
+        with self._lock:
+            if self._state is None or self._state['version'] < state['version']:
+                self._state = state
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a caller's budget would not be available before its deadline."""
+
+
+class TokenBucket:
+    """
+    Characters-per-second budget for Amazon Translate. Workers acquire a chunk's
+    characters before each call, so together they stay just under the account quota
+    instead of bursting into throttling and backing off in lockstep. Store failures
+    are logged and the call proceeds unthrottled; translate_chunk's jittered retry
+    handles any throttling that results.
+    """
+
+    def __init__(self, rate: float = TRANSLATE_CHARS_PER_SECOND, burst_seconds: float = TRANSLATE_BURST_SECONDS,
+                 store: Any = None):
+        self.rate = rate
+        self.capacity = max(1.0, rate * burst_seconds)
+        self.store = store if store is not None else LocalBucketStore()
+        self._lock = threading.Lock()
+        self.counters = {'acquired': 0, 'waits': 0, 'deferred': 0, 'contention': 0, 'timeouts': 0,
+                         'store_errors': 0}
+
+    @classmethod
+    def from_environment(cls, dynamodb: Any = None) -> 'TokenBucket':
+        store = None
+        if TRANSLATE_RATE_LIMIT_TABLE and dynamodb is not None:
+            store = DynamoDBBucketStore(dynamodb.Table(TRANSLATE_RATE_LIMIT_TABLE))
+        return cls(store=store)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, tokens: float, deadline: float = None) -> float:
+        """
+        Block until `tokens` characters of budget are available. Returns the seconds waited.
+        With a deadline (a time.monotonic() value), raises RateLimitTimeout instead of
+        waiting past it; no budget is reserved in that case.
+        """
+        if not self.enabled or tokens <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            max_wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                result = self.store.take(tokens, self.rate, self.capacity, time.time(), max_wait)
+            except Exception as e:
+                logger.warning(f"Rate limiter store failed, proceeding without it: {str(e)}")
+                self._count('store_errors')
+                return waited
+            if result is None:
+                # Lost the conditional write repeatedly; jitter so the contenders spread out
+                self._count('contention')
+                delay = random.uniform(0, RATE_LIMIT_CONTENTION_BACKOFF)
+            else:
+                reserved, wait = result
+                if reserved:
+                    break
+                # Refused at the debt cap (or past the deadline): come back once it would be admitted
+                self._count('deferred')
+                delay = wait
+            if deadline is not None and time.monotonic() + delay > deadline:
+                self._count('timeouts')
+                raise RateLimitTimeout(f"{tokens:.0f} characters of Translate budget not available "
+                                       f"before the deadline ({delay:.1f}s away)")
+            time.sleep(delay)
+            waited += delay
+        self._count('acquired')
+        if wait > 0:
+            self._count('waits')
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
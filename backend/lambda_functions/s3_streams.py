@@ -0,0 +1,195 @@
+import codecs
+import gzip
+import logging
+import os
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger()
+
+READ_CHUNK_SIZE = 1024 * 1024
+# S3 requires every part except the last to be at least 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+GZIP = 'gzip'
+# Content-Encoding of objects this service writes; set to an empty string to store them uncompressed
+STORAGE_CONTENT_ENCODING = os.environ.get('STORAGE_CONTENT_ENCODING', GZIP)
+# zlib's fastest level: most of level 6's saving at well under its CPU cost on large outputs
+COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', '1'))
+# Below this size the gzip header and trailer eat most of the saving
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+# User metadata recording the decoded size, since ContentLength of a gzipped object is the stored size
+UNCOMPRESSED_LENGTH_METADATA = 'uncompressed-length'
+# zlib window bits selecting the gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def is_gzip(response: Dict[str, Any]) -> bool:
+    return (response.get('ContentEncoding') or '').lower() == GZIP
+
+
+def encoded_object(data: bytes, content_encoding: Optional[str] = STORAGE_CONTENT_ENCODING) -> Dict[str, Any]:
+    """
+    put_object arguments storing data with the given Content-Encoding: Body,
+    ContentEncoding and the uncompressed length as metadata. Small bodies are
+    stored as they are.
+    """
+    if content_encoding != GZIP or len(data) < COMPRESSION_MIN_BYTES:
+        return {'Body': data}
+    return {
+        'Body': gzip.compress(data, compresslevel=COMPRESSION_LEVEL, mtime=0),
+        'ContentEncoding': GZIP,
+        'Metadata': {UNCOMPRESSED_LENGTH_METADATA: str(len(data))}
+    }
+
+
+def decoded_length(response: Dict[str, Any]) -> Optional[int]:
+    """Size of a get_object response's body once decoded; None for a gzipped object written without the metadata."""
+    if not is_gzip(response):
+        return response.get('ContentLength')
+    length = (response.get('Metadata') or {}).get(UNCOMPRESSED_LENGTH_METADATA)
+    return int(length) if length else None
+
+
+def iter_body(response: Dict[str, Any], chunk_size: int = READ_CHUNK_SIZE, skip: int = 0) -> Iterator[bytes]:
+    """
+    Stream a get_object response's body in chunks, gunzipping objects stored with
+    Content-Encoding gzip. The first `skip` decoded bytes are dropped, for resuming
+    partway through an object that cannot be fetched with a byte range.
+    """
+    decompressor = zlib.decompressobj(GZIP_WBITS) if is_gzip(response) else None
+    for chunk in response['Body'].iter_chunks(chunk_size=chunk_size):
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        if skip:
+            dropped = min(skip, len(chunk))
+            chunk, skip = chunk[dropped:], skip - dropped
+        if chunk:
+            yield chunk
+    if decompressor is not None:
+        tail = decompressor.flush()[skip:]
+        if tail:
+            yield tail
+
+
+def read_body(response: Dict[str, Any]) -> bytes:
+    """The whole decoded body of a get_object response."""
+    return b''.join(iter_body(response))
+
+
+def iter_text(chunks: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[str]:
+    """Decode streamed bytes incrementally, never splitting a multi-byte character."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+class MultipartUploadWriter:
+    """
+    Buffered writer that uploads text to S3 in parts, so only one part is held in
+    memory at a time. Outputs smaller than one part are written with a single
+    put_object. With content_encoding='gzip' the text is compressed as it is
+    written into one gzip stream spanning the parts. bytes_written counts the
+    text's bytes and bytes_stored the bytes uploaded. Use as a context manager:
+    the upload is completed on success and aborted if the block raises.
+    """
+
+    def __init__(self, s3_client: Any, bucket: str, key: str, part_size: int = DEFAULT_PART_SIZE,
+                 content_type: str = 'text/plain; charset=utf-8', content_encoding: Optional[str] = None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.content_type = content_type
+        self.content_encoding = content_encoding if content_encoding == GZIP else None
+        self.bytes_written = 0
+        self.bytes_stored = 0
+        self._compressor = (zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+                            if self.content_encoding else None)
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+
+    def __enter__(self) -> 'MultipartUploadWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, text: str) -> None:
+        data = text.encode('utf-8')
+        self.bytes_written += len(data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._buffer.extend(data)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            self._upload_part(part)
+
+    def close(self) -> None:
+        if self._compressor is not None:
+            self._buffer.extend(self._compressor.flush())
+            self._compressor = None
+        if self._upload_id is None:
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=bytes(self._buffer),
+                ContentType=self.content_type,
+                ServerSideEncryption='AES256',
+                **self._encoding_args()
+            )
+            self.bytes_stored += len(self._buffer)
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts}
+            )
+            logger.info(f"Completed multipart upload of {self.key} in {len(self._parts)} parts")
+        self._buffer = bytearray()
+
+    def abort(self) -> None:
+        if self._upload_id is None:
+            return
+        try:
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+        except Exception as e:
+            logger.error(f"Error aborting multipart upload for {self.key}: {str(e)}")
+
+    def _upload_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            response = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType=self.content_type,
+                ServerSideEncryption='AES256',
+                **self._encoding_args()
+            )
+            self._upload_id = response['UploadId']
+        part_number = len(self._parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+        self.bytes_stored += len(data)
+
+    def _encoding_args(self) -> Dict[str, Any]:
+        return {'ContentEncoding': self.content_encoding} if self.content_encoding else {}
@@ -0,0 +1,337 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger()
+
+SCHEDULER_TABLE = os.environ.get('SCHEDULER_TABLE')
+TRANSLATION_JOBS_TABLE = os.environ.get('TRANSLATION_JOBS_TABLE')
+# Jobs one user may have out at once (sent to the worker and not yet finished). A
+# max_in_flight attribute on the user's scheduler item overrides it, to weight users.
+USER_MAX_IN_FLIGHT = int(os.environ.get('USER_MAX_IN_FLIGHT', '4'))
+# A slot whose job never reports back (e.g. the worker timed out) is reclaimed after this long
+SLOT_LEASE_SECONDS = int(os.environ.get('SLOT_LEASE_SECONDS', '900'))
+QUEUED_INDEX = 'user-id-queued-at-index'
+# Queued jobs read per scheduling pass for one user
+SCHEDULE_BATCH_SIZE = 10
+SCHEDULER_CONFLICT_RETRIES = 5
+
+
+def job_reference(job: Dict[str, Any], queued_at: str) -> Dict[str, Any]:
+    """The part of a job the scheduler keeps: enough to claim and dispatch it."""
+    return {'id': job['id'], 'user_id': job['user_id'], 's3_input_key': job['s3_input_key'], 'queued_at': queued_at}
+
+
+class LocalSchedulerStore:
+    """Scheduler state in process memory, for local runs, tests and benchmarks."""
+
+    def __init__(self):
+        self.queues: Dict[str, List[Dict[str, Any]]] = {}
+        self.slots: Dict[str, Dict[str, float]] = {}
+        self.limits: Dict[str, int] = {}
+        self._submitted = set()
+        self._lock = threading.Lock()
+
+    def enqueue(self, job: Dict[str, Any], queued_at: str) -> bool:
+        with self._lock:
+            if job['id'] in self._submitted:
+                return False
+            self._submitted.add(job['id'])
+            self.queues.setdefault(job['user_id'], []).append(job_reference(job, queued_at))
+            return True
+
+    def queued_jobs(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.queues.get(user_id, [])[:limit])
+
+    def claim(self, job: Dict[str, Any]) -> bool:
+        with self._lock:
+            queue = self.queues.get(job['user_id'], [])
+            for position, queued in enumerate(queue):
+                if queued['id'] == job['id']:
+                    del queue[position]
+                    return True
+            return False
+
+    def requeue(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            queue = self.queues.setdefault(job['user_id'], [])
+            queue.append(job)
+            queue.sort(key=lambda queued: queued['queued_at'])
+
+    def acquire_slot(self, user_id: str, job_id: str, default_limit: int, lease_seconds: int, now: float) -> bool:
+        with self._lock:
+            slots = {held: expiry for held, expiry in self.slots.get(user_id, {}).items() if expiry > now}
+            if len(slots) >= self.limits.get(user_id, default_limit):
+                self.slots[user_id] = slots
+                return False
+            slots[job_id] = now + lease_seconds
+            self.slots[user_id] = slots
+            return True
+
+    def release_slot(self, user_id: str, job_id: str) -> None:
+        with self._lock:
+            self.slots.get(user_id, {}).pop(job_id, None)
+
+    def renew_slot(self, user_id: str, job_id: str, lease_seconds: int, now: float) -> None:
+        with self._lock:
+            if job_id in self.slots.get(user_id, {}):
+                self.slots[user_id][job_id] = now + lease_seconds
+
+    def counts(self, user_id: str, now: float) -> Dict[str, int]:
+        with self._lock:
+            running = [expiry for expiry in self.slots.get(user_id, {}).values() if expiry > now]
+            return {'queued': len(self.queues.get(user_id, [])), 'running': len(running)}
+
+    def users_with_queued_jobs(self) -> List[str]:
+        with self._lock:
+            return [user_id for user_id, queue in self.queues.items() if queue]
+
+
+class DynamoDBSchedulerStore:
+    """
+    Scheduler state in DynamoDB. A queued job carries queued_at, which puts it in the
+    sparse user-id-queued-at-index GSI of the jobs table; claiming it swaps queued_at
+    for dispatched_at. Each user has a scheduler item holding `slots` (job_id -> lease
+    expiry, one per dispatched job), a `queued` counter and an optional max_in_flight.
+    Slots are taken with a version-conditioned update and released idempotently.
+    """
+
+    def __init__(self, jobs_table: Any, scheduler_table: Any):
+        self.jobs_table = jobs_table
+        self.scheduler_table = scheduler_table
+
+    def enqueue(self, job: Dict[str, Any], queued_at: str) -> bool:
+        try:
+            self.jobs_table.update_item(
+                Key={'id': job['id']},
+                UpdateExpression='SET queued_at = :queued_at',
+                ConditionExpression='attribute_not_exists(queued_at) AND attribute_not_exists(dispatched_at)',
+                ExpressionAttributeValues={':queued_at': queued_at}
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                return False
+            raise
+        self._add_queued(job['user_id'], 1)
+        return True
+
+    def queued_jobs(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        response = self.jobs_table.query(
+            IndexName=QUEUED_INDEX,
+            KeyConditionExpression='user_id = :user_id',
+            ExpressionAttributeValues={':user_id': user_id},
+            Limit=limit
+        )
+        return response.get('Items', [])
+
+    def claim(self, job: Dict[str, Any]) -> bool:
+        try:
+            self.jobs_table.update_item(
+                Key={'id': job['id']},
+                UpdateExpression='SET dispatched_at = :now REMOVE queued_at',
+                ConditionExpression='attribute_exists(queued_at)',
+                ExpressionAttributeValues={':now': datetime.utcnow().isoformat()}
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                return False
+            raise
+        self._add_queued(job['user_id'], -1)
+        return True
+
+    def requeue(self, job: Dict[str, Any]) -> None:
+        self.jobs_table.update_item(
+            Key={'id': job['id']},
+            UpdateExpression='SET queued_at = :queued_at REMOVE dispatched_at',
+            ExpressionAttributeValues={':queued_at': job['queued_at']}
+        )
+        self._add_queued(job['user_id'], 1)
+
+    def acquire_slot(self, user_id: str, job_id: str, default_limit: int, lease_seconds: int, now: float) -> bool:
+        for _ in range(SCHEDULER_CONFLICT_RETRIES):
+            item = self.scheduler_table.get_item(Key={'user_id': user_id}, ConsistentRead=True).get('Item') or {}
+            slots = {held: expiry for held, expiry in (item.get('slots') or {}).items() if expiry > now}
+            if len(slots) >= int(item.get('max_in_flight', default_limit)):
+                return False
+            slots[job_id] = int(now + lease_seconds)
+            version = int(item.get('version', 0))
+            values = {':slots': slots, ':next': version + 1}
+            condition = 'attribute_not_exists(#version)'
+            if version:
+                condition = '#version = :version'
+                values[':version'] = version
+            try:
+                self.scheduler_table.update_item(
+                    Key={'user_id': user_id},
+                    UpdateExpression='SET slots = :slots, #version = :next',
+                    ConditionExpression=condition,
+                    ExpressionAttributeNames={'#version': 'version'},
+                    ExpressionAttributeValues=values
+                )
+                return True
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                    raise
+        # Still contended: leave the job queued for the next release or sweep
+        return False
+
+    def release_slot(self, user_id: str, job_id: str) -> None:
+        try:
+            self.scheduler_table.update_item(
+                Key={'user_id': user_id},
+                UpdateExpression='REMOVE slots.#job ADD #version :one',
+                ConditionExpression='attribute_exists(slots.#job)',
+                ExpressionAttributeNames={'#job': job_id, '#version': 'version'},
+                ExpressionAttributeValues={':one': 1}
+            )
+        except ClientError as e:
+            # Already released, or the job never held a slot (e.g. a redelivered retry)
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+
+    def renew_slot(self, user_id: str, job_id: str, lease_seconds: int, now: float) -> None:
+        try:
+            self.scheduler_table.update_item(
+                Key={'user_id': user_id},
+                UpdateExpression='SET slots.#job = :expiry ADD #version :one',
+                ConditionExpression='attribute_exists(slots.#job)',
+                ExpressionAttributeNames={'#job': job_id, '#version': 'version'},
+                ExpressionAttributeValues={':expiry': int(now + lease_seconds), ':one': 1}
+            )
+        except ClientError as e:
+            # The lease already expired and was reclaimed; the job runs on without a slot
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+
+    def counts(self, user_id: str, now: float) -> Dict[str, int]:
+        item = self.scheduler_table.get_item(Key={'user_id': user_id}).get('Item') or {}
+        running = [expiry for expiry in (item.get('slots') or {}).values() if expiry > now]
+        return {'queued': max(0, int(item.get('queued', 0))), 'running': len(running)}
+
+    def users_with_queued_jobs(self) -> List[str]:
+        users = []
+        kwargs = {
+            'FilterExpression': 'queued > :zero',
+            'ProjectionExpression': 'user_id',
+            'ExpressionAttributeValues': {':zero': 0}
+        }
+        while True:
+            response = self.scheduler_table.scan(**kwargs)
+            users.extend(item['user_id'] for item in response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return users
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _add_queued(self, user_id: str, delta: int) -> None:
+        self.scheduler_table.update_item(
+            Key={'user_id': user_id},
+            UpdateExpression='ADD queued :delta',
+            ExpressionAttributeValues={':delta': delta}
+        )
+
+
+class JobScheduler:
+    """
+    Admission control between job creation and the translation worker. Submitted jobs
+    wait in a per-user FIFO and are dispatched only while their user holds fewer than
+    max_in_flight slots; the worker releases a job's slot when it finishes, which
+    dispatches that user's next job. A bulk upload therefore keeps at most
+    max_in_flight jobs in the shared job queue and worker pool, and other users' jobs
+    never wait behind its backlog. Without a store (no SCHEDULER_TABLE) jobs are
+    dispatched immediately, as before.
+    """
+
+    def __init__(self, dispatch: Callable[[Dict[str, Any]], None], store: Any = None,
+                 max_in_flight: int = USER_MAX_IN_FLIGHT, lease_seconds: int = SLOT_LEASE_SECONDS):
+        self.dispatch = dispatch
+        self.store = store
+        self.max_in_flight = max_in_flight
+        self.lease_seconds = lease_seconds
+
+    @classmethod
+    def from_environment(cls, dynamodb: Any, dispatch: Callable[[Dict[str, Any]], None]) -> 'JobScheduler':
+        store = None
+        if SCHEDULER_TABLE and TRANSLATION_JOBS_TABLE and dynamodb is not None:
+            store = DynamoDBSchedulerStore(dynamodb.Table(TRANSLATION_JOBS_TABLE), dynamodb.Table(SCHEDULER_TABLE))
+        return cls(dispatch, store)
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    def submit(self, job: Dict[str, Any]) -> None:
+        """Queue a pending job and dispatch what the user's slots allow. Submitting a job twice is a no-op."""
+        self.submit_many([job])
+
+    def submit_many(self, jobs: List[Dict[str, Any]]) -> None:
+        if not self.enabled:
+            for job in jobs:
+                self.dispatch(job)
+            return
+        queued_at = datetime.utcnow().isoformat()
+        submitted: Dict[str, List[Dict[str, Any]]] = {}
+        for job in jobs:
+            if self.store.enqueue(job, queued_at):
+                submitted.setdefault(job['user_id'], []).append(job_reference(job, queued_at))
+        for user_id, references in submitted.items():
+            self.schedule(user_id, references)
+
+    def release(self, user_id: str, job_id: str) -> None:
+        """Free a finished job's slot and dispatch the user's next queued job."""
+        if not self.enabled:
+            return
+        self.store.release_slot(user_id, job_id)
+        self.schedule(user_id)
+
+    def renew(self, user_id: str, job_id: str, lease_seconds: int = None) -> None:
+        """
+        Extend a job's lease, e.g. when a long job continues in a new invocation or a
+        failed job waits for its retry. Does nothing if the job holds no slot.
+        """
+        if not self.enabled:
+            return
+        self.store.renew_slot(user_id, job_id, lease_seconds or self.lease_seconds, time.time())
+
+    def schedule(self, user_id: str, submitted: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Dispatch the user's oldest queued jobs while they have free slots. Returns how many were dispatched."""
+        candidates = self.store.queued_jobs(user_id, SCHEDULE_BATCH_SIZE)
+        # The index is eventually consistent, so just-submitted jobs may not be listed yet
+        if len(candidates) < SCHEDULE_BATCH_SIZE:
+            listed = {job['id'] for job in candidates}
+            candidates += [job for job in submitted or [] if job['id'] not in listed]
+
+        dispatched = 0
+        for job in candidates:
+            if not self.store.acquire_slot(user_id, job['id'], self.max_in_flight, self.lease_seconds, time.time()):
+                break
+            if not self.store.claim(job):
+                # Another scheduler dispatched it first
+                self.store.release_slot(user_id, job['id'])
+                continue
+            try:
+                self.dispatch(job)
+            except Exception as e:
+                logger.error(f"Error dispatching job {job['id']}, returning it to the queue: {str(e)}")
+                self.store.release_slot(user_id, job['id'])
+                self.store.requeue(job)
+                break
+            dispatched += 1
+
+        if dispatched:
+            logger.info(f"Dispatched {dispatched} jobs for user {user_id}: {self.store.counts(user_id, time.time())}")
+        return dispatched
+
+    def sweep(self) -> int:
+        """
+        One pass over every user with queued jobs, dispatching into slots freed by
+        expired leases or by releases that found nothing queued yet. Run on a schedule.
+        """
+        if not self.enabled:
+            return 0
+        return sum(self.schedule(user_id) for user_id in self.store.users_with_queued_jobs())
@@ -0,0 +1,113 @@
+import os
+import re
+from typing import Iterable, Iterator, List
+
+# Amazon Translate limits TranslateText input to 10,000 bytes of UTF-8 text
+DEFAULT_MAX_CHUNK_BYTES = int(os.environ.get('TRANSLATE_MAX_CHUNK_BYTES', '10000'))
+
+# Boundaries tried in order: paragraph, sentence, whitespace. Each pattern matches the
+# separator that should stay attached to the end of the preceding piece.
+_BOUNDARY_PATTERNS = [
+    re.compile(r'\n[ \t]*\n\s*'),
+    re.compile(r'[.!?…]+["\'”’)\]]*\s+|[。！？؟۔]+\s*'),
+    re.compile(r'\s+'),
+]
+
+
+def byte_length(text: str) -> int:
+    """Return the UTF-8 encoded size of text."""
+    return len(text.encode('utf-8'))
+
+
+def segment_text(text: str, max_bytes: int = DEFAULT_MAX_CHUNK_BYTES) -> List[str]:
+    """
+    Split text into chunks of at most max_bytes UTF-8 bytes.
+    Splits on paragraph, then sentence, then whitespace boundaries and greedily
+    packs the pieces, so ''.join(chunks) == text and words are only cut when a
+    single word is larger than the budget.
+    """
+    if max_bytes < 4:
+        raise ValueError("max_bytes must fit at least one UTF-8 character")
+
+    chunks = []
+    current = []
+    current_bytes = 0
+
+    for piece in _iter_pieces(text, max_bytes, 0):
+        size = byte_length(piece)
+        if current and current_bytes + size > max_bytes:
+            chunks.append(''.join(current))
+            current = []
+            current_bytes = 0
+        current.append(piece)
+        current_bytes += size
+
+    if current:
+        chunks.append(''.join(current))
+    return chunks
+
+
+def iter_segments(texts: Iterable[str], max_bytes: int = DEFAULT_MAX_CHUNK_BYTES) -> Iterator[str]:
+    """
+    Streaming form of segment_text for text that arrives in pieces.
+    Buffers a few chunks' worth of text, emits every chunk except the last
+    (which may end mid-paragraph) and carries that one into the next window.
+    """
+    window = 4 * max_bytes
+    buffer = ''
+    for text in texts:
+        buffer += text
+        if len(buffer) < window:
+            continue
+        chunks = segment_text(buffer, max_bytes)
+        yield from chunks[:-1]
+        buffer = chunks[-1]
+    if buffer:
+        yield from segment_text(buffer, max_bytes)
+
+
+def slice_text(text: str, max_chars: int = 4000) -> List[str]:
+    """Fixed-width character slicing, kept as a baseline for comparison."""
+    return [text[i:i+max_chars] for i in range(0, len(text), max_chars)]
+
+
+def _iter_pieces(text: str, max_bytes: int, level: int) -> Iterator[str]:
+    """Yield pieces of text no larger than max_bytes, using the coarsest boundary that fits."""
+    if byte_length(text) <= max_bytes:
+        yield text
+        return
+
+    if level >= len(_BOUNDARY_PATTERNS):
+        yield from _split_by_bytes(text, max_bytes)
+        return
+
+    for part in _split_after(text, _BOUNDARY_PATTERNS[level]):
+        yield from _iter_pieces(part, max_bytes, level + 1)
+
+
+def _split_after(text: str, pattern: re.Pattern) -> List[str]:
+    """Split text after every match of pattern, keeping the separators."""
+    parts = []
+    start = 0
+    for match in pattern.finditer(text):
+        if match.end() > start:
+            parts.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        parts.append(text[start:])
+    return parts
+
+
+def _split_by_bytes(text: str, max_bytes: int) -> Iterator[str]:
+    """Hard split on character boundaries so no piece exceeds max_bytes."""
+    start = 0
+    size = 0
+    for i, char in enumerate(text):
+        char_size = byte_length(char)
+        if size + char_size > max_bytes:
+            yield text[start:i]
+            start = i
+            size = 0
+        size += char_size
+    if start < len(text):
+        yield text[start:]
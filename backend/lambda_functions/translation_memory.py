@@ -0,0 +1,171 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger()
+
+TRANSLATION_MEMORY_TABLE = os.environ.get('TRANSLATION_MEMORY_TABLE')
+TRANSLATION_MEMORY_MAX_ENTRIES = int(os.environ.get('TRANSLATION_MEMORY_MAX_ENTRIES', '2048'))
+TRANSLATION_MEMORY_TTL_SECONDS = int(os.environ.get('TRANSLATION_MEMORY_TTL_SECONDS', str(7 * 24 * 60 * 60)))
+# Translations at least this many bytes are stored zlib-compressed as a Binary attribute
+TRANSLATION_MEMORY_COMPRESS_MIN_BYTES = int(os.environ.get('TRANSLATION_MEMORY_COMPRESS_MIN_BYTES', '128'))
+
+
+def segment_key(segment: str, source_language: str, target_language: str) -> str:
+    """Build the cache key for a segment and language pair."""
+    digest = hashlib.sha256()
+    digest.update(source_language.encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(target_language.encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(segment.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def encode_translation(translation: str, min_bytes: int = TRANSLATION_MEMORY_COMPRESS_MIN_BYTES) -> Any:
+    """translated_text as stored: zlib-compressed bytes when that is smaller, otherwise the string itself."""
+    data = translation.encode('utf-8')
+    if len(data) >= min_bytes:
+        compressed = zlib.compress(data, 1)
+        if len(compressed) < len(data):
+            return compressed
+    return translation
+
+
+def decode_translation(value: Any) -> str:
+    """Inverse of encode_translation; string items written before compression are returned as they are."""
+    if isinstance(value, str):
+        return value
+    # boto3 returns Binary attributes wrapped in boto3.dynamodb.types.Binary
+    return zlib.decompress(getattr(value, 'value', value)).decode('utf-8')
+
+
+class InMemoryStore:
+    """Persistent-tier stand-in that keeps entries in a dict, for local runs and tests."""
+
+    def __init__(self):
+        self.items: Dict[str, Tuple[str, int]] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.items.get(key)
+        if not entry or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def put(self, key: str, translation: str, expires_at: int) -> None:
+        self.items[key] = (translation, expires_at)
+
+
+class DynamoDBStore:
+    """
+    Persistent tier backed by a DynamoDB table keyed on segment_hash with TTL on expires_at.
+    Longer translations are stored compressed, cutting the item size that reads and writes are billed on.
+    """
+
+    def __init__(self, table: Any):
+        self.table = table
+
+    def get(self, key: str) -> Optional[str]:
+        item = self.table.get_item(Key={'segment_hash': key}).get('Item')
+        # DynamoDB TTL deletion is lazy, so expired items can still be returned
+        if not item or int(item.get('expires_at', 0)) <= time.time():
+            return None
+        return decode_translation(item['translated_text'])
+
+    def put(self, key: str, translation: str, expires_at: int) -> None:
+        self.table.put_item(Item={
+            'segment_hash': key,
+            'translated_text': encode_translation(translation),
+            'expires_at': expires_at
+        })
+
+
+class TranslationMemory:
+    """
+    Two-tier translation memory: a bounded, thread-safe LRU in the warm container
+    in front of an optional persistent store. Failures in the persistent tier are
+    logged and treated as misses so translation never depends on the cache.
+    """
+
+    def __init__(self, max_entries: int = TRANSLATION_MEMORY_MAX_ENTRIES,
+                 ttl_seconds: int = TRANSLATION_MEMORY_TTL_SECONDS, store: Any = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._entries: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'store_hits': 0, 'misses': 0, 'evictions': 0, 'store_errors': 0}
+
+    @classmethod
+    def from_environment(cls, dynamodb: Any = None) -> 'TranslationMemory':
+        store = None
+        if TRANSLATION_MEMORY_TABLE and dynamodb is not None:
+            store = DynamoDBStore(dynamodb.Table(TRANSLATION_MEMORY_TABLE))
+        return cls(store=store)
+
+    def get(self, segment: str, source_language: str, target_language: str) -> Optional[str]:
+        """Return a cached translation, checking the LRU first and then the persistent store."""
+        key = segment_key(segment, source_language, target_language)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.counters['hits'] += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+
+        if self.store is not None:
+            try:
+                translation = self.store.get(key)
+            except Exception as e:
+                logger.warning(f"Translation memory store read failed: {str(e)}")
+                self._count('store_errors')
+                translation = None
+            if translation is not None:
+                self._remember(key, translation, now)
+                self._count('store_hits')
+                return translation
+
+        self._count('misses')
+        return None
+
+    def put(self, segment: str, source_language: str, target_language: str, translation: str) -> None:
+        """Cache a translation in both tiers."""
+        key = segment_key(segment, source_language, target_language)
+        now = time.time()
+        self._remember(key, translation, now)
+
+        if self.store is not None:
+            try:
+                self.store.put(key, translation, int(now + self.ttl_seconds))
+            except Exception as e:
+                logger.warning(f"Translation memory store write failed: {str(e)}")
+                self._count('store_errors')
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters, size=len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, translation: str, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (translation, now + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
@@ -1,34 +1,123 @@
 import json
-import boto3
 import logging
 import os
-from datetime import datetime
-from typing import Dict, Any, List
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import islice
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Tuple
+from botocore.exceptions import ClientError
+import aws_clients
+from checkpoints import TranslationCheckpoint, TranslationSuspended, checkpoint_deadline
+from document_formats import (NodePack, ParsedDocument, document_format, job_output_key, pack_texts, parse_document,
+                              unpack_texts)
+from job_metrics import JobMetrics
+from pdf_pipeline import PAGE_SEPARATOR, iter_pdf_chunks, pdf_page_count
+from rate_limiter import RateLimitTimeout, TokenBucket
+from scheduler import JobScheduler
+from s3_streams import (STORAGE_CONTENT_ENCODING, MultipartUploadWriter, decoded_length, encoded_object, iter_body,
+                        iter_text, is_gzip)
+from segmenter import byte_length, iter_segments, segment_text
+from translation_memory import TranslationMemory
 
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
-translate_client = boto3.client('translate')
+s3_client = aws_clients.client('s3')
+dynamodb = aws_clients.resource('dynamodb')
+translate_client = aws_clients.client('translate')
+sqs_client = aws_clients.client('sqs')
+lambda_client = aws_clients.client('lambda')
+
+# Survives across invocations in a warm container
+translation_memory = TranslationMemory.from_environment(dynamodb)
+# Characters-per-second budget shared with every other worker container
+translate_rate_limiter = TokenBucket.from_environment(dynamodb)
 
 
 TRANSLATION_JOBS_TABLE = os.environ['TRANSLATION_JOBS_TABLE']
 INPUT_BUCKET = os.environ['INPUT_BUCKET']
 OUTPUT_BUCKET = os.environ['OUTPUT_BUCKET']
+CONTENT_INDEX_TABLE = os.environ.get('CONTENT_INDEX_TABLE')
+TRANSLATION_QUEUE_URL = os.environ.get('TRANSLATION_QUEUE_URL')
+PREVIEW_LENGTH = int(os.environ.get('PREVIEW_LENGTH', '200'))
+
+# Translate tuning
+TRANSLATE_MAX_CONCURRENCY = int(os.environ.get('TRANSLATE_MAX_CONCURRENCY', '8'))
+TRANSLATE_MAX_RETRIES = int(os.environ.get('TRANSLATE_MAX_RETRIES', '5'))
+TRANSLATE_RETRY_BASE_DELAY = float(os.environ.get('TRANSLATE_RETRY_BASE_DELAY', '0.2'))
+THROTTLING_ERROR_CODES = ('ThrottlingException', 'TooManyRequestsException', 'ServiceUnavailableException')
+
+# Jobs processed in parallel from one SQS batch
+JOB_BATCH_CONCURRENCY = int(os.environ.get('JOB_BATCH_CONCURRENCY', '4'))
+
+# Target languages of a multi-target job translated in parallel
+TARGET_LANGUAGE_CONCURRENCY = int(os.environ.get('TARGET_LANGUAGE_CONCURRENCY', '4'))
+# A job left processing by an invocation that died (timeout, out of memory) can be claimed
+# again once it has gone this long without an update. Must exceed the worker timeout, and
+# stay below the SQS visibility timeout so a redelivered message finds the lease expired.
+JOB_CLAIM_LEASE_SECONDS = int(os.environ.get('JOB_CLAIM_LEASE_SECONDS', '900'))
+# Deliveries after which SQS moves a failing message to the dead-letter queue (its maxReceiveCount)
+JOB_QUEUE_MAX_RECEIVE_COUNT = int(os.environ.get('JOB_QUEUE_MAX_RECEIVE_COUNT', '3'))
+# A failed job keeps its scheduler slot for the retry that follows. Must outlast the SQS
+# visibility timeout, after which a failed message is redelivered.
+JOB_RETRY_SLOT_LEASE_SECONDS = int(os.environ.get('JOB_RETRY_SLOT_LEASE_SECONDS', '2100'))
+
+def dispatch_job(job: Dict[str, Any], continuation: str = None) -> None:
+    """
+    Send a job to the worker: the SQS job queue when configured, else an async invoke
+    of this function. Used for scheduled jobs and for continuing a checkpointed job.
+    """
+    request = {'job_id': job['id'], 's3_input_key': job['s3_input_key']}
+    if continuation:
+        request['continuation'] = continuation
+    payload = json.dumps(request)
+    if TRANSLATION_QUEUE_URL:
+        sqs_client.send_message(QueueUrl=TRANSLATION_QUEUE_URL, MessageBody=payload)
+        return
+    lambda_client.invoke(
+        FunctionName=os.environ['AWS_LAMBDA_FUNCTION_NAME'],
+        InvocationType='Event',
+        Payload=payload
+    )
+
+# Finishing a job frees its user's slot and dispatches their next queued job
+job_scheduler = JobScheduler.from_environment(dynamodb, dispatch_job)
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for processing translation requests.
-    Invoked directly by API handler.
+    Invoked directly by API handler with a {job_id, s3_input_key} claim check,
+    by S3 ObjectCreated notifications on the input bucket, by the SQS job
+    queue with a batch of claim checks, or by the scheduler sweep rule.
     """
-    logger.info(f"Event: {json.dumps(event, default=str)}")
+    records = event.get('Records') or []
+    logger.info(f"Event keys: {list(event.keys())}, records: {len(records)}")
+    
+    if event.get('source') == 'aws.events':
+        dispatched = job_scheduler.sweep()
+        logger.info(f"Scheduler sweep dispatched {dispatched} jobs")
+        return {'statusCode': 200, 'body': json.dumps({'dispatched': dispatched})}
+    
+    if records and records[0].get('eventSource') == 'aws:sqs':
+        logger.info(f"Processing SQS batch of {len(records)} messages")
+        return process_sqs_batch(event, context)
     
     try:
-       
-        logger.info("Processing direct lambda invocation")
-        process_translation_request_direct(event)
+        if 'Records' in event:
+            logger.info("Processing S3 event")
+            for request in requests_from_s3_event(event):
+                process_translation_request_direct(request, context)
+        else:
+            logger.info("Processing direct lambda invocation")
+            process_translation_request_direct(event, context)
         
         return {
             'statusCode': 200,
@@ -36,165 +125,809 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"Error processing translation request: {str(e)}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'Failed to process translation request'})
-        }
+        # Direct and S3 invocations are asynchronous: raising makes Lambda retry the
+        # event, and the retry reclaims the failed job and resumes from its checkpoint
+        raise
+
+def process_sqs_batch(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Process a batch of queued jobs concurrently and report partial batch failures,
+    so SQS only redelivers the messages whose jobs failed.
+    """
+    records = event['Records']
+    
+    def process_record(record: Dict[str, Any]) -> bool:
+        # On the last delivery a failure is final: the message goes to the dead-letter queue
+        receive_count = int((record.get('attributes') or {}).get('ApproximateReceiveCount', 1))
+        will_retry = receive_count < JOB_QUEUE_MAX_RECEIVE_COUNT
+        try:
+            for request in requests_from_sqs_message(record):
+                process_translation_request_direct(request, context, will_retry)
+            return True
+        except Exception as e:
+            logger.error(f"Message {record.get('messageId')} failed: {str(e)}")
+            return False
+    
+    concurrency = max(1, min(JOB_BATCH_CONCURRENCY, len(records)))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(process_record, records))
+    
+    failures = [
+        {'itemIdentifier': record['messageId']}
+        for record, succeeded in zip(records, results) if not succeeded
+    ]
+    logger.info(f"SQS batch finished: {len(records) - len(failures)} succeeded, {len(failures)} failed")
+    return {'batchItemFailures': failures}
+
+def requests_from_sqs_message(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Read claim-check requests from an SQS message, which may also wrap an S3 notification."""
+    body = json.loads(record['body'])
+    if 'Records' in body:
+        return requests_from_s3_event(body)
+    if 'job_id' not in body:
+        # e.g. the s3:TestEvent sent when a notification is configured
+        logger.warning(f"Ignoring message without job_id: {record.get('messageId')}")
+        return []
+    return [body]
+
+def requests_from_s3_event(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Turn S3 ObjectCreated records into claim-check requests."""
+    requests = []
+    for record in event['Records']:
+        if not record.get('eventName', '').startswith('ObjectCreated'):
+            continue
+        input_key = urllib.parse.unquote_plus(record['s3']['object']['key'])
+        job_id = extract_job_id_from_key(input_key)
+        if not job_id:
+            logger.warning(f"Ignoring object outside input/{{user_id}}/{{job_id}}/ layout: {input_key}")
+            continue
+        requests.append({'job_id': job_id, 's3_input_key': input_key})
+    return requests
 
-def process_translation_request_direct(event: Dict[str, Any]) -> None:
-    """Process a single translation request from direct lambda invocation."""
+def extract_job_id_from_key(key: str) -> str:
+    """Extract job ID from S3 key format: input/{user_id}/{job_id}/{filename}"""
+    parts = key.split('/')
+    return parts[2] if len(parts) > 2 else ''
+
+def process_translation_request_direct(event: Dict[str, Any], context: Any = None, will_retry: bool = True) -> None:
+    """
+    Process a single translation request, loading the job and its input from DynamoDB and S3.
+    Single-target jobs are checkpointed as they translate, so a retry resumes where the last
+    attempt stopped; with a Lambda context, a job still running near the invocation's time
+    limit is saved and handed to a fresh invocation. Errors are raised for the caller's retry;
+    will_retry says whether one follows, so a failed job keeps its scheduler slot until then.
+    """
+    metrics = JobMetrics(event.get('job_id'))
+    job = None
+    claimed = False
+    suspended = False
+    retrying = False
+    deadline = checkpoint_deadline(context)
     try:
         job_id = event['job_id']
-        content = event['content']
-        source_language = event['source_language']
-        target_language = event['target_language']
-        file_name = event['file_name']
-        user_id = event['user_id']
+        with metrics.stage('load_job'):
+            job = get_job(job_id)
+        if not job:
+            raise ValueError(f"Translation job not found: {job_id}")
+        
+        input_key = event.get('s3_input_key') or job['s3_input_key']
+        source_language = job['source_language']
+        target_language = job.get('target_language')
+        file_name = job['file_name']
+        user_id = job['user_id']
         
         logger.info(f"Processing translation for job: {job_id}")
         logger.info(f"Source language: {source_language}")
-        logger.info(f"Target language: {target_language}")
-        logger.info(f"Content length: {len(content)}")
+        logger.info(f"Target language(s): {job.get('target_languages') or target_language}")
+        logger.info(f"Input key: {input_key}")
         logger.info(f"File name: {file_name}")
         logger.info(f"User ID: {user_id}")
-        
-     
-        logger.info(f"Environment variables:")
-        logger.info(f"  TRANSLATION_JOBS_TABLE: {TRANSLATION_JOBS_TABLE}")
-        logger.info(f"  INPUT_BUCKET: {INPUT_BUCKET}")
-        logger.info(f"  OUTPUT_BUCKET: {OUTPUT_BUCKET}")
+        metrics.properties.update(
+            source_language=source_language,
+            target_language=job.get('target_languages') or target_language,
+            file_type='pdf' if file_name.lower().endswith('.pdf') else 'text'
+        )
         
       
-        logger.info("Updating job status to processing...")
-        update_job_status(job_id, 'processing')
+        logger.info("Claiming job for processing...")
+        with metrics.stage('claim_job'):
+            claimed = claim_job(job_id, event.get('continuation'))
+        if not claimed:
+            logger.info(f"Job {job_id} already claimed or finished, skipping")
+            return
         logger.info("Job status updated to processing successfully")
         
+        output_key = job_output_key(user_id, job_id, file_name)
+        
+        if job.get('target_languages'):
+            process_multi_target_job(job, read_input_object(input_key, metrics), metrics)
+            logger.info(f"Multi-target translation completed for job: {job_id}")
+            metrics.emit('completed')
+            return
+        
+        document = None
+        if document_format(file_name):
+            content_bytes = read_input_object(input_key, metrics)
+            with metrics.stage('parse'):
+                document = parse_structured_document(file_name, content_bytes)
         
         if file_name.lower().endswith('.pdf'):
-          
-            import base64
-            try:
-                pdf_bytes = base64.b64decode(content)
-               
-                logger.warning("PDF translation not yet implemented - using placeholder")
-                translated_content = f"[PDF Translation Placeholder] Original content length: {len(pdf_bytes)} bytes"
-            except Exception as pdf_error:
-                logger.error(f"Error processing PDF: {pdf_error}")
-                translated_content = f"[PDF Processing Error] {str(pdf_error)}"
+            content_bytes = read_input_object(input_key, metrics)
+            logger.info(f"Input size: {len(content_bytes)} bytes")
+            
+            # Extracted text is delivered as plain text (output_key ends .txt), pages separated by form feeds
+            checkpoint = load_checkpoint(job, input_key, output_key)
+            if checkpoint.total is None:
+                checkpoint.total = pdf_page_count(content_bytes)
+            # PDF chunks are the same on every run, so a resumed job skips the ones already saved
+            chunks = islice(iter_pdf_chunks(content_bytes), checkpoint.chunks, None)
+            logger.info("Starting page-by-page PDF translation...")
+            with metrics.stage('translate'):
+                translated_preview, output_size_bytes = translate_chunks_to_object(
+                    chunks, output_key, source_language, target_language, metrics, checkpoint, deadline,
+                    units=lambda chunk: int(chunk == PAGE_SEPARATOR)
+                )
+            logger.info("PDF translation completed")
+        elif document is not None:
+            packs = document.packs()
+            checkpoint = load_checkpoint(job, input_key, output_key)
+            if checkpoint.total is None:
+                checkpoint.total = len(packs)
+            # Packs are the same on every run, so a resumed job skips the ones already saved
+            logger.info(f"Translating {len(document.nodes)} text nodes in {len(packs)} packs...")
+            with metrics.stage('translate'):
+                translated_preview, output_size_bytes = translate_chunks_to_object(
+                    packs[checkpoint.chunks:], output_key, source_language, target_language, metrics, checkpoint,
+                    deadline, units=lambda pack: 1, translate=partial(translate_pack, document)
+                )
+            logger.info("Structured document translation completed")
         else:
             
-            logger.info("Starting text translation...")
-            translated_content = translate_text(content, source_language, target_language)
+            # Read, segment, translate and upload incrementally so memory stays flat
+            logger.info("Starting streaming text translation...")
+            checkpoint = load_checkpoint(job, input_key, output_key)
+            with metrics.stage('translate'):
+                translated_preview, output_size_bytes = translate_object_streaming(
+                    input_key, output_key, source_language, target_language, metrics, checkpoint, deadline
+                )
             logger.info("Text translation completed")
-        
-     
-        logger.info("Saving translated content to S3...")
-        output_key = f"output/{user_id}/{job_id}/{file_name}"
-        save_translated_content(output_key, translated_content)
         logger.info("Translated content saved to S3 successfully")
         
        
         logger.info("Updating job completion...")
-        update_job_completion(job_id, translated_content, output_key)
+        with metrics.stage('complete_job'):
+            update_job_completion(job_id, output_key, translated_preview, output_size_bytes, metrics.summary())
         logger.info("Job completion updated successfully")
+        checkpoint.clear()
+        
+        if job.get('content_hash'):
+            with metrics.stage('content_index'):
+                record_content_index(job['content_hash'], job_id, input_key, output_key)
         
         logger.info(f"Translation completed for job: {job_id}")
+        metrics.emit('completed')
         
+    except TranslationSuspended:
+        # A failed hand-over marks the job failed and is raised for a retry, like any other error
+        retrying = will_retry
+        hand_over_job(job, metrics)
+        retrying = False
+        suspended = True
     except Exception as e:
         logger.error(f"Error processing translation request: {str(e)}")
         logger.error(f"Error type: {type(e).__name__}")
         import traceback
         logger.error(f"Full traceback: {traceback.format_exc()}")
         
-       
-        try:
-            job_id = event['job_id']
-            update_job_status(job_id, 'failed')
-            logger.info("Job status updated to failed")
-        except Exception as status_error:
-            logger.error(f"Failed to update job status to failed: {status_error}")
+        # Before the claim the job may belong to another invocation, so leave its status alone
+        if claimed:
+            try:
+                update_job_status(job['id'], 'failed', metrics.summary())
+                logger.info("Job status updated to failed")
+            except Exception as status_error:
+                logger.error(f"Failed to update job status to failed: {status_error}")
+        metrics.emit('failed')
+        retrying = will_retry
         
         raise e
+    finally:
+        # A handed-over job keeps its slot until the continuation finishes, and a failed
+        # job until its retry does; the slot is released once the job can run no more
+        if claimed and retrying:
+            keep_job_slot(job)
+        elif claimed and not suspended:
+            release_job_slot(job)
+
+def load_checkpoint(job: Dict[str, Any], input_key: str, output_key: str) -> TranslationCheckpoint:
+    """The job's translation checkpoint, resuming a previous attempt's progress when there is one."""
+    return TranslationCheckpoint.for_job(s3_client, dynamodb.Table(TRANSLATION_JOBS_TABLE), OUTPUT_BUCKET, job,
+                                         input_key, output_key, PREVIEW_LENGTH)
+
+def hand_over_job(job: Dict[str, Any], metrics: JobMetrics) -> None:
+    """
+    Continue a job that reached the invocation deadline in a fresh invocation. The job
+    stays processing with a continuation token only that invocation can claim it with.
+    If the hand-over fails the job is marked failed, and a retry resumes it from the
+    checkpoint.
+    """
+    job_id = job['id']
+    token = uuid.uuid4().hex
+    try:
+        table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        table.update_item(
+            Key={'id': job_id},
+            UpdateExpression='SET continuation = :token, updated_at = :updated_at',
+            ExpressionAttributeValues={':token': token, ':updated_at': datetime.utcnow().isoformat()}
+        )
+        dispatch_job(job, continuation=token)
+    except Exception as e:
+        logger.error(f"Failed to hand over job {job_id}: {str(e)}")
+        update_job_status(job_id, 'failed', metrics.summary())
+        metrics.emit('failed')
+        raise
+    try:
+        job_scheduler.renew(job['user_id'], job_id)
+    except Exception as e:
+        logger.error(f"Error renewing scheduler slot for job {job_id}: {str(e)}")
+    logger.info(f"Job {job_id} reached the invocation deadline and was handed over to a new invocation")
+    metrics.emit('suspended')
+
+def keep_job_slot(job: Dict[str, Any]) -> None:
+    """Hold a failed job's slot for its retry. If this fails the slot frees itself when its lease expires."""
+    try:
+        job_scheduler.renew(job['user_id'], job['id'], JOB_RETRY_SLOT_LEASE_SECONDS)
+    except Exception as e:
+        logger.error(f"Error renewing scheduler slot for job {job['id']}: {str(e)}")
+
+def release_job_slot(job: Dict[str, Any]) -> None:
+    """Give a finished job's slot back to the scheduler. If this fails the slot frees itself when its lease expires."""
+    try:
+        job_scheduler.release(job['user_id'], job['id'])
+    except Exception as e:
+        logger.error(f"Error releasing scheduler slot for job {job['id']}: {str(e)}")
+
+def process_multi_target_job(job: Dict[str, Any], content_bytes: bytes, metrics: JobMetrics = None) -> None:
+    """
+    Translate one source document into every language in job['target_languages'].
+    The source is segmented once and languages run concurrently; each language
+    records its own status and output key under job['results'], and a retry only
+    translates the languages that have not completed.
+    """
+    metrics = metrics or JobMetrics(job['id'])
+    job_id = job['id']
+    languages = job['target_languages']
+    results = job.get('results') or {}
+    remaining = [language for language in languages if results.get(language, {}).get('status') != 'completed']
+    if len(remaining) < len(languages):
+        logger.info(f"Resuming job {job_id}: {len(languages) - len(remaining)} languages already completed")
+    completed = [len(languages) - len(remaining)]
+    completed_lock = threading.Lock()
+    is_pdf = job['file_name'].lower().endswith('.pdf')
+    translate = translate_chunk
+    with metrics.stage('segment'):
+        document = None
+        if not is_pdf and document_format(job['file_name']):
+            document = parse_structured_document(job['file_name'], content_bytes)
+        if is_pdf:
+            chunks = list(iter_pdf_chunks(content_bytes))
+        elif document is not None:
+            chunks = document.packs()
+            translate = partial(translate_pack, document)
+        else:
+            chunks = segment_text(content_bytes.decode('utf-8'))
+    logger.info(f"Source segmented once into {len(chunks)} chunks for {len(languages)} languages")
+    
+    def translate_language(language: str) -> bool:
+        try:
+            with metrics.stage('translate'):
+                translated_content = ''.join(translate_chunks(chunks, job['source_language'], language,
+                                                              metrics=metrics, translate=translate))
+            output_key = job_output_key(job['user_id'], job_id, job['file_name'], language)
+            save_translated_content(output_key, translated_content, metrics)
+            with completed_lock:
+                completed[0] += 1
+                progress = min(99, int(completed[0] * 100 / len(languages)))
+            update_language_result(job_id, language, {
+                'status': 'completed',
+                's3_output_key': output_key,
+                'translated_preview': translated_content[:PREVIEW_LENGTH],
+                'completed_at': datetime.utcnow().isoformat()
+            }, progress)
+            return True
+        except Exception as e:
+            logger.error(f"Translation to {language} failed for job {job_id}: {str(e)}")
+            try:
+                update_language_result(job_id, language, {'status': 'failed', 'error': str(e)[:500]})
+            except Exception as status_error:
+                logger.error(f"Failed to record {language} failure: {status_error}")
+            return False
+    
+    concurrency = max(1, min(TARGET_LANGUAGE_CONCURRENCY, len(remaining) or 1))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        succeeded = list(executor.map(translate_language, remaining))
+    
+    failed_languages = [language for language, ok in zip(remaining, succeeded) if not ok]
+    if len(failed_languages) == len(languages):
+        raise RuntimeError(f"Translation failed for all target languages: {', '.join(languages)}")
+    
+    now = datetime.utcnow().isoformat()
+    with metrics.stage('complete_job'):
+        table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        table.update_item(
+            Key={'id': job_id},
+            UpdateExpression='SET #status = :status, failed_languages = :failed, completed_at = :now, '
+                             'updated_at = :now, metrics = :metrics, progress_percent = :progress',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={
+                ':status': 'completed',
+                ':failed': failed_languages,
+                ':now': now,
+                ':metrics': metrics.summary(),
+                ':progress': 100
+            }
+        )
+
+def update_language_result(job_id: str, language: str, result: Dict[str, Any], progress: int = None) -> None:
+    """Record the outcome for one target language of a multi-target job, and optionally the job's progress."""
+    table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+    update_expression = 'SET results.#language = :result, updated_at = :updated_at'
+    values = {
+        ':result': result,
+        ':updated_at': datetime.utcnow().isoformat()
+    }
+    if progress is not None:
+        update_expression += ', progress_percent = :progress'
+        values[':progress'] = progress
+    table.update_item(
+        Key={'id': job_id},
+        UpdateExpression=update_expression,
+        ExpressionAttributeNames={'#language': language},
+        ExpressionAttributeValues=values
+    )
+
+def get_job(job_id: str) -> Dict[str, Any]:
+    """Load a translation job item from DynamoDB."""
+    table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+    # Consistent, so a continuation sees the checkpoint its predecessor just saved
+    response = table.get_item(Key={'id': job_id}, ConsistentRead=True)
+    return response.get('Item')
+
+def claim_job(job_id: str, continuation: str = None) -> bool:
+    """
+    Move a job to processing unless another invocation already has it.
+    The API invoke and the S3 notification can both deliver the same job.
+    A continuation claims a job that is already processing, once, with the token
+    hand_over_job stored on it. A processing job not updated for JOB_CLAIM_LEASE_SECONDS
+    belongs to an invocation that died, so it is claimed again (resuming from its
+    checkpoint) and any outstanding continuation token is revoked.
+    """
+    try:
+        table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        if continuation:
+            table.update_item(
+                Key={'id': job_id},
+                UpdateExpression='SET updated_at = :updated_at REMOVE continuation',
+                ConditionExpression='#status = :processing AND continuation = :token',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={
+                    ':processing': 'processing',
+                    ':token': continuation,
+                    ':updated_at': datetime.utcnow().isoformat()
+                }
+            )
+            return True
+        now = datetime.utcnow()
+        table.update_item(
+            Key={'id': job_id},
+            UpdateExpression='SET #status = :processing, updated_at = :updated_at REMOVE continuation',
+            # AND binds tighter than OR
+            ConditionExpression='attribute_not_exists(#status) OR #status IN (:pending, :failed) '
+                                'OR #status = :processing AND updated_at < :stale_before',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={
+                ':processing': 'processing',
+                ':pending': 'pending',
+                ':failed': 'failed',
+                ':updated_at': now.isoformat(),
+                ':stale_before': (now - timedelta(seconds=JOB_CLAIM_LEASE_SECONDS)).isoformat()
+            }
+        )
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+def read_input_object(input_key: str, metrics: JobMetrics = None) -> bytes:
+    """Read an uploaded document from the input bucket, streaming the body in chunks and gunzipping it if stored compressed."""
+    metrics = metrics or JobMetrics()
+    logger.info(f"Reading input from S3: {INPUT_BUCKET}/{input_key}")
+    with metrics.stage('read_input'):
+        response = s3_client.get_object(Bucket=INPUT_BUCKET, Key=input_key)
+        buffer = bytearray()
+        for chunk in iter_body(response):
+            buffer.extend(chunk)
+    metrics.increment('bytes_read', response.get('ContentLength', len(buffer)))
+    return bytes(buffer)
 
 def translate_text(text: str, source_language: str, target_language: str) -> str:
-    """Translate text using AWS Translate."""
+    """Translate text using AWS Translate, translating chunks concurrently."""
     try:
         logger.info(f"Starting translation from {source_language} to {target_language}")
         logger.info(f"Text length: {len(text)}")
         
-       
-        max_chunk_size = 4000  
-        chunks = [text[i:i+max_chunk_size] for i in range(0, len(text), max_chunk_size)]
+        chunks = segment_text(text)
         
         logger.info(f"Text split into {len(chunks)} chunks")
         
-        translated_chunks = []
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Translating chunk {i+1}/{len(chunks)}")
-            response = translate_client.translate_text(
-                Text=chunk,
-                SourceLanguageCode=source_language,
-                TargetLanguageCode=target_language
-            )
-            translated_chunks.append(response['TranslatedText'])
+        translated_chunks = translate_chunks(chunks, source_language, target_language)
         
         result = ''.join(translated_chunks)
         logger.info(f"Translation completed. Result length: {len(result)}")
+        logger.info(f"Translation memory stats: {translation_memory.stats()}")
         return result
     except Exception as e:
         logger.error(f"Error translating text: {str(e)}")
         raise e
 
-def save_translated_content(output_key: str, content: str) -> None:
+def translate_chunks(chunks: List[Any], source_language: str, target_language: str,
+                     max_concurrency: int = None, metrics: JobMetrics = None,
+                     translate: Callable[..., str] = None) -> List[str]:
+    """Translate chunks with a bounded thread pool, returning results in original order."""
+    if not chunks:
+        return []
+    
+    logger.info(f"Translating {len(chunks)} chunks")
+    started = time.perf_counter()
+    results = list(iter_translated_chunks(chunks, source_language, target_language, max_concurrency, len(chunks),
+                                          metrics, translate))
+    logger.info(f"Translated {len(chunks)} chunks in {time.perf_counter() - started:.3f}s")
+    return results
+
+def iter_translated_chunks(chunks: Iterable[Any], source_language: str, target_language: str,
+                           max_concurrency: int = None, total: int = None,
+                           metrics: JobMetrics = None, translate: Callable[..., str] = None,
+                           stop: Callable[[], bool] = None) -> Iterator[str]:
+    """
+    Translate a (possibly lazy) stream of chunks concurrently and yield results in order.
+    At most 2 x max_concurrency chunks are in flight, so memory stays bounded for any input size.
+    translate is called as translate_chunk is; translate_pack takes node packs instead of text.
+    stop is checked before each chunk is submitted: once it returns True no more chunks are
+    submitted, chunks not yet started are dropped, and the ones already translating are
+    finished and yielded, so no translation that was paid for is lost.
+    """
+    max_concurrency = max(1, max_concurrency or TRANSLATE_MAX_CONCURRENCY)
+    translate = translate or translate_chunk
+    in_flight = deque()
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    try:
+        for index, chunk in enumerate(chunks):
+            if stop is not None and stop():
+                # Chunks start in submission order, so the ones cancelled here come last
+                for future in in_flight:
+                    future.cancel()
+                break
+            in_flight.append(executor.submit(translate, chunk, source_language, target_language,
+                                             index, total, metrics))
+            if len(in_flight) >= 2 * max_concurrency:
+                yield in_flight.popleft().result()
+        while in_flight and not in_flight[0].cancelled():
+            yield in_flight.popleft().result()
+    finally:
+        # Drop queued work if a chunk failed or the consumer stopped early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def translate_chunk(chunk: str, source_language: str, target_language: str,
+                    index: int = 0, total: int = None, metrics: JobMetrics = None,
+                    deadline: float = None) -> str:
+    """
+    Translate a single chunk within the shared characters-per-second budget,
+    retrying with jittered exponential backoff when throttled. Raises
+    TranslationSuspended rather than wait for budget past the deadline.
+    """
+    metrics = metrics or JobMetrics()
+    metrics.increment('chunks')
+    label = f"{index+1}/{total}" if total else f"{index+1}"
+    # Translate trims surrounding whitespace, so keep it aside to rejoin chunks faithfully
+    stripped = chunk.strip()
+    if not stripped:
+        return chunk
+    leading = chunk[:len(chunk) - len(chunk.lstrip())]
+    trailing = chunk[len(chunk.rstrip()):]
+    
+    cached = translation_memory.get(stripped, source_language, target_language)
+    if cached is not None:
+        metrics.increment('memory_hits')
+        logger.info(f"Chunk {label} served from translation memory")
+        return leading + cached + trailing
+    
+    attempt = 0
+    while True:
+        try:
+            waited = translate_rate_limiter.acquire(len(stripped), deadline)
+        except RateLimitTimeout as e:
+            raise TranslationSuspended(f"Chunk {label}: {str(e)}")
+        if waited:
+            metrics.increment('rate_limit_wait_ms', waited * 1000)
+        started = time.perf_counter()
+        metrics.increment('translate_calls')
+        metrics.increment('translate_characters', len(stripped))
+        try:
+            try:
+                response = translate_client.translate_text(
+                    Text=stripped,
+                    SourceLanguageCode=source_language,
+                    TargetLanguageCode=target_language
+                )
+            finally:
+                metrics.increment('translate_api_ms', (time.perf_counter() - started) * 1000)
+            logger.info(f"Chunk {label} translated in {time.perf_counter() - started:.3f}s "
+                        f"(attempt {attempt+1}, {len(stripped)} chars)")
+            translation_memory.put(stripped, source_language, target_language, response['TranslatedText'])
+            return leading + response['TranslatedText'] + trailing
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', '')
+            if error_code not in THROTTLING_ERROR_CODES or attempt >= TRANSLATE_MAX_RETRIES:
+                logger.error(f"Chunk {label} failed after {attempt+1} attempts: {error_code}")
+                raise
+            delay = random.uniform(0, TRANSLATE_RETRY_BASE_DELAY * (2 ** attempt))
+            attempt += 1
+            metrics.increment('translate_retries')
+            logger.warning(f"Chunk {label} throttled ({error_code}), retry {attempt} in {delay:.2f}s")
+            time.sleep(delay)
+
+def parse_structured_document(file_name: str, content_bytes: bytes) -> ParsedDocument:
+    """
+    Parse a file with a format-aware parser, or return None when it does not parse
+    (e.g. a .json file that is not valid JSON) so it is translated as plain text.
+    """
+    text = content_bytes.decode('utf-8')
+    try:
+        return parse_document(file_name, text)
+    except ValueError as e:
+        logger.warning(f"{file_name} is not valid {document_format(file_name)}, translating it as plain text: {str(e)}")
+        return None
+
+def translate_pack(document: ParsedDocument, pack: NodePack, source_language: str, target_language: str,
+                   index: int = 0, total: int = None, metrics: JobMetrics = None, deadline: float = None) -> str:
+    """
+    Translate the text nodes of one pack in a single request, joined by the node
+    delimiter, and render the pack's source with the translations in place.
+    """
+    metrics = metrics or JobMetrics()
+    texts = document.texts(pack)
+    metrics.increment('text_nodes', len(texts))
+    translations = translate_node_texts(texts, source_language, target_language, index, total, metrics, deadline)
+    return document.render(pack, translations)
+
+def translate_node_texts(texts: List[str], source_language: str, target_language: str,
+                         index: int = 0, total: int = None, metrics: JobMetrics = None,
+                         deadline: float = None) -> List[str]:
+    """
+    Translate packed nodes. If the reply does not split back into one part per node,
+    the nodes are retranslated in halves, down to one node per request.
+    """
+    metrics = metrics or JobMetrics()
+    if not texts:
+        return []
+    if len(texts) == 1:
+        # A node can be larger than one request, e.g. a long HTML paragraph
+        return [''.join(translate_chunk(chunk, source_language, target_language, index, total, metrics, deadline)
+                        for chunk in segment_text(texts[0]))]
+    translated = translate_chunk(pack_texts(texts), source_language, target_language, index, total, metrics,
+                                 deadline)
+    parts = unpack_texts(translated, len(texts))
+    if parts is not None:
+        return parts
+    logger.warning(f"Pack {index+1} came back with its node delimiters changed, splitting {len(texts)} nodes")
+    metrics.increment('pack_splits')
+    half = len(texts) // 2
+    return (translate_node_texts(texts[:half], source_language, target_language, index, total, metrics, deadline)
+            + translate_node_texts(texts[half:], source_language, target_language, index, total, metrics, deadline))
+
+def translate_object_streaming(input_key: str, output_key: str, source_language: str,
+                               target_language: str, metrics: JobMetrics = None,
+                               checkpoint: TranslationCheckpoint = None, deadline: float = None) -> Tuple[str, int]:
+    """
+    Stream a text object from the input bucket through segmentation and translation
+    into a multipart upload in the output bucket. Memory stays flat regardless of
+    document size. Returns the translated preview and the number of bytes written.
+    With a checkpoint, progress is counted in source bytes and a resumed job reads
+    the input from the first byte not yet translated.
+    """
+    logger.info(f"Streaming translation {INPUT_BUCKET}/{input_key} -> {OUTPUT_BUCKET}/{output_key}")
+    metrics = metrics or JobMetrics()
+    options = {}
+    skip = 0
+    if checkpoint is not None and checkpoint.done:
+        # Segmentation keeps every character, so restarting it mid-document changes
+        # where chunks break but not the translated output
+        options['Range'] = f"bytes={checkpoint.done}-"
+    response = s3_client.get_object(Bucket=INPUT_BUCKET, Key=input_key, **options)
+    if options and is_gzip(response):
+        # A range of a gzipped object is a range of the compressed bytes, so read
+        # it from the start and drop the text already translated
+        response['Body'].close()
+        response = s3_client.get_object(Bucket=INPUT_BUCKET, Key=input_key)
+        skip = checkpoint.done
+    metrics.increment('bytes_read', response.get('ContentLength', 0))
+    if checkpoint is not None and checkpoint.total is None:
+        checkpoint.total = decoded_length(response)
+    chunks = iter_segments(iter_text(iter_body(response, skip=skip)))
+    return translate_chunks_to_object(chunks, output_key, source_language, target_language, metrics,
+                                      checkpoint, deadline)
+
+def translate_chunks_to_object(chunks: Iterable[Any], output_key: str, source_language: str,
+                               target_language: str, metrics: JobMetrics = None,
+                               checkpoint: TranslationCheckpoint = None, deadline: float = None,
+                               units: Callable[[Any], int] = byte_length,
+                               translate: Callable[..., str] = None) -> Tuple[str, int]:
+    """
+    Translate a stream of chunks concurrently and write the results, in order, to the output bucket.
+    With a checkpoint, text saved by earlier attempts is written first and each translated chunk is
+    checkpointed, credited with units(source chunk) of progress. On failure, or once past the
+    deadline (raising TranslationSuspended), the chunks translated so far are saved before returning;
+    at the deadline the chunks already being translated are finished and saved too. Chunks are
+    translated with the deadline, so none waits for rate limit budget beyond it.
+    """
+    metrics = metrics or JobMetrics()
+    preview = ''
+    translated_count = 0
+    pending_units = deque()
+    stopped = []
+    
+    def past_deadline() -> bool:
+        if checkpoint is None or deadline is None or time.monotonic() < deadline:
+            return False
+        stopped.append(True)
+        return True
+    
+    def track(stream: Iterable[str]) -> Iterator[str]:
+        for chunk in stream:
+            pending_units.append(units(chunk))
+            yield chunk
+    
+    if checkpoint is not None:
+        chunks = track(chunks)
+        if deadline is not None:
+            # A chunk that would wait for rate limit budget past the deadline suspends the job
+            translate = partial(translate or translate_chunk, deadline=deadline)
+    writer = MultipartUploadWriter(s3_client, OUTPUT_BUCKET, output_key,
+                                   content_encoding=STORAGE_CONTENT_ENCODING)
+    try:
+        if checkpoint is not None and checkpoint.parts:
+            with metrics.stage('resume_checkpoint'):
+                for saved in checkpoint.iter_saved():
+                    writer.write(saved)
+            preview = checkpoint.preview
+        for translated in iter_translated_chunks(chunks, source_language, target_language, metrics=metrics,
+                                                 translate=translate, stop=past_deadline):
+            if len(preview) < PREVIEW_LENGTH:
+                preview += translated[:PREVIEW_LENGTH - len(preview)]
+            with metrics.stage('write_output'):
+                writer.write(translated)
+            translated_count += 1
+            if checkpoint is None:
+                continue
+            with metrics.stage('checkpoint'):
+                checkpoint.add(translated, pending_units.popleft())
+        if stopped:
+            raise TranslationSuspended(f"Invocation deadline reached after {translated_count} chunks")
+        with metrics.stage('write_output'):
+            writer.close()
+    except Exception:
+        writer.abort()
+        if checkpoint is not None:
+            with metrics.stage('checkpoint'):
+                checkpoint.save()
+        raise
+    metrics.increment('bytes_written', writer.bytes_written)
+    metrics.increment('bytes_stored', writer.bytes_stored)
+    
+    logger.info(f"Wrote {translated_count} translated chunks, {writer.bytes_written} bytes "
+                f"({writer.bytes_stored} stored)")
+    logger.info(f"Translation memory stats: {translation_memory.stats()}")
+    return preview, writer.bytes_written
+
+def save_translated_content(output_key: str, content: str, metrics: JobMetrics = None) -> None:
     """Save translated content to S3 output bucket."""
+    metrics = metrics or JobMetrics()
     try:
         logger.info(f"Saving translated content to S3: {OUTPUT_BUCKET}/{output_key}")
-        s3_client.put_object(
-            Bucket=OUTPUT_BUCKET,
-            Key=output_key,
-            Body=content.encode('utf-8'),
-            ContentType='text/plain',
-            ServerSideEncryption='AES256'
-        )
+        body = content.encode('utf-8')
+        stored = encoded_object(body, STORAGE_CONTENT_ENCODING)
+        with metrics.stage('write_output'):
+            s3_client.put_object(
+                Bucket=OUTPUT_BUCKET,
+                Key=output_key,
+                ContentType='text/plain',
+                ServerSideEncryption='AES256',
+                **stored
+            )
+        metrics.increment('bytes_written', len(body))
+        metrics.increment('bytes_stored', len(stored['Body']))
         logger.info("Translated content saved successfully")
     except Exception as e:
         logger.error(f"Error saving translated content: {str(e)}")
         raise e
 
-def update_job_completion(job_id: str, translated_text: str, output_key: str) -> None:
-    """Update job with completion details in DynamoDB."""
+def update_job_completion(job_id: str, output_key: str, translated_preview: str, output_size_bytes: int,
+                          metrics: Dict[str, int] = None) -> None:
+    """
+    Update job with completion details in DynamoDB. The full text lives only in S3.
+    metrics is the JobMetrics summary up to this point, kept on the item for capacity planning.
+    """
     try:
         logger.info(f"Updating job completion for job: {job_id}")
         table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        now = datetime.utcnow().isoformat()
+        update_expression = ('SET #status = :status, translated_preview = :preview, output_size_bytes = :size, '
+                             's3_output_key = :output_key, completed_at = :completed_at, updated_at = :updated_at, '
+                             'progress_percent = :progress')
+        values = {
+            ':status': 'completed',
+            ':progress': 100,
+            ':preview': translated_preview[:PREVIEW_LENGTH],
+            ':size': output_size_bytes,
+            ':output_key': output_key,
+            ':completed_at': now,
+            ':updated_at': now
+        }
+        if metrics is not None:
+            update_expression += ', metrics = :metrics'
+            values[':metrics'] = metrics
+        # The checkpoint cursor is only needed while the job can still resume
+        update_expression += ' REMOVE #checkpoint'
         table.update_item(
             Key={'id': job_id},
-            UpdateExpression='SET #status = :status, translated_text = :translated_text, s3_output_key = :output_key, completed_at = :completed_at',
-            ExpressionAttributeNames={'#status': 'status'},
-            ExpressionAttributeValues={
-                ':status': 'completed',
-                ':translated_text': translated_text,
-                ':output_key': output_key,
-                ':completed_at': datetime.utcnow().isoformat()
-            }
+            UpdateExpression=update_expression,
+            ExpressionAttributeNames={'#status': 'status', '#checkpoint': 'checkpoint'},
+            ExpressionAttributeValues=values
         )
         logger.info("Job completion updated successfully")
     except Exception as e:
         logger.error(f"Error updating job completion: {str(e)}")
         raise e
 
-def update_job_status(job_id: str, status: str) -> None:
-    """Update job status in DynamoDB."""
+def record_content_index(content_hash: str, job_id: str, input_key: str, output_key: str) -> None:
+    """Point the content hash at this job's output so identical uploads can reuse it."""
+    if not CONTENT_INDEX_TABLE:
+        return
+    try:
+        table = dynamodb.Table(CONTENT_INDEX_TABLE)
+        item = {
+            'content_hash': content_hash,
+            'job_id': job_id,
+            's3_output_key': output_key,
+            'completed_at': datetime.utcnow().isoformat(),
+            'expires_at': int(datetime.utcnow().timestamp()) + (30 * 24 * 60 * 60)
+        }
+        if input_key:
+            item['s3_input_key'] = input_key
+        table.put_item(Item=item)
+        logger.info(f"Content index updated for hash: {content_hash}")
+    except Exception as e:
+        # The index is an optimisation; a failed write must not fail the job
+        logger.error(f"Error updating content index: {str(e)}")
+
+def update_job_status(job_id: str, status: str, metrics: Dict[str, int] = None) -> None:
+    """Update job status in DynamoDB, optionally with the job's metrics summary."""
     try:
         logger.info(f"Updating job status to {status} for job: {job_id}")
         table = dynamodb.Table(TRANSLATION_JOBS_TABLE)
+        update_expression = 'SET #status = :status, updated_at = :updated_at'
+        values = {
+            ':status': status,
+            ':updated_at': datetime.utcnow().isoformat()
+        }
+        if metrics is not None:
+            update_expression += ', metrics = :metrics'
+            values[':metrics'] = metrics
         table.update_item(
             Key={'id': job_id},
-            UpdateExpression='SET #status = :status, updated_at = :updated_at',
+            UpdateExpression=update_expression,
             ExpressionAttributeNames={'#status': 'status'},
-            ExpressionAttributeValues={
-                ':status': status,
-                ':updated_at': datetime.utcnow().isoformat()
-            }
+            ExpressionAttributeValues=values
         )
         logger.info("Job status updated successfully")
     except Exception as e:
@@ -205,11 +938,7 @@ def test_translation_worker():
     """Test function to verify translation worker is working."""
     test_event = {
         'job_id': 'test-job-123',
-        'content': 'Hello world',
-        'source_language': 'en',
-        'target_language': 'es',
-        'file_name': 'test.txt',
-        'user_id': 'test-user'
+        's3_input_key': 'input/test-user/test-job-123/test.txt'
     }
     
     try:
@@ -63,6 +63,28 @@ resource "aws_s3_bucket_server_side_encryption_configuration" "document_output"
   }
 }
 
+# Translation checkpoints are deleted when a job completes; this catches abandoned jobs
+resource "aws_s3_bucket_lifecycle_configuration" "document_output" {
+  bucket = aws_s3_bucket.document_output.id
+
+  rule {
+    id     = "expire-checkpoints"
+    status = "Enabled"
+
+    filter {
+      prefix = "checkpoints/"
+    }
+
+    expiration {
+      days = 7
+    }
+
+    noncurrent_version_expiration {
+      noncurrent_days = 1
+    }
+  }
+}
+
 resource "aws_s3_bucket_public_access_block" "document_output" {
   bucket = aws_s3_bucket.document_output.id
 
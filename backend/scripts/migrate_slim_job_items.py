@@ -0,0 +1,100 @@
+"""
+Backfill existing translation job items to the slim layout.
+
+Older items carry the full document in original_text and translated_text.
+This scans the jobs table, replaces those attributes with short previews and
+sizes, and removes the full text. The documents themselves are already in the
+input and output buckets (s3_input_key / s3_output_key), so nothing is lost.
+
+Usage: python scripts/migrate_slim_job_items.py --table <jobs-table> [--dry-run]
+"""
+import argparse
+import logging
+import time
+
+import boto3
+from botocore.exceptions import ClientError
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+LEGACY_ATTRIBUTES = ('original_text', 'translated_text')
+
+
+def slim_update(item: dict, preview_length: int) -> dict:
+    """Build the update_item arguments that slim a single legacy item."""
+    set_parts = []
+    values = {}
+    original = item.get('original_text')
+    translated = item.get('translated_text')
+
+    # PDF uploads stored base64 in original_text, which is not worth previewing
+    if isinstance(original, str) and not item.get('file_name', '').lower().endswith('.pdf'):
+        set_parts.append('original_preview = :original_preview')
+        values[':original_preview'] = original[:preview_length]
+    if isinstance(translated, str):
+        set_parts.append('translated_preview = :translated_preview')
+        set_parts.append('output_size_bytes = :output_size_bytes')
+        values[':translated_preview'] = translated[:preview_length]
+        values[':output_size_bytes'] = len(translated.encode('utf-8'))
+
+    expression = ''
+    if set_parts:
+        expression = 'SET ' + ', '.join(set_parts) + ' '
+    expression += 'REMOVE ' + ', '.join(a for a in LEGACY_ATTRIBUTES if a in item)
+
+    update = {
+        'Key': {'id': item['id']},
+        'UpdateExpression': expression,
+        # Skip items that were rewritten since the scan read them
+        'ConditionExpression': 'attribute_exists(id)'
+    }
+    if values:
+        update['ExpressionAttributeValues'] = values
+    return update
+
+
+def migrate(table_name: str, preview_length: int, dry_run: bool) -> None:
+    table = boto3.resource('dynamodb').Table(table_name)
+    scan_kwargs = {
+        'FilterExpression': 'attribute_exists(original_text) OR attribute_exists(translated_text)'
+    }
+    scanned = migrated = failed = 0
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        scanned += response.get('ScannedCount', 0)
+
+        for item in response.get('Items', []):
+            update = slim_update(item, preview_length)
+            if dry_run:
+                logger.info(f"[dry-run] {item['id']}: {update['UpdateExpression']}")
+                migrated += 1
+                continue
+            try:
+                table.update_item(**update)
+                migrated += 1
+            except ClientError as e:
+                failed += 1
+                logger.error(f"Failed to migrate {item['id']}: {e}")
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        # Stay gentle on on-demand capacity
+        time.sleep(0.05)
+
+    logger.info(f"Scanned {scanned} items, migrated {migrated}, failed {failed}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table', required=True, help='translation jobs table name')
+    parser.add_argument('--preview-length', type=int, default=200)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    migrate(args.table, args.preview_length, args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+resource "aws_sqs_queue" "translation_jobs_dlq" {
+  name                      = "${var.project_name}-translation-jobs-dlq-${random_string.suffix.result}"
+  message_retention_seconds = 1209600
+  sqs_managed_sse_enabled   = true
+
+  tags = {
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+resource "aws_sqs_queue" "translation_jobs" {
+  name                       = "${var.project_name}-translation-jobs-${random_string.suffix.result}"
+  # At least 6x the worker timeout, as recommended for Lambda event sources
+  visibility_timeout_seconds = 1800
+  message_retention_seconds  = 345600
+  sqs_managed_sse_enabled    = true
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.translation_jobs_dlq.arn
+    maxReceiveCount     = var.translation_queue_max_receive_count
+  })
+
+  tags = {
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+
+resource "aws_lambda_event_source_mapping" "translation_jobs" {
+  event_source_arn                   = aws_sqs_queue.translation_jobs.arn
+  function_name                      = aws_lambda_function.translation_worker.arn
+  batch_size                         = var.translation_queue_batch_size
+  maximum_batching_window_in_seconds = var.translation_queue_batching_window
+  function_response_types            = ["ReportBatchItemFailures"]
+
+  scaling_config {
+    maximum_concurrency = var.translation_queue_max_concurrency
+  }
+
+  depends_on = [aws_iam_role_policy.lambda_policy]
+}
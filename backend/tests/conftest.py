@@ -0,0 +1,99 @@
+"""
+Shared fixtures. Tests run against the in-memory AWS stand-ins in benchmarks/fakes.py,
+so no AWS account is needed: cd backend && python -m pytest
+"""
+import os
+import sys
+import time
+from typing import Any, Dict
+
+import pytest
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(BACKEND, 'benchmarks'))
+sys.path.insert(0, os.path.join(BACKEND, 'scripts'))
+
+from fakes import FakeDynamoDB, FakeLambda, FakeS3, FakeTranslate, setup_environment  # noqa: E402
+
+setup_environment()
+
+import api_handler  # noqa: E402
+import translation_worker  # noqa: E402
+
+CONTENT_INDEX_TABLE = 'content-index'
+
+
+class LambdaContext:
+    """The part of a Lambda context the worker reads: an invocation ending `seconds` from now."""
+
+    def __init__(self, seconds):
+        self.end = time.monotonic() + seconds
+
+    def get_remaining_time_in_millis(self):
+        return max(0.0, self.end - time.monotonic()) * 1000
+
+
+@pytest.fixture
+def s3():
+    return FakeS3()
+
+
+@pytest.fixture
+def dynamodb():
+    return FakeDynamoDB()
+
+
+@pytest.fixture
+def translate():
+    return FakeTranslate()
+
+
+@pytest.fixture
+def worker(monkeypatch, s3, dynamodb, translate):
+    """translation_worker wired to fresh fakes, with an empty translation memory."""
+    monkeypatch.setattr(translation_worker, 's3_client', s3)
+    monkeypatch.setattr(translation_worker, 'dynamodb', dynamodb)
+    monkeypatch.setattr(translation_worker, 'translate_client', translate)
+    monkeypatch.setattr(translation_worker, 'CONTENT_INDEX_TABLE', CONTENT_INDEX_TABLE)
+    translation_worker.translation_memory.clear()
+    yield translation_worker
+    translation_worker.translation_memory.clear()
+
+
+@pytest.fixture
+def api(monkeypatch, s3, dynamodb):
+    """api_handler sharing the worker's fakes, with the content index on and async invokes recorded."""
+    monkeypatch.setattr(api_handler, 's3_client', s3)
+    monkeypatch.setattr(api_handler, 'dynamodb', dynamodb)
+    monkeypatch.setattr(api_handler, 'lambda_client', FakeLambda())
+    monkeypatch.setattr(api_handler, 'TRANSLATION_QUEUE_URL', None)
+    monkeypatch.setattr(api_handler, 'CONTENT_INDEX_TABLE', CONTENT_INDEX_TABLE)
+    return api_handler
+
+
+@pytest.fixture
+def create_job(worker, s3, dynamodb):
+    """Store an input document and a pending job item for it; returns the job item."""
+    def create(content: bytes, file_name: str = 'document.txt', job_id: str = 'job-1',
+               **attributes: Any) -> Dict[str, Any]:
+        input_key = f"input/test-user/{job_id}/{file_name}"
+        s3.put_object(Bucket=worker.INPUT_BUCKET, Key=input_key, Body=content)
+        job = {
+            'id': job_id, 'user_id': 'test-user', 'file_name': file_name, 'source_language': 'en',
+            'target_language': 'es', 'status': 'pending', 'created_at': '2025-01-01T00:00:00',
+            'updated_at': '2025-01-01T00:00:00', 's3_input_key': input_key,
+        }
+        job.update(attributes)
+        dynamodb.Table(worker.TRANSLATION_JOBS_TABLE).put_item(Item=job)
+        return job
+    return create
+
+
+@pytest.fixture
+def read_output(worker, s3):
+    """The decoded body of an object in the output bucket."""
+    from s3_streams import read_body
+
+    def read(key: str) -> bytes:
+        return read_body(s3.get_object(Bucket=worker.OUTPUT_BUCKET, Key=key))
+    return read
@@ -0,0 +1,536 @@
+import base64
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from fakes import FakeQueue, api_event
+
+from conftest import CONTENT_INDEX_TABLE
+
+
+def post(api, path, user_id, body):
+    response = api.lambda_handler(api_event('POST', path, user_id, body), None)
+    assert response['statusCode'] == 201, response
+    return json.loads(response['body'])
+
+
+def create_translation(api, user_id, content='Hello world.', file_name='notes.txt', **fields):
+    body = {'fileName': file_name, 'sourceLanguage': 'en', 'targetLanguage': 'es', 'fileContent': content}
+    body.update(fields)
+    return post(api, '/translations', user_id, body)
+
+
+def run_dispatched_jobs(api, worker):
+    while api.lambda_client.payloads:
+        worker.process_translation_request_direct(api.lambda_client.payloads.pop(0))
+
+
+def test_identical_upload_reuses_the_same_users_translation(api, worker, read_output):
+    first = create_translation(api, 'alice')
+    run_dispatched_jobs(api, worker)
+
+    second = create_translation(api, 'alice')
+    assert second['status'] == 'completed'
+    assert second['deduplicated_from'] == first['id']
+    assert second['s3_output_key'] == f"output/alice/{second['id']}/notes.txt"
+    assert read_output(second['s3_output_key']) == b'Hello world.'
+
+
+def test_identical_upload_by_another_user_is_translated_separately(api, worker):
+    create_translation(api, 'alice')
+    run_dispatched_jobs(api, worker)
+
+    job = create_translation(api, 'bob')
+    assert job['status'] == 'pending'
+    assert 'deduplicated_from' not in job
+    assert job['s3_input_key'].startswith('input/bob/')
+
+    batch = post(api, '/translations/batch', 'bob', {
+        'sourceLanguage': 'en', 'targetLanguage': 'es',
+        'files': [{'fileName': 'notes.txt', 'fileContent': 'Hello world.'}],
+    })
+    job = batch['items'][0]['job']
+    assert job['status'] == 'pending'
+    assert 'deduplicated_from' not in job
+    assert job['s3_input_key'].startswith('input/bob/')
+
+
+def test_same_bytes_in_another_format_are_not_reused(api, worker):
+    create_translation(api, 'alice', '<p>Hello</p>', 'page.txt')
+    run_dispatched_jobs(api, worker)
+    assert create_translation(api, 'alice', '<p>Hello</p>', 'page.html')['status'] == 'pending'
+
+
+def test_reused_pdf_translation_keeps_the_txt_output_key(api, worker, s3, dynamodb, read_output):
+    pdf_bytes = b'%PDF-1.4 stand-in'
+    content_hash = api.compute_content_hash(pdf_bytes, 'en', 'es', 'alice', 'report.pdf')
+    s3.put_object(Bucket=api.OUTPUT_BUCKET, Key='output/alice/job-0/report.pdf.txt', Body=b'Extracted text')
+    dynamodb.Table(CONTENT_INDEX_TABLE).put_item(Item={
+        'content_hash': content_hash, 'job_id': 'job-0', 's3_output_key': 'output/alice/job-0/report.pdf.txt',
+        's3_input_key': 'input/alice/job-0/report.pdf'})
+
+    job = create_translation(api, 'alice', base64.b64encode(pdf_bytes).decode('ascii'), 'report.pdf',
+                             fileType='application/pdf')
+    assert job['deduplicated_from'] == 'job-0'
+    assert job['s3_output_key'] == f"output/alice/{job['id']}/report.pdf.txt"
+    assert read_output(job['s3_output_key']) == b'Extracted text'
+
+    batch = post(api, '/translations/batch', 'alice', {
+        'sourceLanguage': 'en', 'targetLanguage': 'es',
+        'files': [{'fileName': 'report.pdf', 'fileType': 'application/pdf',
+                   'fileContent': base64.b64encode(pdf_bytes).decode('ascii')}],
+    })
+    job = batch['items'][0]['job']
+    assert job['s3_output_key'] == f"output/alice/{job['id']}/report.pdf.txt"
+
+
+def put_job(dynamodb, job_id, updated_at, user_id='alice', **attributes):
+    item = {
+        'id': job_id, 'user_id': user_id, 'file_name': f'{job_id}.txt', 'source_language': 'en',
+        'target_language': 'es', 'status': 'processing', 'created_at': '2025-01-01T00:00:00',
+        'updated_at': updated_at}
+    item.update(attributes)
+    dynamodb.Table('jobs').put_item(Item=item)
+
+
+def get_changes(api, user_id='alice', **query):
+    response = api.lambda_handler(api_event('GET', '/translations/changes', user_id, query=query), None)
+    assert response['statusCode'] == 200, response
+    return json.loads(response['body'])
+
+
+def test_changes_include_a_late_write_stamped_before_the_watermark(api, dynamodb):
+    put_job(dynamodb, 'a', '2025-01-01T00:00:10')
+    watermark = get_changes(api)['watermark']
+    assert watermark == '2025-01-01T00:00:10'
+
+    # Written by a worker whose clock is behind, and visible in the index only now
+    put_job(dynamodb, 'late', '2025-01-01T00:00:08')
+    put_job(dynamodb, 'new', '2025-01-01T00:00:11')
+    changes = get_changes(api, since=watermark)
+    assert {'late', 'new'} <= {item['id'] for item in changes['items']}
+    assert changes['watermark'] == '2025-01-01T00:00:11'
+    assert not changes['hasMore']
+
+
+def test_changes_sharing_a_timestamp_across_pages_are_all_returned(api, dynamodb):
+    put_job(dynamodb, 'first', '2025-01-01T00:00:00')
+    for i in range(api.MAX_PAGE_SIZE + 50):
+        put_job(dynamodb, f'job-{i}', '2025-01-01T00:01:00')
+
+    since, cursor, seen = '2025-01-01T00:00:00', None, set()
+    for _ in range(3):
+        changes = get_changes(api, since=since, **({'cursor': cursor} if cursor else {}))
+        seen.update(item['id'] for item in changes['items'])
+        cursor = changes['cursor']
+        if not changes['hasMore']:
+            break
+        assert changes['watermark'] == since
+    assert seen >= {f'job-{i}' for i in range(api.MAX_PAGE_SIZE + 50)}
+    assert changes['watermark'] == '2025-01-01T00:01:00'
+
+
+def test_changes_reject_another_users_cursor(api, dynamodb):
+    for i in range(api.MAX_PAGE_SIZE + 1):
+        put_job(dynamodb, f'bob-{i}', '2025-01-01T00:01:00', user_id='bob')
+    cursor = get_changes(api, 'bob', since='2025-01-01T00:00:00')['cursor']
+    response = api.lambda_handler(api_event('GET', '/translations/changes', 'alice',
+                                            query={'since': '2025-01-01T00:00:00', 'cursor': cursor}), None)
+    assert response['statusCode'] == 400
+
+
+def test_create_translation_does_not_log_headers_or_document_content(api, caplog):
+    event = api_event('POST', '/translations', 'alice', {
+        'fileName': 'notes.txt', 'sourceLanguage': 'en', 'targetLanguage': 'es',
+        'fileContent': 'Confidential contract terms.',
+    }, headers={'Authorization': 'Bearer secret-token', 'Content-Type': 'application/json'})
+    with caplog.at_level('INFO'):
+        assert api.lambda_handler(event, None)['statusCode'] == 201
+        assert api.lambda_handler(dict(event, body='{"fileName": "notes.txt", Confidential'), None)['statusCode'] == 400
+
+    assert 'secret-token' not in caplog.text
+    assert 'Confidential' not in caplog.text
+
+
+def call(api, method, path, user_id='alice', body=None, **options):
+    response = api.lambda_handler(api_event(method, path, user_id, body, **options), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def submit_batch(api, files, user_id='alice', **defaults):
+    body = {'sourceLanguage': 'en', 'targetLanguage': 'es', 'files': files}
+    body.update(defaults)
+    return call(api, 'POST', '/translations/batch', user_id, body)
+
+
+def test_batch_reports_bad_files_without_failing_the_rest(api, s3, dynamodb, monkeypatch):
+    put_object = s3.put_object
+
+    def flaky_put_object(**kwargs):
+        if kwargs['Key'].endswith('/broken.txt'):
+            raise RuntimeError('S3 unavailable')
+        return put_object(**kwargs)
+
+    monkeypatch.setattr(s3, 'put_object', flaky_put_object)
+    status, batch = submit_batch(api, [
+        {'fileName': 'one.txt', 'fileContent': 'One.'},
+        'not an object',
+        {'fileName': 'nested/two.txt', 'fileContent': 'Two.'},
+        {'fileName': 'empty.txt', 'fileContent': ''},
+        {'fileName': 'broken.txt', 'fileContent': 'Broken.'},
+        {'fileName': 'direct.txt', 'fileSize': 2048},
+    ])
+
+    assert status == 201
+    assert (batch['submitted'], batch['failed']) == (2, 4)
+    items = batch['items']
+    assert [item['index'] for item in items] == list(range(6))
+    assert items[0]['job']['status'] == 'pending'
+    assert items[1]['error'] == 'Each file must be an object'
+    assert items[2]['error'] == 'fileName must be a plain file name'
+    assert items[3]['error'] == 'fileContent must be a non-empty string'
+    assert items[4]['error'] == 'Failed to upload file'
+    assert items[5]['upload']['url']
+    assert {item['file_name'] for item in dynamodb.Table('jobs').items.values()} == {'one.txt', 'direct.txt'}
+    # Only the inline file is sent to the worker; the direct upload starts from its S3 notification
+    assert [payload['job_id'] for payload in api.lambda_client.payloads] == [items[0]['job']['id']]
+
+
+def test_batch_is_limited_to_100_files(api, dynamodb):
+    files = [{'fileName': f'file-{i}.txt', 'fileContent': f'Text {i}.'} for i in range(api.MAX_BATCH_FILES + 1)]
+    status, body = submit_batch(api, files)
+    assert status == 400
+    assert body['error'] == 'At most 100 files per batch'
+    assert not dynamodb.Table('jobs').items
+
+    status, body = submit_batch(api, files[:api.MAX_BATCH_FILES])
+    assert (status, body['submitted']) == (201, 100)
+
+
+def test_batch_files_can_override_the_batch_languages(api):
+    _, batch = submit_batch(api, [
+        {'fileName': 'default.txt', 'fileContent': 'Default.'},
+        {'fileName': 'many.txt', 'fileContent': 'Many.', 'targetLanguages': ['fr', 'de']},
+        {'fileName': 'german.txt', 'fileContent': 'Deutsch.', 'sourceLanguage': 'de', 'targetLanguage': 'it'},
+    ])
+    default, many, german = (item['job'] for item in batch['items'])
+
+    assert (default['source_language'], default['target_language']) == ('en', 'es')
+    assert many['target_languages'] == ['fr', 'de']
+    assert 'target_language' not in many
+    assert set(many['results']) == {'fr', 'de'}
+    assert (german['source_language'], german['target_language']) == ('de', 'it')
+
+
+def test_batch_deduplicates_with_one_batch_get(api, worker, dynamodb, read_output):
+    first = create_translation(api, 'alice')
+    run_dispatched_jobs(api, worker)
+    content_index = dynamodb.Table(CONTENT_INDEX_TABLE)
+    content_index.calls.clear()
+
+    _, batch = submit_batch(api, [
+        {'fileName': 'notes.txt', 'fileContent': 'Hello world.'},
+        {'fileName': 'other.txt', 'fileContent': 'Something else.'},
+        {'fileName': 'notes.txt', 'fileContent': 'Hello world.'},
+    ])
+
+    assert content_index.calls == {'batch_get_item': 1}
+    reused, fresh, reused_again = (item['job'] for item in batch['items'])
+    for job in (reused, reused_again):
+        assert job['status'] == 'completed'
+        assert job['deduplicated_from'] == first['id']
+        assert read_output(job['s3_output_key']) == b'Hello world.'
+    assert fresh['status'] == 'pending'
+    assert [payload['job_id'] for payload in api.lambda_client.payloads] == [fresh['id']]
+
+
+def test_batch_jobs_are_enqueued_ten_per_send_message_batch(api, monkeypatch):
+    queue, groups = FakeQueue(), []
+    send_message_batch = queue.send_message_batch
+
+    def record_batch(**kwargs):
+        groups.append(len(kwargs['Entries']))
+        return send_message_batch(**kwargs)
+
+    monkeypatch.setattr(queue, 'send_message_batch', record_batch)
+    monkeypatch.setattr(api, 'sqs_client', queue)
+    monkeypatch.setattr(api, 'TRANSLATION_QUEUE_URL', 'https://sqs.example/translation-jobs')
+
+    files = [{'fileName': f'file-{i}.txt', 'fileContent': f'Text {i}.'} for i in range(23)]
+    files.append({'fileName': 'direct.txt'})
+    _, batch = submit_batch(api, files)
+
+    assert groups == [10, 10, 3]
+    queued = [json.loads(message['body']) for message in queue.messages]
+    assert queued == [{'job_id': item['job']['id'], 's3_input_key': item['job']['s3_input_key']}
+                      for item in batch['items'][:23]]
+    assert not api.lambda_client.payloads
+
+
+def test_batch_status_counts_jobs_by_status(api, worker, dynamodb):
+    _, batch = submit_batch(api, [{'fileName': f'file-{i}.txt', 'fileContent': f'Text {i}.'} for i in range(3)])
+    path = f"/translations/batch/{batch['batchId']}"
+    done, failed, last = (item['job']['id'] for item in batch['items'])
+    payloads = {payload['job_id']: payload for payload in api.lambda_client.payloads}
+    worker.process_translation_request_direct(payloads[done])
+    dynamodb.Table('jobs').items[failed]['status'] = 'failed'
+
+    status, progress = call(api, 'GET', path)
+    assert status == 200
+    assert progress['total'] == 3
+    assert progress['counts'] == {'pending': 1, 'processing': 0, 'completed': 1, 'failed': 1}
+    assert not progress['done']
+    assert {item['id']: item['status'] for item in progress['items']}[done] == 'completed'
+
+    # The pending job finishes; the failed one stays failed
+    worker.process_translation_request_direct(payloads[last])
+    status, progress = call(api, 'GET', path)
+    assert progress['counts'] == {'pending': 0, 'processing': 0, 'completed': 2, 'failed': 1}
+    assert progress['done']
+
+    assert call(api, 'GET', path, 'bob')[0] == 404
+
+
+def test_status_lookup_retries_unprocessed_keys(api, dynamodb, monkeypatch):
+    for i in range(5):
+        put_job(dynamodb, f'job-{i}', '2025-01-01T00:00:00')
+    # Each BatchGetItem call returns at most two items and the rest as UnprocessedKeys
+    dynamodb.batch_get_limit = 2
+    sleeps = []
+    monkeypatch.setattr(api.time, 'sleep', sleeps.append)
+
+    status, body = call(api, 'POST', '/translations/status', body={'ids': [f'job-{i}' for i in range(5)]})
+    assert status == 200
+    assert [item['id'] for item in body['items']] == [f'job-{i}' for i in range(5)]
+    assert body['missing'] == []
+    assert dynamodb.Table('jobs').calls['batch_get_item'] == 3
+    assert len(sleeps) == 2
+
+
+def test_status_lookup_gives_up_on_keys_that_stay_unprocessed(api, dynamodb, monkeypatch):
+    for i in range(api.BATCH_RETRY_ATTEMPTS + 2):
+        put_job(dynamodb, f'job-{i}', '2025-01-01T00:00:00')
+    dynamodb.batch_get_limit = 1
+    monkeypatch.setattr(api.time, 'sleep', lambda seconds: None)
+
+    ids = [f'job-{i}' for i in range(api.BATCH_RETRY_ATTEMPTS + 2)]
+    assert call(api, 'POST', '/translations/status', body={'ids': ids})[0] == 500
+
+
+def test_status_lookup_reports_other_users_jobs_as_missing_in_request_order(api, dynamodb):
+    put_job(dynamodb, 'a-1', '2025-01-01T00:00:00')
+    put_job(dynamodb, 'b-1', '2025-01-01T00:00:00', user_id='bob')
+    put_job(dynamodb, 'a-2', '2025-01-01T00:00:00')
+
+    ids = ['a-2', 'b-1', 'nope', 'a-1', 'a-2']
+    status, body = call(api, 'POST', '/translations/status', body={'ids': ids})
+    assert status == 200
+    assert [item['id'] for item in body['items']] == ['a-2', 'a-1']
+    assert body['missing'] == ['b-1', 'nope']
+    # Projected to the status fields, without the owner
+    assert set(body['items'][0]) <= set(api.STATUS_FIELDS) - {'user_id'}
+
+
+def test_status_lookup_validates_the_ids(api):
+    assert call(api, 'POST', '/translations/status', body={'ids': []})[0] == 400
+    assert call(api, 'POST', '/translations/status', body={'ids': ['a', 3]})[0] == 400
+    too_many = [f'job-{i}' for i in range(api.MAX_STATUS_IDS + 1)]
+    assert call(api, 'POST', '/translations/status', body={'ids': too_many})[0] == 400
+
+
+def list_translations(api, user_id='alice', **query):
+    return call(api, 'GET', '/translations', user_id, query=query)
+
+
+def put_daily_jobs(dynamodb, days, user_id='alice'):
+    """One job created on each of the first `days` days of January, alternating completed and failed."""
+    for day in range(1, days + 1):
+        put_job(dynamodb, f'{user_id}-{day}', '2025-02-01T00:00:00', user_id,
+                created_at=f'2025-01-{day:02d}T12:00:00', status='completed' if day % 2 else 'failed',
+                s3_output_key=f'output/{user_id}/{user_id}-{day}/x.txt')
+
+
+def test_translations_are_listed_newest_first_a_page_at_a_time(api, dynamodb):
+    put_daily_jobs(dynamodb, 5)
+    put_daily_jobs(dynamodb, 2, 'bob')
+
+    status, page = list_translations(api, limit='2')
+    assert status == 200
+    assert set(page) == {'items', 'nextCursor'}
+    assert [item['id'] for item in page['items']] == ['alice-5', 'alice-4']
+    assert page['items'][0]['download_path'] == '/translations/alice-5/download'
+    assert 'download_path' not in page['items'][1]
+
+    seen = [item['id'] for item in page['items']]
+    while page['nextCursor']:
+        status, page = list_translations(api, limit='2', cursor=page['nextCursor'])
+        assert status == 200
+        seen += [item['id'] for item in page['items']]
+    assert seen == ['alice-5', 'alice-4', 'alice-3', 'alice-2', 'alice-1']
+
+
+def test_translations_can_be_filtered_by_status_and_creation_date(api, dynamodb):
+    put_daily_jobs(dynamodb, 6)
+
+    _, page = list_translations(api, status='failed')
+    assert [item['id'] for item in page['items']] == ['alice-6', 'alice-4', 'alice-2']
+    # A bare `to` date includes the whole of that day
+    _, page = list_translations(api, **{'from': '2025-01-02', 'to': '2025-01-04'})
+    assert [item['id'] for item in page['items']] == ['alice-4', 'alice-3', 'alice-2']
+    _, page = list_translations(api, **{'from': '2025-01-05T00:00:00'})
+    assert [item['id'] for item in page['items']] == ['alice-6', 'alice-5']
+    _, page = list_translations(api, status='completed', to='2025-01-03')
+    assert [item['id'] for item in page['items']] == ['alice-3', 'alice-1']
+
+
+def test_translations_list_rejects_bad_parameters(api, dynamodb):
+    for query in ({'limit': 'ten'}, {'limit': '0'}, {'limit': str(api.MAX_PAGE_SIZE + 1)},
+                  {'status': 'deleted'}, {'cursor': 'not-a-cursor'}):
+        status, body = list_translations(api, **query)
+        assert status == 400, query
+        assert body['error']
+
+
+def test_translations_list_rejects_another_users_cursor(api, dynamodb):
+    put_daily_jobs(dynamodb, 3, 'bob')
+    _, page = list_translations(api, 'bob', limit='1')
+    assert page['nextCursor']
+    status, body = list_translations(api, 'alice', cursor=page['nextCursor'])
+    assert status == 400
+    assert body == {'error': 'Invalid cursor'}
+
+
+def fail_languages(translate, monkeypatch, *languages):
+    original = translate.translate_text
+
+    def translate_text(**kwargs):
+        if kwargs['TargetLanguageCode'] in languages:
+            raise ClientError({'Error': {'Code': 'UnsupportedLanguagePairException'}}, 'TranslateText')
+        return original(**kwargs)
+
+    monkeypatch.setattr(translate, 'translate_text', translate_text)
+
+
+def test_target_languages_are_parsed_into_one_job(api):
+    job = create_translation(api, 'alice', targetLanguage=None, targetLanguages=['es', 'fr', 'es', 'de'])
+    assert job['target_languages'] == ['es', 'fr', 'de']
+    assert job['results'] == {language: {'status': 'pending'} for language in ('es', 'fr', 'de')}
+
+    # A single language is an ordinary single-target job
+    job = create_translation(api, 'alice', targetLanguage=None, targetLanguages=['fr'])
+    assert job['target_language'] == 'fr'
+    assert 'results' not in job
+
+    for languages in ([], 'es', ['es', ''], [f'l{i}' for i in range(api.MAX_TARGET_LANGUAGES + 1)]):
+        body = {'fileName': 'notes.txt', 'sourceLanguage': 'en', 'fileContent': 'Hi.', 'targetLanguages': languages}
+        assert call(api, 'POST', '/translations', body=body)[0] == 400, languages
+
+
+def test_multi_target_job_completes_with_the_languages_that_succeeded(api, worker, translate, monkeypatch,
+                                                                      read_output):
+    fail_languages(translate, monkeypatch, 'fr')
+    job = create_translation(api, 'alice', targetLanguage=None, targetLanguages=['es', 'fr', 'de'])
+    run_dispatched_jobs(api, worker)
+
+    status, job = call(api, 'GET', f"/translations/{job['id']}")
+    assert status == 200
+    assert (job['status'], job['progress_percent'], job['failed_languages']) == ('completed', 100, ['fr'])
+    assert {language: result['status'] for language, result in job['results'].items()} == {
+        'es': 'completed', 'fr': 'failed', 'de': 'completed'}
+    assert 'UnsupportedLanguagePairException' in job['results']['fr']['error']
+    for language in ('es', 'de'):
+        output_key = job['results'][language]['s3_output_key']
+        assert output_key == f"output/alice/{job['id']}/{language}/notes.txt"
+        assert read_output(output_key) == b'Hello world.'
+
+    download = f"/translations/{job['id']}/download"
+    status, body = call(api, 'GET', download, query={'language': 'de'})
+    assert status == 200
+    assert f"/{job['id']}/de/notes.txt" in body['download_url']
+    assert call(api, 'GET', download, query={'language': 'fr'})[0] == 409
+    assert call(api, 'GET', download, query={'language': 'it'})[0] == 400
+    assert call(api, 'GET', download)[0] == 400
+
+
+def test_multi_target_job_fails_when_every_language_fails(api, worker, translate, monkeypatch):
+    fail_languages(translate, monkeypatch, 'es', 'fr')
+    job = create_translation(api, 'alice', targetLanguage=None, targetLanguages=['es', 'fr'])
+    with pytest.raises(RuntimeError):
+        run_dispatched_jobs(api, worker)
+
+    _, job = call(api, 'GET', f"/translations/{job['id']}")
+    assert job['status'] == 'failed'
+    assert {result['status'] for result in job['results'].values()} == {'failed'}
+
+
+def get(api, path, user_id='alice', **headers):
+    return api.lambda_handler(api_event('GET', path, user_id, headers=headers), None)
+
+
+def test_languages_are_revalidated_with_their_etag(api):
+    response = get(api, '/languages')
+    assert response['statusCode'] == 200
+    etag = response['headers']['ETag']
+    assert response['headers']['Cache-Control'] == 'public, max-age=3600'
+    assert {'code': 'es', 'name': 'Spanish'} in json.loads(response['body'])
+
+    for header in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+        response = get(api, '/languages', **{'If-None-Match': header})
+        assert (response['statusCode'], response['body']) == (304, ''), header
+        assert response['headers']['ETag'] == etag
+    assert get(api, '/languages', **{'If-None-Match': '"other"'})['statusCode'] == 200
+
+
+def test_translation_is_revalidated_until_the_job_changes(api, worker, s3, dynamodb):
+    job = create_translation(api, 'alice')
+    path = f"/translations/{job['id']}"
+    response = get(api, path)
+    assert response['statusCode'] == 200
+    etag = response['headers']['ETag']
+    assert response['headers']['Cache-Control'] == 'private, no-cache'
+
+    response = get(api, path, **{'if-none-match': etag})
+    assert (response['statusCode'], response['body'], response['headers']['ETag']) == (304, '', etag)
+    # Ownership is checked before the ETag
+    assert get(api, path, 'bob', **{'If-None-Match': etag})['statusCode'] == 403
+
+    run_dispatched_jobs(api, worker)
+    response = get(api, path, **{'If-None-Match': etag})
+    assert response['statusCode'] == 200
+    assert json.loads(response['body'])['status'] == 'completed'
+    completed_etag = response['headers']['ETag']
+    assert completed_etag != etag
+
+    # A revalidated completed job is not re-signed
+    signed = s3.calls.get('generate_presigned_url', 0)
+    assert get(api, path, **{'If-None-Match': completed_etag})['statusCode'] == 304
+    assert s3.calls.get('generate_presigned_url', 0) == signed
+
+
+def test_user_id_extraction_logs_claim_names_only(api, caplog):
+    event = api_event('GET', '/translations', 'alice')
+    event['requestContext']['authorizer']['claims'].update({'email': 'alice@example.com', 'name': 'Alice Liddell'})
+    missing = api_event('GET', '/translations', 'alice')
+    missing['requestContext']['authorizer']['claims'] = {'email': 'alice@example.com'}
+    with caplog.at_level('INFO'):
+        assert api.get_user_id_from_event(event) == 'alice'
+        assert api.get_user_id_from_event(missing) is None
+
+    assert 'email' in caplog.text
+    assert 'alice@example.com' not in caplog.text
+    assert 'Liddell' not in caplog.text
+
+
+@pytest.mark.parametrize('file_name', ['a/b.txt', '../notes.txt', '..', '.', 42])
+def test_every_create_path_rejects_file_names_that_are_not_plain(api, s3, dynamodb, file_name):
+    languages = {'sourceLanguage': 'en', 'targetLanguage': 'es'}
+    error = {'error': 'fileName must be a plain file name'}
+    assert call(api, 'POST', '/translations', body=dict(languages, fileName=file_name, fileContent='Hi.')) == (400, error)
+    assert call(api, 'POST', '/translations/upload-url', body=dict(languages, fileName=file_name)) == (400, error)
+
+    status, batch = submit_batch(api, [{'fileName': file_name, 'fileContent': 'Hi.'}])
+    assert status == 400
+    assert batch['items'][0]['error'] == error['error']
+    assert not s3.objects
+    assert not dynamodb.Table('jobs').items
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from document_formats import (NODE_DELIMITER, ParsedDocument, document_format, pack_texts, parse_document,
+                              unpack_texts)
+
+DOCUMENTS = {
+    'page.html': '<html><body><h1>Title &amp; more</h1>\n<p>Some <b>bold</b> text.</p>'
+                 '<script>var x = "code";</script></body></html>\n',
+    'guide.md': '# Heading\n\nA paragraph with `code` and a [link](https://example.com).\n\n'
+                '- item one\n- item two\n\n```\nnot = "translated"\n```\n| a cell | another |\n',
+    'strings.json': '{\n  "title": "Hello world",\n  "url": "https://example.com",\n  "count": 3,\n'
+                    '  "nested": {"body": "  Padded text  "}\n}\n',
+    'subtitles.srt': '1\n00:00:01,000 --> 00:00:02,000\nFirst line\nsecond line\n\n'
+                     '2\n00:00:03,000 --> 00:00:04,000\nAnother cue\n',
+}
+
+
+def render_all(document: ParsedDocument, translate=lambda text: text, **pack_options) -> str:
+    return ''.join(document.render(pack, [translate(text) for text in document.texts(pack)])
+                   for pack in document.packs(**pack_options))
+
+
+@pytest.mark.parametrize('texts', [
+    ['one'],
+    ['Hello', 'world', 'again'],
+    ['multi\nline node', 'trailing punctuation!', '¿Qué tal?'],
+])
+def test_pack_unpack_round_trip(texts):
+    assert unpack_texts(pack_texts(texts), len(texts)) == texts
+
+
+def test_packed_texts_are_joined_by_the_delimiter():
+    assert pack_texts(['a', 'b']) == 'a' + NODE_DELIMITER + 'b'
+
+
+def test_unpack_tolerates_reformatted_delimiters():
+    assert unpack_texts('  Hola \n# # #\nmundo ', 2) == ['Hola', 'mundo']
+    assert unpack_texts('Hola ###mundo', 2) == ['Hola', 'mundo']
+
+
+def test_unpack_rejects_a_changed_node_count():
+    assert unpack_texts('Hola mundo', 2) is None
+    assert unpack_texts(pack_texts(['a', 'b', 'c']), 2) is None
+
+
+@pytest.mark.parametrize('file_name', sorted(DOCUMENTS))
+def test_identity_translation_reproduces_document(file_name):
+    text = DOCUMENTS[file_name]
+    document = parse_document(file_name, text)
+    assert document.nodes
+    assert render_all(document) == text
+    assert render_all(document, max_nodes=1) == text
+
+
+def test_markup_code_and_keys_are_not_nodes():
+    nodes = lambda name: [parse_document(name, DOCUMENTS[name]).pieces[i]
+                          for i in parse_document(name, DOCUMENTS[name]).nodes]
+    assert nodes('page.html') == ['Title & more', 'Some', 'bold', 'text.']
+    assert 'not = "translated"' not in ' '.join(nodes('guide.md'))
+    assert nodes('strings.json') == ['Hello world', 'Padded text']
+    assert nodes('subtitles.srt') == ['First line second line', 'Another cue']
+
+
+@pytest.mark.parametrize('file_name', sorted(DOCUMENTS))
+def test_byte_order_mark_is_kept_out_of_the_nodes(file_name):
+    document = parse_document(file_name, '\ufeff' + DOCUMENTS[file_name])
+    assert render_all(document, str.upper).startswith('\ufeff')
+    assert render_all(document) == '\ufeff' + DOCUMENTS[file_name]
+    assert [document.pieces[i] for i in document.nodes] == \
+        [parse_document(file_name, DOCUMENTS[file_name]).pieces[i]
+         for i in parse_document(file_name, DOCUMENTS[file_name]).nodes]
+
+
+def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_document('strings.json', '{"title": "Hello",')
+
+
+def test_translations_are_escaped_for_the_format():
+    document = parse_document('strings.json', DOCUMENTS['strings.json'])
+    output = json.loads(render_all(document, lambda text: f'"{text}"'))
+    assert output['title'] == '"Hello world"'
+    assert output['nested']['body'] == '  "Padded text"  '
+    assert output['url'] == 'https://example.com'
+
+    document = parse_document('page.html', '<p>A & B</p>')
+    assert render_all(document, lambda text: text + ' <x>') == '<p>A &amp; B &lt;x&gt;</p>'
+
+
+def test_srt_translation_is_rewrapped_to_the_cue_line_count():
+    document = parse_document('subtitles.srt', DOCUMENTS['subtitles.srt'])
+    output = render_all(document, lambda text: text.upper())
+    assert 'FIRST LINE\nSECOND LINE\n' in output
+
+
+def test_packs_respect_node_and_byte_limits():
+    document = ParsedDocument()
+    for i in range(10):
+        document.add_text(f'node {i}')
+        document.add('|')
+    packs = document.packs(max_nodes=3)
+    assert [len(pack.nodes) for pack in packs] == [3, 3, 3, 1]
+    assert packs[0].start == 0 and packs[-1].end == len(document.pieces)
+    assert all(a.end == b.start for a, b in zip(packs, packs[1:]))
+    assert all(len(pack.nodes) == 1 for pack in document.packs(max_bytes=10))
+
+
+def test_node_containing_the_delimiter_gets_its_own_pack():
+    document = ParsedDocument()
+    for text in ('before', 'heading ### inside', 'after'):
+        document.add_text(text)
+        document.add('\n')
+    assert [len(pack.nodes) for pack in document.packs()] == [1, 1, 1]
+
+
+def test_document_format_is_chosen_by_extension():
+    assert document_format('Notes.MD') == '.md'
+    assert document_format('movie.srt') == '.srt'
+    assert document_format('plain.txt') is None
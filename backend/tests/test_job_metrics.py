@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+import job_metrics
+from job_metrics import JobMetrics
+
+
+@pytest.fixture
+def emitted(monkeypatch, capsys):
+    """EMF records printed to stdout, with metrics switched on."""
+    monkeypatch.setattr(job_metrics, 'METRICS_ENABLED', True)
+
+    def records():
+        return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{')]
+    return records
+
+
+def test_emit_prints_one_emf_record(emitted):
+    metrics = JobMetrics('job-1', file_format='txt')
+    metrics.add_time('translate', 12.6)
+    metrics.add_time('translate', 10)
+    metrics.increment('translate_calls', 3)
+    metrics.increment('bytes_read', 2048)
+    metrics.increment('rate_limit_wait_ms', 5.4)
+    metrics.increment('custom_counter')
+
+    record = metrics.emit('completed')
+    assert emitted() == [record]
+    directive, = record['_aws']['CloudWatchMetrics']
+    assert directive['Namespace'] == job_metrics.METRICS_NAMESPACE
+    assert directive['Dimensions'] == [['Status']]
+    assert isinstance(record['_aws']['Timestamp'], int)
+    assert (record['Status'], record['job_id'], record['file_format']) == ('completed', 'job-1', 'txt')
+
+    units = {metric['Name']: metric['Unit'] for metric in directive['Metrics']}
+    assert units == {'total_ms': 'Milliseconds', 'translate_ms': 'Milliseconds', 'translate_calls': 'Count',
+                     'bytes_read': 'Bytes', 'rate_limit_wait_ms': 'Milliseconds', 'custom_counter': 'Count'}
+    # Every metric has an integer value at the top level of the record
+    assert (record['translate_ms'], record['translate_calls'], record['rate_limit_wait_ms']) == (23, 3, 5)
+    assert all(isinstance(record[name], int) for name in units)
+
+
+def test_emit_prints_nothing_when_disabled(emitted, monkeypatch):
+    monkeypatch.setattr(job_metrics, 'METRICS_ENABLED', False)
+    assert JobMetrics('job-1').emit('failed')['Status'] == 'failed'
+    assert emitted() == []
+
+
+def test_stage_time_is_recorded_when_the_stage_raises():
+    metrics = JobMetrics()
+    with metrics.stage('segment'):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.stage('translate'):
+            raise ValueError('bad chunk')
+    assert set(metrics.stages) == {'segment', 'translate'}
+    assert {'total_ms', 'segment_ms', 'translate_ms'} <= set(metrics.summary())
+
+
+def test_worker_emits_a_record_per_job_with_its_stage_timings(worker, create_job, emitted):
+    create_job(b'Hello world.')
+    worker.process_translation_request_direct({'job_id': 'job-1'})
+
+    record, = emitted()
+    assert record['Status'] == 'completed'
+    assert record['job_id'] == 'job-1'
+    assert {'load_job_ms', 'claim_job_ms', 'translate_ms', 'complete_job_ms'} <= set(record)
+    assert record['translate_calls'] == 1
+    # The job item keeps the summary taken when it completed
+    assert record['translate_calls'] == worker.get_job('job-1')['metrics']['translate_calls']
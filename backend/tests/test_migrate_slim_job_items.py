@@ -0,0 +1,71 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import migrate_slim_job_items
+from fakes import FakeDynamoDB
+
+LONG_TEXT = 'Una frase traducida. ' * 50
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """The migration's jobs table, holding a legacy text job, a legacy PDF job and a slim job."""
+    dynamodb = FakeDynamoDB()
+    monkeypatch.setattr(migrate_slim_job_items, 'boto3', SimpleNamespace(resource=lambda service: dynamodb))
+    table = dynamodb.Table('jobs')
+    table.put_item(Item={'id': 'text', 'file_name': 'notes.txt', 'status': 'completed',
+                         'original_text': 'A sentence. ' * 50, 'translated_text': LONG_TEXT})
+    table.put_item(Item={'id': 'pdf', 'file_name': 'Report.PDF', 'status': 'pending',
+                         'original_text': 'JVBERi0xLjQK' * 50})
+    table.put_item(Item={'id': 'slim', 'file_name': 'new.txt', 'status': 'completed',
+                         'translated_preview': 'Hola', 'output_size_bytes': 4})
+    return table
+
+
+def test_migration_replaces_full_text_with_previews(jobs):
+    slim = dict(jobs.items['slim'])
+    migrate_slim_job_items.migrate('jobs', preview_length=20, dry_run=False)
+
+    text = jobs.items['text']
+    assert not {'original_text', 'translated_text'} & set(text)
+    assert text['original_preview'] == ('A sentence. ' * 50)[:20]
+    assert text['translated_preview'] == LONG_TEXT[:20]
+    assert text['output_size_bytes'] == len(LONG_TEXT.encode('utf-8'))
+    assert text['status'] == 'completed'
+
+    # Base64 PDF bytes are dropped without a preview
+    assert jobs.items['pdf'] == {'id': 'pdf', 'file_name': 'Report.PDF', 'status': 'pending'}
+    assert jobs.items['slim'] == slim
+    assert jobs.calls['update_item'] == 2
+
+
+def test_dry_run_logs_the_updates_without_writing(jobs, monkeypatch, caplog):
+    before = {key: dict(item) for key, item in jobs.items.items()}
+    monkeypatch.setattr(sys, 'argv', ['migrate_slim_job_items.py', '--table', 'jobs', '--dry-run'])
+    with caplog.at_level('INFO'):
+        migrate_slim_job_items.main()
+
+    assert jobs.items == before
+    assert 'update_item' not in jobs.calls
+    assert '[dry-run] text: SET original_preview' in caplog.text
+    assert '[dry-run] pdf: REMOVE original_text' in caplog.text
+    assert 'migrated 2, failed 0' in caplog.text
+
+
+def test_item_deleted_after_the_scan_is_skipped(jobs, monkeypatch, caplog):
+    scan = jobs.scan
+
+    def scan_then_delete(**kwargs):
+        response = scan(**kwargs)
+        del jobs.items['pdf']
+        return response
+
+    monkeypatch.setattr(jobs, 'scan', scan_then_delete)
+    with caplog.at_level('INFO'):
+        migrate_slim_job_items.migrate('jobs', preview_length=20, dry_run=False)
+
+    assert 'pdf' not in jobs.items
+    assert 'translated_text' not in jobs.items['text']
+    assert 'migrated 1, failed 1' in caplog.text
@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip('pypdf')
+
+from fakes import FakeDynamoDB, FakeS3, FakeTranslate  # noqa: E402
+from pdf_benchmark import SAMPLE_LINE, build_sample_pdf  # noqa: E402
+
+import translation_worker  # noqa: E402
+from s3_streams import read_body  # noqa: E402
+from pdf_pipeline import PAGE_SEPARATOR, iter_pdf_chunks, iter_pdf_pages  # noqa: E402
+
+
+def test_pages_are_extracted_in_order():
+    pages = list(iter_pdf_pages(build_sample_pdf(3, lines_per_page=2)))
+    assert len(pages) == 3
+    for number, text in enumerate(pages, start=1):
+        assert SAMPLE_LINE.format(page=number, line=1) in text
+        assert f"Page {number + 1}," not in text
+
+
+def test_chunks_fit_the_budget_and_never_span_pages():
+    chunks = list(iter_pdf_chunks(build_sample_pdf(4, lines_per_page=20), max_bytes=300))
+    assert chunks.count(PAGE_SEPARATOR) == 3
+    assert all(len(chunk.encode('utf-8')) <= 300 for chunk in chunks)
+
+    pages = ''.join(chunks).split(PAGE_SEPARATOR)
+    assert [page.count('line 1:') for page in pages] == [1, 1, 1, 1]
+    for number, page in enumerate(pages, start=1):
+        assert page.count(f"Page {number},") == 20
+
+
+def test_worker_writes_pages_in_order_to_a_text_output(monkeypatch):
+    s3, dynamodb = FakeS3(), FakeDynamoDB()
+    monkeypatch.setattr(translation_worker, 's3_client', s3)
+    monkeypatch.setattr(translation_worker, 'dynamodb', dynamodb)
+    monkeypatch.setattr(translation_worker, 'translate_client', FakeTranslate())
+    monkeypatch.setattr(translation_worker, 'TRANSLATE_MAX_CONCURRENCY', 4)
+    translation_worker.translation_memory.clear()
+
+    input_key = 'input/test-user/job-1/manual.pdf'
+    s3.objects[(translation_worker.INPUT_BUCKET, input_key)] = build_sample_pdf(5, lines_per_page=10)
+    table = dynamodb.Table(translation_worker.TRANSLATION_JOBS_TABLE)
+    table.items['job-1'] = {
+        'id': 'job-1', 'user_id': 'test-user', 'file_name': 'manual.pdf', 'status': 'pending',
+        'source_language': 'en', 'target_language': 'es', 's3_input_key': input_key,
+    }
+
+    translation_worker.process_translation_request_direct({'job_id': 'job-1', 's3_input_key': input_key})
+
+    job = table.items['job-1']
+    assert job['status'] == 'completed'
+    assert job['s3_output_key'] == 'output/test-user/job-1/manual.pdf.txt'
+    output = read_body(s3.get_object(Bucket=translation_worker.OUTPUT_BUCKET, Key=job['s3_output_key']))
+    pages = output.decode('utf-8').split(PAGE_SEPARATOR)
+    assert len(pages) == 5
+    for number, page in enumerate(pages, start=1):
+        assert SAMPLE_LINE.format(page=number, line=10) in page
@@ -0,0 +1,198 @@
+import threading
+import time
+
+import pytest
+
+import rate_limiter
+from conftest import LambdaContext
+from fakes import FakeDynamoDB, FakeLambda, conditional_check_failed
+from rate_limiter import (DynamoDBBucketStore, LocalBucketStore, RateLimitTimeout, TokenBucket, refill,
+                          reserve)
+
+
+class FakeClock:
+    """Stands in for the time module in rate_limiter: sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+
+def test_refill_accrues_at_the_rate_up_to_capacity():
+    assert refill(0, updated_at=10, rate=100, capacity=500, now=12) == 200
+    assert refill(450, updated_at=10, rate=100, capacity=500, now=12) == 500
+    assert refill(-300, updated_at=10, rate=100, capacity=500, now=11) == -200
+    # A clock that went backwards refills nothing
+    assert refill(50, updated_at=10, rate=100, capacity=500, now=9) == 50
+
+
+def test_reserve_goes_into_debt_and_waits_for_the_refill():
+    assert reserve(500, 200, rate=100, capacity=500) == (300, 0.0)
+    assert reserve(100, 300, rate=100, capacity=500) == (-200, 2.0)
+
+
+def test_reserve_caps_debt_at_one_capacity():
+    assert reserve(-400, 100, rate=100, capacity=500) == (-500, 5.0)
+    # Past the cap the take is refused until enough of the debt is paid off
+    assert reserve(-400, 200, rate=100, capacity=500) == (None, 1.0)
+    assert reserve(-300, 200, rate=100, capacity=500) == (-500, 5.0)
+
+
+def test_reserve_admits_an_oversized_take_from_a_bucket_not_in_debt():
+    assert reserve(0, 1200, rate=100, capacity=500) == (-1200, 12.0)
+    # ...but once in debt it waits for the bucket to be back at zero
+    assert reserve(-1, 1200, rate=100, capacity=500) == (None, 0.01)
+
+
+def test_reserve_refuses_a_wait_longer_than_max_wait():
+    assert reserve(100, 300, rate=100, capacity=500, max_wait=1.5) == (None, 2.0)
+    assert reserve(100, 300, rate=100, capacity=500, max_wait=2.0) == (-200, 2.0)
+
+
+def test_local_store_starts_full_and_refuses_without_taking():
+    store = LocalBucketStore()
+    assert store.take(400, rate=100, capacity=500, now=0) == (True, 0.0)
+    assert store.take(400, rate=100, capacity=500, now=0) == (True, 3.0)
+    assert store.take(400, rate=100, capacity=500, now=0) == (False, 2.0)
+    assert store.tokens == -300
+    # Two seconds later the debt is back under the cap
+    assert store.take(400, rate=100, capacity=500, now=2) == (True, 5.0)
+    assert store.tokens == -500
+
+
+def test_dynamodb_store_keeps_bucket_state_in_one_item():
+    table = FakeDynamoDB().Table('rate-limit')
+    store = DynamoDBBucketStore(table)
+
+    assert store.take(300, rate=100, capacity=500, now=10) == (True, 0.0)
+    assert store.take(300, rate=100, capacity=500, now=10) == (True, 1.0)
+    item = table.items['translate']
+    assert (float(item['tokens']), float(item['updated_at']), item['version']) == (-100, 10, 2)
+    # The second take was written from the remembered state, without a read
+    assert table.calls == {'get_item': 1, 'put_item': 2}
+
+
+def test_dynamodb_store_rereads_after_losing_the_write_to_another_container():
+    table = FakeDynamoDB().Table('rate-limit')
+    first, second = DynamoDBBucketStore(table), DynamoDBBucketStore(table)
+    first.take(100, rate=100, capacity=500, now=10)
+    second.take(100, rate=100, capacity=500, now=10)
+    assert table.items['translate']['version'] == 2
+
+    # first still remembers version 1, so its write is rejected and it retries from a fresh read
+    assert first.take(100, rate=100, capacity=500, now=10) == (True, 0.0)
+    item = table.items['translate']
+    assert (float(item['tokens']), item['version']) == (200, 3)
+
+
+def test_dynamodb_store_gives_up_when_it_keeps_losing(monkeypatch):
+    table = FakeDynamoDB().Table('rate-limit')
+    store = DynamoDBBucketStore(table)
+
+    def always_conflicts(**kwargs):
+        raise conditional_check_failed('PutItem')
+
+    monkeypatch.setattr(table, 'put_item', always_conflicts)
+    assert store.take(100, rate=100, capacity=500, now=10) is None
+    assert table.calls['get_item'] == rate_limiter.RATE_LIMIT_CONFLICT_RETRIES
+
+
+def test_dynamodb_store_does_not_hold_its_lock_during_a_round_trip(monkeypatch):
+    table = FakeDynamoDB().Table('rate-limit')
+    store = DynamoDBBucketStore(table)
+    # Both threads must be inside get_item at once to get past the barrier
+    both_reading = threading.Barrier(2, timeout=2)
+    read = table.get_item
+
+    def get_item(**kwargs):
+        both_reading.wait()
+        return read(**kwargs)
+
+    monkeypatch.setattr(table, 'get_item', get_item)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.take(100, 100, 500, 10))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == [(True, 0.0), (True, 0.0)]
+    assert float(table.items['translate']['tokens']) == 300
+
+
+def test_acquire_waits_for_reserved_tokens(clock):
+    bucket = TokenBucket(rate=100, burst_seconds=5)
+    assert bucket.acquire(400) == 0
+    assert bucket.acquire(400) == 3.0
+    assert clock.sleeps == [3.0]
+
+
+def test_acquire_waits_at_the_debt_cap_before_reserving(clock):
+    bucket = TokenBucket(rate=100, burst_seconds=5)
+    # Other callers already owe 400 characters
+    bucket.store.tokens, bucket.store.updated_at = -400.0, clock.now
+    # Refused until the debt is down to 300, then queued behind the 300 still owed
+    assert bucket.acquire(200) == 6.0
+    assert clock.sleeps == [1.0, 5.0]
+    assert bucket.stats()['deferred'] == 1
+
+
+def test_acquire_raises_instead_of_waiting_past_the_deadline(clock):
+    bucket = TokenBucket(rate=100, burst_seconds=5)
+    bucket.acquire(500)
+    with pytest.raises(RateLimitTimeout):
+        bucket.acquire(300, deadline=clock.now + 2)
+    assert clock.sleeps == []
+    assert bucket.store.tokens == 0
+    assert bucket.stats()['timeouts'] == 1
+    assert bucket.acquire(300, deadline=clock.now + 3) == 3.0
+
+
+def test_acquire_proceeds_when_the_store_fails(clock):
+    class BrokenStore:
+        def take(self, *args):
+            raise RuntimeError('table unavailable')
+
+    bucket = TokenBucket(rate=100, store=BrokenStore())
+    assert bucket.acquire(1000) == 0
+    assert bucket.stats()['store_errors'] == 1
+
+
+def test_disabled_bucket_never_waits(clock):
+    bucket = TokenBucket(rate=0)
+    assert bucket.acquire(10 ** 6, deadline=clock.now) == 0
+    assert clock.sleeps == []
+
+
+def test_rate_limit_past_the_deadline_hands_the_job_over(worker, create_job, translate, monkeypatch):
+    monkeypatch.setenv('AWS_LAMBDA_FUNCTION_NAME', 'translation-worker')
+    invoker = FakeLambda()
+    monkeypatch.setattr(worker, 'lambda_client', invoker)
+    # A budget far below the document, ten seconds in debt to other callers
+    limiter = TokenBucket(rate=10, burst_seconds=1)
+    limiter.store.tokens, limiter.store.updated_at = -100.0, time.time()
+    monkeypatch.setattr(worker, 'translate_rate_limiter', limiter)
+    create_job(b'Hello world. ' * 10)
+
+    started = time.monotonic()
+    worker.lambda_handler({'job_id': 'job-1'}, LambdaContext(31))
+    assert time.monotonic() - started < 1
+    assert translate.calls == 0
+    assert worker.get_job('job-1')['status'] == 'processing'
+    assert invoker.payloads[0]['continuation']
@@ -0,0 +1,64 @@
+import base64
+import gzip
+import random
+
+import pytest
+
+from fakes import FakeS3
+from s3_streams import GZIP, MIN_PART_SIZE, MultipartUploadWriter, encoded_object, iter_body, read_body
+
+
+def random_text(size, seed=0):
+    """Text that gzip cannot shrink much, so the stored stream still spans several parts."""
+    return base64.b64encode(random.Random(seed).randbytes(size * 3 // 4)).decode('ascii')
+
+
+def get(s3, key):
+    return s3.get_object(Bucket='bucket', Key=key)
+
+
+def test_gzip_stream_spans_the_parts_of_a_multipart_upload():
+    s3 = FakeS3()
+    text = random_text(3 * MIN_PART_SIZE)
+    with MultipartUploadWriter(s3, 'bucket', 'out.txt', part_size=MIN_PART_SIZE, content_encoding=GZIP) as writer:
+        for start in range(0, len(text), 100_000):
+            writer.write(text[start:start + 100_000])
+
+    assert s3.calls['upload_part'] >= 2
+    assert 'put_object' not in s3.calls
+    stored = s3.objects[('bucket', 'out.txt')]
+    assert (writer.bytes_written, writer.bytes_stored) == (len(text), len(stored))
+    assert s3.headers[('bucket', 'out.txt')] == {'ContentEncoding': GZIP}
+    # One gzip member across every part, not one per part
+    assert gzip.decompress(stored) == text.encode('ascii')
+    assert read_body(get(s3, 'out.txt')) == text.encode('ascii')
+
+
+def test_output_smaller_than_a_part_is_one_put_object():
+    s3 = FakeS3()
+    with MultipartUploadWriter(s3, 'bucket', 'out.txt', content_encoding=GZIP) as writer:
+        writer.write('Hello ')
+        writer.write('world.')
+    assert s3.calls == {'put_object': 1}
+    assert read_body(get(s3, 'out.txt')) == b'Hello world.'
+
+
+def test_failed_upload_is_aborted():
+    s3 = FakeS3()
+    with pytest.raises(RuntimeError):
+        with MultipartUploadWriter(s3, 'bucket', 'out.txt', part_size=MIN_PART_SIZE) as writer:
+            writer.write(random_text(MIN_PART_SIZE + 1))
+            raise RuntimeError('translation failed')
+    assert s3.calls['abort_multipart_upload'] == 1
+    assert ('bucket', 'out.txt') not in s3.objects
+
+
+@pytest.mark.parametrize('encoding', [GZIP, ''])
+def test_iter_body_skips_decoded_bytes(encoding):
+    s3 = FakeS3()
+    data = random_text(5000).encode('ascii')
+    s3.put_object(Bucket='bucket', Key='in.txt', **encoded_object(data, encoding))
+    assert ('ContentEncoding' in s3.headers[('bucket', 'in.txt')]) == bool(encoding)
+
+    for skip in (0, 1, 6, 7, 1000, len(data) - 1, len(data), len(data) + 5):
+        assert b''.join(iter_body(get(s3, 'in.txt'), chunk_size=7, skip=skip)) == data[skip:], skip
@@ -0,0 +1,164 @@
+import pytest
+from botocore.exceptions import ClientError
+
+import scheduler
+from conftest import LambdaContext
+from fakes import FakeDynamoDB
+from scheduler import DynamoDBSchedulerStore, JobScheduler, LocalSchedulerStore
+
+
+class Clock:
+    """Stands in for the time module in scheduler."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['local', 'dynamodb'])
+def jobs(request):
+    """A scheduler over each store kind, with a jobs table to hold the submitted jobs."""
+    dynamodb = FakeDynamoDB()
+    table = dynamodb.Table('jobs')
+    store = LocalSchedulerStore()
+    if request.param == 'dynamodb':
+        store = DynamoDBSchedulerStore(table, dynamodb.Table('scheduler'))
+    dispatched = []
+    job_scheduler = JobScheduler(dispatched.append, store, max_in_flight=2, lease_seconds=60)
+
+    def make(count, user_id='alice'):
+        made = []
+        for i in range(count):
+            job = {'id': f"{user_id}-{i}", 'user_id': user_id, 's3_input_key': f"input/{user_id}/{i}/a.txt"}
+            table.put_item(Item=dict(job))
+            made.append(job)
+        return made
+
+    job_scheduler.make = make
+    job_scheduler.dispatched = dispatched
+    return job_scheduler
+
+
+def dispatched_ids(job_scheduler):
+    return [job['id'] for job in job_scheduler.dispatched]
+
+
+def test_jobs_beyond_the_cap_wait_in_the_queue(jobs, clock):
+    jobs.submit_many(jobs.make(5))
+    assert dispatched_ids(jobs) == ['alice-0', 'alice-1']
+    assert jobs.store.counts('alice', clock.now) == {'queued': 3, 'running': 2}
+
+
+def test_other_users_are_not_held_up_by_a_backlog(jobs, clock):
+    jobs.submit_many(jobs.make(5))
+    jobs.submit_many(jobs.make(1, 'bob'))
+    assert dispatched_ids(jobs) == ['alice-0', 'alice-1', 'bob-0']
+
+
+def test_submitting_a_job_twice_is_a_no_op(jobs, clock):
+    first, second, third = jobs.make(3)
+    jobs.submit(first)
+    jobs.submit(first)
+    jobs.submit_many([second, third, third])
+    assert dispatched_ids(jobs) == ['alice-0', 'alice-1']
+    assert jobs.store.counts('alice', clock.now) == {'queued': 1, 'running': 2}
+
+
+def test_release_dispatches_the_next_job_in_submission_order(jobs, clock):
+    for job in jobs.make(4):
+        clock.now += 1
+        jobs.submit(job)
+    jobs.release('alice', 'alice-1')
+    assert dispatched_ids(jobs) == ['alice-0', 'alice-1', 'alice-2']
+    jobs.release('alice', 'alice-1')
+    assert dispatched_ids(jobs) == ['alice-0', 'alice-1', 'alice-2']
+    jobs.release('alice', 'alice-0')
+    assert dispatched_ids(jobs) == ['alice-0', 'alice-1', 'alice-2', 'alice-3']
+
+
+def test_expired_leases_are_reclaimed_by_the_sweep(jobs, clock):
+    jobs.submit_many(jobs.make(3))
+    clock.now += 30
+    jobs.renew('alice', 'alice-0')
+    assert jobs.sweep() == 0
+
+    # alice-1's lease runs out first; alice-0 was renewed
+    clock.now += 45
+    assert jobs.sweep() == 1
+    assert dispatched_ids(jobs) == ['alice-0', 'alice-1', 'alice-2']
+    assert jobs.store.counts('alice', clock.now) == {'queued': 0, 'running': 2}
+
+
+def test_renew_can_hold_a_slot_for_longer_than_the_lease(jobs, clock):
+    jobs.submit_many(jobs.make(3))
+    jobs.renew('alice', 'alice-0', lease_seconds=600)
+    jobs.renew('alice', 'alice-1', lease_seconds=600)
+    clock.now += 300
+    assert jobs.sweep() == 0
+    clock.now += 301
+    assert jobs.sweep() == 1
+
+
+def test_a_failed_dispatch_returns_the_job_to_the_queue(jobs, clock):
+    def unavailable(job):
+        raise RuntimeError('queue unavailable')
+
+    jobs.dispatch = unavailable
+    jobs.submit_many(jobs.make(2))
+    assert jobs.store.counts('alice', clock.now) == {'queued': 2, 'running': 0}
+
+    jobs.dispatch = jobs.dispatched.append
+    assert jobs.sweep() == 2
+
+
+@pytest.fixture
+def scheduled_worker(worker, create_job, translate, monkeypatch):
+    """The worker with a one-slot scheduler: job-1 is dispatched and job-2 waits behind it."""
+    dispatched = []
+    job_scheduler = JobScheduler(lambda job: dispatched.append(job['id']), LocalSchedulerStore(), max_in_flight=1)
+    monkeypatch.setattr(worker, 'job_scheduler', job_scheduler)
+    job_scheduler.submit_many([create_job(b'Hello world.', job_id=job_id) for job_id in ('job-1', 'job-2')])
+    assert dispatched == ['job-1']
+
+    def unavailable(**kwargs):
+        raise ClientError({'Error': {'Code': 'InternalServerException'}}, 'TranslateText')
+
+    monkeypatch.setattr(translate, 'translate_text', unavailable, raising=False)
+    return worker, dispatched, job_scheduler.store
+
+
+def test_a_failed_job_keeps_its_slot_for_the_retry(scheduled_worker, translate, monkeypatch):
+    worker, dispatched, store = scheduled_worker
+    with pytest.raises(ClientError):
+        worker.process_translation_request_direct({'job_id': 'job-1'})
+    assert worker.get_job('job-1')['status'] == 'failed'
+    assert dispatched == ['job-1']
+    assert 'job-1' in store.slots['test-user']
+
+    # The retry runs in the slot it kept, then releases it
+    monkeypatch.delattr(translate, 'translate_text')
+    worker.process_translation_request_direct({'job_id': 'job-1'})
+    assert worker.get_job('job-1')['status'] == 'completed'
+    assert dispatched == ['job-1', 'job-2']
+
+
+def test_the_last_delivery_of_a_failing_job_releases_its_slot(scheduled_worker):
+    worker, dispatched, store = scheduled_worker
+    delivery = {'eventSource': 'aws:sqs', 'messageId': 'message-0', 'body': '{"job_id": "job-1"}',
+                'attributes': {'ApproximateReceiveCount': '1'}}
+    assert worker.lambda_handler({'Records': [delivery]}, LambdaContext(60))['batchItemFailures']
+    assert dispatched == ['job-1']
+
+    delivery['attributes']['ApproximateReceiveCount'] = str(worker.JOB_QUEUE_MAX_RECEIVE_COUNT)
+    assert worker.lambda_handler({'Records': [delivery]}, LambdaContext(60))['batchItemFailures']
+    assert dispatched == ['job-1', 'job-2']
+    assert 'job-1' not in store.slots['test-user']
@@ -0,0 +1,78 @@
+import pytest
+
+from segmenter import byte_length, iter_segments, segment_text
+
+
+def assert_segments(text, chunks, max_bytes):
+    assert ''.join(chunks) == text
+    assert all(0 < byte_length(chunk) <= max_bytes for chunk in chunks)
+
+
+def test_short_text_is_one_chunk():
+    assert segment_text('Hello world.', max_bytes=100) == ['Hello world.']
+
+
+def test_empty_text_has_no_streamed_chunks():
+    assert ''.join(segment_text('')) == ''
+    assert list(iter_segments([])) == []
+    assert list(iter_segments(['', ''])) == []
+
+
+def test_splits_at_paragraph_before_sentence():
+    first = 'First sentence. Second sentence.\n\n'
+    second = 'Third sentence. Fourth sentence.'
+    chunks = segment_text(first + second, max_bytes=len(first) + 5)
+    assert chunks == [first, second]
+
+
+def test_splits_at_sentence_before_whitespace():
+    text = 'One two three. Four five six. Seven eight nine.'
+    chunks = segment_text(text, max_bytes=20)
+    assert_segments(text, chunks, 20)
+    assert chunks[0] == 'One two three. '
+    assert all(chunk.rstrip().endswith('.') for chunk in chunks)
+
+
+def test_sentence_punctuation_keeps_closing_quotes():
+    text = 'He said "stop." Then he left.'
+    chunks = segment_text(text, max_bytes=18)
+    assert chunks[0] == 'He said "stop." '
+
+
+def test_cjk_sentences_split_without_spaces():
+    text = '今日は晴れです。明日は雨です。'
+    chunks = segment_text(text, max_bytes=24)
+    assert chunks == ['今日は晴れです。', '明日は雨です。']
+
+
+def test_words_are_only_cut_when_larger_than_budget():
+    text = 'short ' + 'x' * 25 + ' tail'
+    chunks = segment_text(text, max_bytes=10)
+    assert_segments(text, chunks, 10)
+    assert chunks[0] == 'short '
+    assert chunks[-1].endswith('tail')
+
+
+def test_multibyte_characters_are_never_split():
+    text = 'é' * 11
+    chunks = segment_text(text, max_bytes=5)
+    assert_segments(text, chunks, 5)
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 2, 2, 1]
+
+
+@pytest.mark.parametrize('max_bytes', [4, 37, 500])
+def test_chunks_fit_and_rejoin(max_bytes):
+    text = ('Lorem ipsum dolor sit amet, consectetur. Ñandú über straße!\n\n' * 40)
+    assert_segments(text, segment_text(text, max_bytes), max_bytes)
+
+
+def test_budget_below_one_character_is_rejected():
+    with pytest.raises(ValueError):
+        segment_text('text', max_bytes=3)
+
+
+def test_streaming_matches_whole_text_at_any_piece_size():
+    text = ''.join(f'Sentence number {i} is here. ' + ('\n\n' if i % 7 == 0 else '') for i in range(400))
+    for piece_size in (1, 13, 1000, len(text)):
+        pieces = [text[i:i + piece_size] for i in range(0, len(text), piece_size)]
+        assert_segments(text, list(iter_segments(pieces, max_bytes=200)), 200)
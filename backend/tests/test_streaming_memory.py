@@ -0,0 +1,20 @@
+import streaming_memory_benchmark
+
+MB = 1024 * 1024
+
+
+def test_streaming_translation_memory_stays_flat(worker, monkeypatch):
+    # measure() installs its own fakes and settings; these restore the worker afterwards
+    monkeypatch.setattr(worker, 'STORAGE_CONTENT_ENCODING', worker.STORAGE_CONTENT_ENCODING)
+    monkeypatch.setattr(worker.translation_memory, 'max_entries', worker.translation_memory.max_entries)
+
+    small = streaming_memory_benchmark.measure(4 * MB)
+    large = streaming_memory_benchmark.measure(24 * MB)
+
+    # Large enough for several 8 MiB parts, so the multipart path is the one measured
+    assert large['multipart_parts'] >= 3
+    # The Python heap holds about two parts plus the checkpoint buffer, whatever the input size
+    assert large['peak_heap_mb'] < 48
+    assert large['peak_heap_mb'] < small['peak_heap_mb'] + 24
+    if large['peak_rss_mb'] is not None:
+        assert large['peak_rss_mb'] < 128
@@ -0,0 +1,117 @@
+import pytest
+from boto3.dynamodb.types import Binary
+
+import translation_memory
+from fakes import FakeDynamoDB
+from translation_memory import DynamoDBStore, InMemoryStore, TranslationMemory, encode_translation
+
+
+class Clock:
+    """Stands in for the time module in translation_memory."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(translation_memory, 'time', clock)
+    return clock
+
+
+class BrokenStore:
+    def get(self, key):
+        raise RuntimeError('table unavailable')
+
+    def put(self, key, translation, expires_at):
+        raise RuntimeError('table unavailable')
+
+
+def test_lru_keeps_the_most_recently_used_entries(clock):
+    memory = TranslationMemory(max_entries=2)
+    memory.put('one', 'en', 'es', 'uno')
+    memory.put('two', 'en', 'es', 'dos')
+    # Reading 'one' makes 'two' the least recently used
+    assert memory.get('one', 'en', 'es') == 'uno'
+    memory.put('three', 'en', 'es', 'tres')
+
+    assert memory.get('two', 'en', 'es') is None
+    assert memory.get('one', 'en', 'es') == 'uno'
+    assert memory.get('three', 'en', 'es') == 'tres'
+    assert memory.stats() == {'hits': 3, 'store_hits': 0, 'misses': 1, 'evictions': 1, 'store_errors': 0,
+                              'size': 2}
+
+
+def test_entries_are_keyed_by_language_pair(clock):
+    memory = TranslationMemory()
+    memory.put('Hello', 'en', 'es', 'Hola')
+    assert memory.get('Hello', 'en', 'fr') is None
+    assert memory.get('Hello', 'de', 'es') is None
+    assert memory.get('Hello', 'en', 'es') == 'Hola'
+
+
+def test_entries_expire_after_the_ttl_in_both_tiers(clock):
+    store = InMemoryStore()
+    memory = TranslationMemory(ttl_seconds=60, store=store)
+    memory.put('Hello', 'en', 'es', 'Hola')
+
+    clock.now += 59
+    assert memory.get('Hello', 'en', 'es') == 'Hola'
+    clock.now += 1
+    assert memory.get('Hello', 'en', 'es') is None
+    assert memory.stats()['size'] == 0
+    assert memory.stats()['misses'] == 1
+
+
+def test_a_cold_container_reads_through_to_the_store(clock):
+    store = InMemoryStore()
+    TranslationMemory(store=store).put('Hello', 'en', 'es', 'Hola')
+
+    memory = TranslationMemory(store=store)
+    assert memory.get('Hello', 'en', 'es') == 'Hola'
+    # ...and keeps the translation in its own LRU from then on
+    assert memory.get('Hello', 'en', 'es') == 'Hola'
+    assert memory.stats() == {'hits': 1, 'store_hits': 1, 'misses': 0, 'evictions': 0, 'store_errors': 0,
+                              'size': 1}
+
+
+def test_store_errors_are_treated_as_misses(clock):
+    memory = TranslationMemory(store=BrokenStore())
+    memory.put('Hello', 'en', 'es', 'Hola')
+    # The write failed but the warm tier still has the entry
+    assert memory.get('Hello', 'en', 'es') == 'Hola'
+    assert memory.get('Goodbye', 'en', 'es') is None
+    assert memory.stats() == {'hits': 1, 'store_hits': 0, 'misses': 1, 'evictions': 0, 'store_errors': 2,
+                              'size': 1}
+
+
+def test_dynamodb_store_compresses_long_translations(clock):
+    table = FakeDynamoDB().Table('translation-memory')
+    store = DynamoDBStore(table)
+    long_text = 'Una frase traducida. ' * 20
+    store.put('long', long_text, int(clock.now + 60))
+    store.put('short', 'Hola', int(clock.now + 60))
+
+    assert isinstance(table.items['long']['translated_text'], bytes)
+    assert table.items['short']['translated_text'] == 'Hola'
+    assert (store.get('long'), store.get('short')) == (long_text, 'Hola')
+
+
+def test_dynamodb_store_reads_items_written_before_compression(clock):
+    table = FakeDynamoDB().Table('translation-memory')
+    long_text = 'Una frase traducida. ' * 20
+    table.put_item(Item={'segment_hash': 'legacy', 'translated_text': long_text, 'expires_at': int(clock.now + 60)})
+    # boto3 hands Binary attributes back wrapped
+    table.put_item(Item={'segment_hash': 'binary', 'translated_text': Binary(encode_translation(long_text)),
+                         'expires_at': int(clock.now + 60)})
+    table.put_item(Item={'segment_hash': 'expired', 'translated_text': 'Hola', 'expires_at': int(clock.now)})
+
+    store = DynamoDBStore(table)
+    assert store.get('legacy') == long_text
+    assert store.get('binary') == long_text
+    # Expired items TTL has not deleted yet are misses
+    assert store.get('expired') is None
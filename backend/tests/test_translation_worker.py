@@ -0,0 +1,214 @@
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+import pytest
+from botocore.exceptions import ClientError
+
+import checkpoints
+from conftest import LambdaContext
+from document_formats import parse_document
+from fakes import FakeLambda
+from s3_streams import GZIP, encoded_object
+from segmenter import segment_text
+
+
+def test_chunks_come_back_in_order_under_concurrency(worker):
+    delays = random.Random(3)
+    active = [0, 0]
+    lock = threading.Lock()
+
+    def translate(chunk, source_language, target_language, index, total, metrics):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        # Later chunks often finish first
+        time.sleep(delays.random() * 0.005)
+        with lock:
+            active[0] -= 1
+        return f'{index}:{chunk}'
+
+    chunks = [f'chunk {i}' for i in range(200)]
+    results = list(worker.iter_translated_chunks(iter(chunks), 'en', 'es', max_concurrency=8,
+                                                 translate=translate))
+    assert results == [f'{i}:chunk {i}' for i in range(200)]
+    assert 1 < active[1] <= 8
+
+
+def test_translate_chunks_preserves_text_and_order(worker, translate):
+    text = ''.join(f'Paragraph {i} has a sentence. And another one.\n\n' for i in range(300))
+    chunks = segment_text(text, max_bytes=500)
+    assert ''.join(worker.translate_chunks(chunks, 'en', 'es', max_concurrency=8)) == text
+    assert translate.calls == len(chunks)
+
+
+def test_packed_nodes_render_in_order(worker, translate):
+    text = ''.join(f'{i}\n00:00:{i % 60:02d},000 --> 00:00:{i % 60:02d},500\nCue {i} text\n\n'
+                   for i in range(1, 500))
+    document = parse_document('subtitles.srt', text)
+    packs = document.packs(max_nodes=20)
+    output = ''.join(worker.translate_chunks(packs, 'en', 'es', max_concurrency=8,
+                                             translate=partial(worker.translate_pack, document)))
+    assert output == text
+    assert translate.calls == len(packs)
+
+
+def test_mangled_pack_is_retranslated_in_halves(worker, translate, monkeypatch):
+    original = translate.translate_text
+
+    def drop_delimiters(Text, **kwargs):
+        response = original(Text=Text, **kwargs)
+        response['TranslatedText'] = response['TranslatedText'].replace('###', '')
+        return response
+
+    monkeypatch.setattr(translate, 'translate_text', drop_delimiters)
+    assert worker.translate_node_texts(['one', 'two', 'three'], 'en', 'es') == ['one', 'two', 'three']
+
+
+def test_invalid_json_is_translated_as_plain_text(worker, create_job, read_output):
+    content = b'{"title": "Hello", broken'
+    create_job(content, 'strings.json')
+    worker.process_translation_request_direct({'job_id': 'job-1'})
+    job = worker.get_job('job-1')
+    assert job['status'] == 'completed'
+    assert read_output(job['s3_output_key']) == content
+
+
+def test_invalid_json_falls_back_for_every_target_language(worker, create_job, read_output):
+    create_job(b'not json at all', 'strings.json', target_languages=['es', 'fr'], results={})
+    worker.process_translation_request_direct({'job_id': 'job-1'})
+    job = worker.get_job('job-1')
+    assert job['status'] == 'completed' and job['failed_languages'] == []
+    assert read_output(job['results']['fr']['s3_output_key']) == b'not json at all'
+
+
+def test_byte_order_mark_is_kept(worker, create_job, read_output):
+    content = '\ufeff{"title": "Hello"}'.encode('utf-8')
+    create_job(content, 'strings.json')
+    worker.process_translation_request_direct({'job_id': 'job-1'})
+    assert read_output(worker.get_job('job-1')['s3_output_key']) == content
+
+
+def sqs_event(*bodies):
+    return {'Records': [{'eventSource': 'aws:sqs', 'messageId': f'message-{i}', 'body': json.dumps(body)}
+                        for i, body in enumerate(bodies)]}
+
+
+def seconds_ago(seconds):
+    return (datetime.utcnow() - timedelta(seconds=seconds)).isoformat()
+
+
+def test_redelivered_message_reclaims_a_job_stuck_in_processing(worker, create_job, read_output):
+    # The invocation that claimed the job timed out without marking it failed
+    create_job(b'Hello world.', status='processing', updated_at=seconds_ago(worker.JOB_CLAIM_LEASE_SECONDS + 60))
+    assert worker.lambda_handler(sqs_event({'job_id': 'job-1'}), None) == {'batchItemFailures': []}
+    job = worker.get_job('job-1')
+    assert job['status'] == 'completed'
+    assert read_output(job['s3_output_key']) == b'Hello world.'
+
+
+def test_redelivered_message_skips_a_job_still_processing(worker, create_job, translate):
+    create_job(b'Hello world.', status='processing', updated_at=seconds_ago(10))
+    assert worker.lambda_handler(sqs_event({'job_id': 'job-1'}), None) == {'batchItemFailures': []}
+    assert worker.get_job('job-1')['status'] == 'processing'
+    assert translate.calls == 0
+
+
+def test_sqs_batch_reports_only_the_failed_messages(worker, create_job, read_output):
+    create_job(b'Hello world.', job_id='job-1')
+    create_job(b'Uploaded directly.', 'my notes.txt', job_id='job-3')
+    uploaded = {'Records': [{'eventName': 'ObjectCreated:Put',
+                             's3': {'object': {'key': 'input/test-user/job-3/my+notes.txt'}}}]}
+    event = sqs_event({'job_id': 'job-1'}, {'job_id': 'no-such-job'}, uploaded,
+                      {'Service': 'Amazon S3', 'Event': 's3:TestEvent'})
+
+    assert worker.lambda_handler(event, None) == {'batchItemFailures': [{'itemIdentifier': 'message-1'}]}
+    for job_id, content in (('job-1', b'Hello world.'), ('job-3', b'Uploaded directly.')):
+        job = worker.get_job(job_id)
+        assert job['status'] == 'completed'
+        assert read_output(job['s3_output_key']) == content
+
+
+@pytest.mark.parametrize('failing', ['get_job', 'claim_job'])
+def test_failure_before_the_claim_leaves_the_job_alone(worker, create_job, dynamodb, monkeypatch, failing):
+    # Another invocation is translating the job when a duplicate delivery hits a transient error
+    create_job(b'Hello world.', status='processing', updated_at=seconds_ago(10))
+
+    def throttled(*args):
+        raise ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'UpdateItem')
+
+    monkeypatch.setattr(worker, failing, throttled)
+    with pytest.raises(ClientError):
+        worker.process_translation_request_direct({'job_id': 'job-1'})
+    assert dynamodb.Table(worker.TRANSLATION_JOBS_TABLE).items['job-1']['status'] == 'processing'
+
+
+def test_reclaiming_a_stale_job_revokes_its_continuation(worker, create_job):
+    create_job(b'Hello world.', status='processing', continuation='lost-token',
+               updated_at=seconds_ago(worker.JOB_CLAIM_LEASE_SECONDS + 60))
+    assert worker.claim_job('job-1')
+    assert not worker.claim_job('job-1')
+    assert not worker.claim_job('job-1', 'lost-token')
+
+
+def test_deadline_hand_over_keeps_chunks_already_translated(worker, create_job, read_output, translate,
+                                                            monkeypatch):
+    monkeypatch.setattr(checkpoints, 'CHECKPOINT_TIME_RESERVE_SECONDS', 0)
+    monkeypatch.setenv('AWS_LAMBDA_FUNCTION_NAME', 'translation-worker')
+    invoker = FakeLambda()
+    monkeypatch.setattr(worker, 'lambda_client', invoker)
+    # Every chunk must reach Translate, so a chunk translated twice shows up as an extra call
+    monkeypatch.setattr(worker.translation_memory, 'get', lambda *args: None)
+    translate.latency = 0.01
+    text = '<html><body>\n' + ''.join(f'<p>Paragraph {i}. ' + 'Words in a sentence. ' * 140 + '</p>\n'
+                                       for i in range(100)) + '</body></html>\n'
+    create_job(text.encode('utf-8'), 'page.html')
+
+    event, invocations = {'job_id': 'job-1'}, 0
+    while event is not None:
+        worker.lambda_handler(event, LambdaContext(0.03))
+        invocations += 1
+        event = invoker.payloads.pop() if invoker.payloads else None
+
+    job = worker.get_job('job-1')
+    assert invocations > 1
+    assert job['status'] == 'completed'
+    assert read_output(job['s3_output_key']) == text.encode('utf-8')
+    assert translate.calls == len(parse_document('page.html', text).packs())
+
+
+def test_direct_invocation_failure_is_raised_for_async_retry(worker, create_job, translate, monkeypatch):
+    create_job(b'Hello world.')
+    working = translate.translate_text
+
+    def unavailable(**kwargs):
+        raise RuntimeError('Translate unavailable')
+
+    monkeypatch.setattr(translate, 'translate_text', unavailable)
+    with pytest.raises(RuntimeError):
+        worker.lambda_handler({'job_id': 'job-1'}, None)
+    assert worker.get_job('job-1')['status'] == 'failed'
+
+    # Lambda's retry claims the failed job again
+    monkeypatch.setattr(translate, 'translate_text', working)
+    worker.lambda_handler({'job_id': 'job-1'}, None)
+    assert worker.get_job('job-1')['status'] == 'completed'
+
+
+@pytest.mark.parametrize('encoding, reads', [(GZIP, 2), ('', 1)])
+def test_resumed_job_reads_the_input_from_the_checkpoint(worker, s3, dynamodb, read_output, encoding, reads):
+    text = ''.join(f'Sentence number {i}. ' for i in range(500)).encode('utf-8')
+    s3.put_object(Bucket=worker.INPUT_BUCKET, Key='input/test-user/job-1/a.txt', **encoded_object(text, encoding))
+    done = len(text) // 3
+    checkpoint = checkpoints.TranslationCheckpoint(
+        s3, dynamodb.Table(worker.TRANSLATION_JOBS_TABLE), worker.OUTPUT_BUCKET, 'job-1',
+        'input/test-user/job-1/a.txt', 'output/test-user/job-1/a.txt', {'chunks': 1, 'done': done, 'total': len(text)})
+
+    worker.translate_object_streaming('input/test-user/job-1/a.txt', 'output/test-user/job-1/a.txt', 'en', 'es',
+                                      checkpoint=checkpoint)
+    # A byte range of a gzipped object would start mid-stream, so it is read again from the start
+    assert s3.calls['get_object'] == reads
+    assert read_output('output/test-user/job-1/a.txt') == text[done:]
@@ -38,4 +38,63 @@ variable "github_access_token" {
   type        = string
   sensitive   = true
   
-}
\ No newline at end of file
+}
+
+variable "translation_queue_batch_size" {
+  description = "Number of queued translation jobs delivered to one worker invocation"
+  type        = number
+  default     = 5
+}
+
+variable "translation_queue_max_receive_count" {
+  description = "Deliveries of a failing translation job before it moves to the dead-letter queue"
+  type        = number
+  default     = 3
+}
+
+variable "translation_queue_batching_window" {
+  description = "Seconds to wait while gathering a batch of queued translation jobs"
+  type        = number
+  default     = 1
+}
+
+variable "translation_queue_max_concurrency" {
+  description = "Maximum concurrent worker invocations the job queue can drive"
+  type        = number
+  default     = 10
+}
+
+variable "job_batch_concurrency" {
+  description = "Jobs from one queue batch that a worker processes in parallel"
+  type        = number
+  default     = 4
+}
+
+variable "translate_chars_per_second" {
+  description = "Characters per second all translation workers together may send to Amazon Translate; set just under the account quota, or 0 to disable the shared limit"
+  type        = number
+  default     = 5000
+}
+
+variable "user_max_in_flight" {
+  description = "Translation jobs one user may have dispatched to the worker at once; the rest wait in that user's queue"
+  type        = number
+  default     = 4
+}
+
+variable "storage_content_encoding" {
+  description = "Content-Encoding for text documents, outputs and checkpoints stored in S3: gzip, or an empty string to store them uncompressed"
+  type        = string
+  default     = "gzip"
+
+  validation {
+    condition     = contains(["gzip", ""], var.storage_content_encoding)
+    error_message = "storage_content_encoding must be \"gzip\" or an empty string."
+  }
+}
+
+variable "api_minimum_compression_size" {
+  description = "Smallest API response body, in bytes, that API Gateway gzips for clients sending Accept-Encoding; -1 disables compression"
+  type        = number
+  default     = 1024
+}
@@ -65,6 +65,11 @@ print_success "GitHub configuration found in terraform.tfvars"
 # Navigate to the Backend directory
 cd Backend
 
+print_status "Installing translation worker dependencies..."
+rm -rf build/worker_layer
+mkdir -p build/worker_layer/python
+python3 -m pip install -r requirements-worker.txt -t build/worker_layer/python --quiet
+
 print_status "Initializing Terraform..."
 terraform init
 